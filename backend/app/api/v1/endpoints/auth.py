@@ -6,54 +6,88 @@ from datetime import timedelta
 from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.auth import get_current_active_user
-from app.core.database import get_db
-from app.core.security import create_access_token, verify_password, get_password_hash
+from app.core.auth import get_current_active_user, invalidate_cached_user
+from app.core.database import get_async_db
+from app.core.security import create_access_token
 from app.core.config import settings
 from app.models.user import User
-from app.schemas.auth import Token, UserCreate, User, UserUpdate
+from app.schemas.auth import Token, UserCreate, User as UserSchema, UserPrincipal, UserUpdate
+from app.services.password_hashing import PasswordHasherUnavailable, password_hasher
 
 router = APIRouter()
 
-@router.post("/register", response_model=User)
-def register_user(
+async def _get_user_row(db: AsyncSession, current_user: UserPrincipal) -> User:
+    """The row behind a (possibly cached) principal; 401 if the user was deleted"""
+    user = await db.get(User, current_user.id)
+    if user is None:
+        invalidate_cached_user(current_user.email)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+def _hashing_unavailable() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication service is busy, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+@router.post("/register", response_model=UserSchema)
+async def register_user(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_in: UserCreate,
 ) -> Any:
     """Register a new user"""
     # Check if user already exists
-    user = db.query(User).filter(User.email == user_in.email).first()
+    result = await db.execute(select(User).where(User.email == user_in.email))
+    user = result.scalars().first()
     if user:
         raise HTTPException(
             status_code=400,
             detail="A user with this email already exists."
         )
 
+    try:
+        hashed_password = await password_hasher.hash(user_in.password)
+    except PasswordHasherUnavailable:
+        raise _hashing_unavailable()
+
     # Create new user
     user = User(
         email=user_in.email,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=hashed_password,
         full_name=user_in.full_name,
         company=user_in.company,
         phone=user_in.phone,
         bio=user_in.bio,
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     return user
 
 @router.post("/login", response_model=Token)
-def login_access_token(
-    db: Session = Depends(get_db),
+async def login_access_token(
+    db: AsyncSession = Depends(get_async_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """OAuth2 compatible token login"""
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    result = await db.execute(select(User).where(User.email == form_data.username))
+    user = result.scalars().first()
+    try:
+        password_ok = bool(user) and await password_hasher.verify(
+            form_data.password, user.hashed_password
+        )
+    except PasswordHasherUnavailable:
+        raise _hashing_unavailable()
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -70,22 +104,29 @@ def login_access_token(
         "token_type": "bearer",
     }
 
-@router.get("/me", response_model=User)
-def read_users_me(current_user: User = Depends(get_current_active_user)) -> Any:
+@router.get("/me", response_model=UserSchema)
+async def read_users_me(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_active_user),
+) -> Any:
     """Get current user"""
-    return current_user
+    return await _get_user_row(db, current_user)
 
-@router.put("/me", response_model=User)
-def update_user_me(
+@router.put("/me", response_model=UserSchema)
+async def update_user_me(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_in: UserUpdate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """Update current user"""
+    user = await _get_user_row(db, current_user)
     for field, value in user_in.model_dump(exclude_unset=True).items():
-        setattr(current_user, field, value)
-    db.add(current_user)
-    db.commit()
-    db.refresh(current_user)
-    return current_user
+        setattr(user, field, value)
+    db.add(user)
+    await db.commit()
+    await db.refresh(user)
+    # The flush already evicted the cached principal; evict again in case a
+    # concurrent request repopulated it from the pre-commit row
+    invalidate_cached_user(user.email)
+    return user
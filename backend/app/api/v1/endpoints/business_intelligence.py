@@ -2,12 +2,22 @@
 Business intelligence endpoints
 """
 
-from typing import Any, Optional
+import asyncio
+from typing import Any, AsyncIterator, Dict, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import text
-
-from app.core.database import get_db
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.auth import get_current_admin_user
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, get_async_db
+from app.core.responses import ORJSONResponse, json_dumps
+from app.schemas.business_intelligence import BusinessIntelligenceBatchRequest
+from app.services.business_intelligence import (
+    fetch_raw_bundle,
+    get_business_intelligence,
+    get_business_intelligence_many,
+)
 from app.services.pitch import pitch_service
 
 router = APIRouter()
@@ -16,59 +26,51 @@ router = APIRouter()
 @router.get("/domain/{domain_id}")
 async def get_business_intelligence_by_domain(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     domain_id: str,
+    include: Optional[str] = Query(
+        None,
+        description="Comma-separated optional fields; 'raw_data' adds the full intelligence bundle row",
+    ),
 ) -> Any:
     """
     Get business intelligence data for a specific domain
     """
     try:
-        # Query intelligence_bundles table for business intelligence data
-        data_query = text("""
-            SELECT ib.*, bd.domain
-            FROM intelligence_bundles ib
-            JOIN business_domains bd ON ib.domain_id = bd.id
-            WHERE ib.domain_id = :domain_id
-            ORDER BY ib.created_at DESC
-            LIMIT 1;
-        """)
-
-        result = db.execute(data_query, {"domain_id": domain_id})
-        row = result.fetchone()
-
-        if not row:
+        # Precomputed business intelligence from the read model (rebuilt from
+        # the latest intelligence bundle when missing or outdated)
+        transformed_data = await get_business_intelligence(db, domain_id)
+
+        if not transformed_data:
             raise HTTPException(
                 status_code=404,
                 detail=f"No business intelligence data found for domain {domain_id}"
             )
 
-        # Convert row to dictionary
-        columns = result.keys()
-        raw_data = dict(zip(columns, row))
-
-        # Transform the intelligence_bundles data into the expected business intelligence format
-        transformed_data = {
-            "domain_id": raw_data["domain_id"],
-            "domain": raw_data["domain"],
-            "company_name": raw_data.get("lead_company", ""),
-            "industry": raw_data.get("lead_industry", ""),
-            "description": raw_data.get("llm_digest", ""),
-            "website": f"https://{raw_data['domain']}",
-            "location": raw_data.get("lead_location", ""),
-            "employee_count": None,  # Not available in current schema
-            "revenue_range": None,   # Not available in current schema
-            "key_products": _extract_key_products(raw_data),
-            "target_audience": None,  # Could be derived from content analysis
-            "competitors": [],        # Not available in current schema
-            "pain_points": _extract_pain_points(raw_data),
-            "goals": _extract_goals(raw_data),
-            "budget_range": None,     # Not available in current schema
-            "timeline": None,         # Not available in current schema
-            "decision_makers": _extract_decision_makers(raw_data),
-            "recent_news": [],        # Not available in current schema
-            "social_media": _extract_social_media(raw_data),
-            "raw_data": raw_data,     # Include the raw data from the database
-        }
+        if include and "raw_data" in {part.strip() for part in include.split(",")}:
+            transformed_data = {
+                **transformed_data,
+                "raw_data": await fetch_raw_bundle(db, domain_id),
+            }
+
+        if settings.PITCH_PRECOMPUTED_ONLY or settings.PITCH_SWR_ENABLED:
+            if settings.PITCH_PRECOMPUTED_ONLY:
+                # Pitches come from the pre-generation worker only
+                marketing_pitch, pitch_meta = await pitch_service.get_precomputed_pitch(
+                    transformed_data, "Forge Assistant"
+                )
+            else:
+                # Serve the cached (or fallback) pitch now; regeneration happens
+                # in the background so latency never depends on the LLM
+                marketing_pitch, pitch_meta = await pitch_service.get_pitch_swr(
+                    transformed_data, "Forge Assistant"
+                )
+            # Payloads are already JSON-safe; skip the jsonable_encoder pass
+            return ORJSONResponse({
+                "data": transformed_data,
+                "marketing_pitch": marketing_pitch.to_dict(),
+                "pitch_meta": pitch_meta,
+            })
 
         # Generate marketing pitch using the business intelligence
         marketing_pitch = None
@@ -79,10 +81,10 @@ async def get_business_intelligence_by_domain(
             print(f"Warning: Failed to generate marketing pitch: {pitch_error}")
             # Could implement fallback pitch here if needed
 
-        return {
+        return ORJSONResponse({
             "data": transformed_data,
             "marketing_pitch": marketing_pitch.to_dict() if marketing_pitch else None
-        }
+        })
 
     except HTTPException:
         raise
@@ -93,124 +95,127 @@ async def get_business_intelligence_by_domain(
         )
 
 
-def _extract_key_products(data):
-    """Extract key products/services from the intelligence data"""
-    products = []
-
-    # Try to extract from content summaries
-    if data.get("content_summaries"):
-        summaries = data["content_summaries"]
-        if isinstance(summaries, dict) and "services" in summaries:
-            services_text = summaries["services"]
-            if isinstance(services_text, str):
-                # Simple extraction - could be improved with NLP
-                services = [s.strip() for s in services_text.split('\n') if s.strip() and len(s.strip()) > 3]
-                products.extend(services[:5])  # Limit to 5
-
-    # Try to extract from keyword signals
-    if data.get("keyword_signals") and not products:
-        signals = data["keyword_signals"]
-        if isinstance(signals, dict) and "top_keywords" in signals:
-            keywords = signals["top_keywords"]
-            if isinstance(keywords, list):
-                # Use top keywords as potential products/services
-                products.extend(keywords[:3])
-
-    return products if products else ["Business Services"]
-
-
-def _extract_pain_points(data):
-    """Extract potential pain points from the intelligence data"""
-    # This is a simplified extraction - in practice, this would require more sophisticated analysis
-    pain_points = []
-
-    # Could analyze content for common business pain points
-    # For now, return generic ones based on industry
-    industry = data.get("lead_industry", "").lower()
-    if "dental" in industry or "dentist" in industry:
-        pain_points = [
-            "Patient retention and loyalty",
-            "Competition from larger dental chains",
-            "Managing appointment scheduling efficiently",
-            "Keeping up with latest dental technologies"
-        ]
-    else:
-        pain_points = [
-            "Increasing operational efficiency",
-            "Managing customer relationships",
-            "Staying competitive in the market",
-            "Scaling business operations"
-        ]
-
-    return pain_points
-
-
-def _extract_goals(data):
-    """Extract business goals from the intelligence data"""
-    goals = [
-        "Grow business revenue and profitability",
-        "Improve customer satisfaction and retention",
-        "Expand market presence and reach",
-        "Leverage technology for competitive advantage"
-    ]
-
-    # Customize based on industry
-    industry = data.get("lead_industry", "").lower()
-    if "dental" in industry or "dentist" in industry:
-        goals = [
-            "Provide exceptional patient care and outcomes",
-            "Build long-term patient relationships",
-            "Grow practice through community engagement",
-            "Invest in modern dental technologies"
-        ]
-
-    return goals
-
-
-def _extract_decision_makers(data):
-    """Extract decision makers from the intelligence data"""
-    decision_makers = []
-
-    if data.get("lead_name") and data.get("lead_title"):
-        decision_makers.append({
-            "name": data["lead_name"],
-            "role": data["lead_title"]
-        })
+@router.post("/domains:batch")
+async def get_business_intelligence_batch(
+    *,
+    request: BusinessIntelligenceBatchRequest,
+    current_user = Depends(get_current_admin_user),
+) -> Any:
+    """
+    Business intelligence for many domains, streamed as NDJSON (admin only)
+
+    Domains are processed in chunks: each chunk is one set-based read
+    (snapshots, then latest bundles for any that are missing), and its
+    pitches come from the cache or are generated with bounded
+    concurrency. One JSON line is written per domain as soon as it is
+    ready, so output order may differ from the request. Pitch work still
+    outstanding when the client disconnects is cancelled.
+    """
+    # Preserve request order, drop duplicates
+    domain_ids = list(dict.fromkeys(request.domain_ids))
+    semaphore = asyncio.Semaphore(settings.BI_BATCH_PITCH_CONCURRENCY)
 
-    # Could extract more from metadata_insights if available
-    if data.get("metadata_insights"):
-        insights = data["metadata_insights"]
-        if isinstance(insights, dict) and "apollo_contact" in insights:
-            apollo_data = insights["apollo_contact"]
-            if isinstance(apollo_data, dict):
-                name = apollo_data.get("name")
-                title = apollo_data.get("title")
-                if name and title and name != data.get("lead_name"):
-                    decision_makers.append({
-                        "name": name,
-                        "role": title
-                    })
-
-    return decision_makers if decision_makers else [{"name": "Business Owner", "role": "Decision Maker"}]
-
-
-def _extract_social_media(data):
-    """Extract social media information from the intelligence data"""
-    social_media = {
-        "website": f"https://{data['domain']}"
-    }
+    async def lines() -> AsyncIterator[bytes]:
+        chunk_size = settings.BI_BATCH_CHUNK_SIZE
+        tasks = []
+        try:
+            for start in range(0, len(domain_ids), chunk_size):
+                chunk = domain_ids[start:start + chunk_size]
+                # Own session: the stream outlives the request dependencies
+                async with AsyncSessionLocal() as db:
+                    payloads = await get_business_intelligence_many(db, chunk)
+
+                tasks = []
+                for domain_id in chunk:
+                    data = payloads.get(domain_id)
+                    if data is None:
+                        yield _ndjson_line({"domain_id": domain_id, "error": "not_found"})
+                    elif not request.include_pitch:
+                        yield _ndjson_line({"domain_id": domain_id, "data": data})
+                    else:
+                        tasks.append(asyncio.ensure_future(_batch_item_with_pitch(domain_id, data, semaphore)))
+                for item in asyncio.as_completed(tasks):
+                    yield _ndjson_line(await item)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+async def _batch_item_with_pitch(
+    domain_id: str, data: Dict[str, Any], semaphore: asyncio.Semaphore
+) -> Dict[str, Any]:
+    """One batch result line, pitch included"""
+    async with semaphore:
+        if settings.PITCH_PRECOMPUTED_ONLY:
+            marketing_pitch, pitch_meta = await pitch_service.get_precomputed_pitch(data, "Forge Assistant")
+        elif settings.PITCH_SWR_ENABLED:
+            marketing_pitch, pitch_meta = await pitch_service.get_pitch_swr(data, "Forge Assistant")
+        else:
+            # generate_pitch serves cached pitches and falls back on failure
+            marketing_pitch, pitch_meta = await pitch_service.generate_pitch(data, "Forge Assistant"), None
+    item = {"domain_id": domain_id, "data": data, "marketing_pitch": marketing_pitch.to_dict()}
+    if pitch_meta is not None:
+        item["pitch_meta"] = pitch_meta
+    return item
+
+
+def _ndjson_line(item: Dict[str, Any]) -> bytes:
+    return json_dumps(item) + b"\n"
+
+
+@router.get("/domain/{domain_id}/pitch/stream")
+async def stream_business_intelligence_pitch(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    domain_id: str,
+) -> Any:
+    """
+    Stream business intelligence and its marketing pitch as Server-Sent Events
+
+    Sends a business_intelligence event immediately, then one pitch_field
+    event per pitch field as the model produces it, and finally a pitch
+    event carrying the complete pitch and its source (cache, generated or
+    fallback).
+    """
+    transformed_data = await get_business_intelligence(db, domain_id)
+    if not transformed_data:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No business intelligence data found for domain {domain_id}"
+        )
+
+    async def event_stream() -> AsyncIterator[str]:
+        yield _sse_event("business_intelligence", transformed_data)
+        async for pitch_event in pitch_service.stream_pitch(transformed_data, "Forge Assistant"):
+            name = pitch_event.pop("event")
+            yield _sse_event(name, pitch_event)
+        yield _sse_event("done", {})
 
-    # Extract from online_presence if available
-    if data.get("online_presence"):
-        presence = data["online_presence"]
-        if isinstance(presence, dict):
-            if "linkedin_url" in presence:
-                social_media["linkedin"] = presence["linkedin_url"]
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
-    # Default social media handles (could be improved)
-    social_media["twitter"] = f"https://twitter.com/{data['domain'].split('.')[0]}"
 
-    return social_media
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json_dumps(data).decode()}\n\n"
+
+
+@router.delete("/domain/{domain_id}/pitch")
+async def invalidate_domain_pitch(
+    *,
+    domain_id: str,
+    current_user = Depends(get_current_admin_user),
+) -> Any:
+    """
+    Drop cached marketing pitches for a domain (admin only)
+    """
+    removed = await pitch_service.invalidate_domain(domain_id)
+    return {"domain_id": domain_id, "invalidated": removed}
 
 
 @router.get("/health")
@@ -224,6 +229,7 @@ def business_intelligence_health() -> Any:
         "service": "business-intelligence",
         "pitch_generation": {
             "available": pitch_available,
-            "status": "available" if pitch_available else "unavailable - missing OPENAI_API_KEY"
+            "status": "available" if pitch_available else "unavailable - missing OPENAI_API_KEY",
+            **pitch_service.stats(),
         }
     }
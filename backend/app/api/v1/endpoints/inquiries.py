@@ -2,70 +2,198 @@
 Inquiry endpoints
 """
 
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, List, Optional
+import structlog
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import get_current_admin_user
-from app.core.database import get_db
+from app.core.cache import SharedCache
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, get_async_db
+from app.core.pagination import paginate, page_items
+from app.core.responses import typed_response
 from app.models.inquiry import Inquiry
 from app.schemas.inquiry import Inquiry as InquirySchema, InquiryCreate, InquiryUpdate
+from app.services.email import notify_inquiry_received
+
+logger = structlog.get_logger(__name__)
 
 router = APIRouter()
 
+# Submissions per email address and per client IP in the current window
+# (shared between workers when Redis is configured)
+submission_counts = SharedCache("inquiry:submissions", ttl=settings.INQUIRY_RATE_LIMIT_WINDOW_SECONDS)
+
+async def _check_submission_rate(email: str, client_ip: Optional[str]):
+    """Raise 429 once an address or IP has used up its submissions"""
+    limits = [(f"email:{email.lower()}", settings.INQUIRY_RATE_LIMIT_PER_EMAIL)]
+    if client_ip:
+        limits.append((f"ip:{client_ip}", settings.INQUIRY_RATE_LIMIT_PER_IP))
+    for key, limit in limits:
+        count = await submission_counts.incr(key)
+        # An unreachable cache lets the submission through
+        if count is not None and count > limit:
+            logger.warning("Inquiry rate limit exceeded", key=key, count=count)
+            raise HTTPException(
+                status_code=429,
+                detail="Too many inquiries, please try again later",
+                headers={"Retry-After": str(settings.INQUIRY_RATE_LIMIT_WINDOW_SECONDS)},
+            )
+
 @router.post("/", response_model=InquirySchema)
-def create_inquiry(
+async def create_inquiry(
     *,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
     inquiry_in: InquiryCreate,
 ) -> Any:
-    """Create a new inquiry (contact form submission)"""
+    """
+    Create a new inquiry (contact form submission)
+
+    Rate limited per email address and client IP. The confirmation email
+    is queued, not sent, before responding.
+    """
+    await _check_submission_rate(inquiry_in.email, request.client.host if request.client else None)
     inquiry = Inquiry(**inquiry_in.model_dump())
     db.add(inquiry)
-    db.commit()
-    db.refresh(inquiry)
+    await db.commit()
+    await db.refresh(inquiry)
+    try:
+        await notify_inquiry_received(inquiry)
+    except Exception:
+        # The inquiry is already stored; a lost confirmation must not turn
+        # the submission into an error (and a resubmission)
+        logger.exception("Failed to queue inquiry emails", inquiry_id=inquiry.id)
     return inquiry
 
 @router.get("/", response_model=List[InquirySchema])
-def read_inquiries(
-    db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100,
+async def read_inquiries(
+    db: AsyncSession = Depends(get_async_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    status: Optional[str] = None,
+    service_interest: Optional[str] = None,
+    skip: int = Query(0, ge=0, deprecated=True),
+    current_user = Depends(get_current_admin_user),
+) -> Any:
+    """
+    Get inquiries, newest first (admin only)
+
+    Pass the X-Next-Cursor header of one page as ?cursor= to get the next.
+    """
+    query = select(Inquiry)
+    if status:
+        query = query.where(Inquiry.status == status)
+    if service_interest:
+        query = query.where(Inquiry.service_interest == service_interest)
+    query = paginate(query, Inquiry, cursor, limit)
+    if skip and not cursor:
+        query = query.offset(skip)
+    result = await db.execute(query)
+    items, headers = page_items(result.scalars().all(), limit)
+    return typed_response(List[InquirySchema], items, headers=headers)
+
+EXPORT_BATCH_SIZE = 1000
+
+# Leading characters that make spreadsheet applications evaluate a cell
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+@router.get("/export")
+async def export_inquiries(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    status: Optional[str] = None,
     current_user = Depends(get_current_admin_user),
 ) -> Any:
-    """Get all inquiries (admin only)"""
-    inquiries = db.query(Inquiry).offset(skip).limit(limit).all()
-    return inquiries
+    """
+    Export every inquiry as CSV or NDJSON (admin only)
+
+    Rows are read through a server-side cursor in batches of
+    EXPORT_BATCH_SIZE plain tuples and written out as each batch arrives,
+    so memory use does not grow with the table. CSV cells starting with a
+    formula character are prefixed with a quote so spreadsheets show them
+    as text.
+    """
+    # id first, then the model's own column order
+    columns = sorted(Inquiry.__table__.columns, key=lambda column: column.name != "id")
+    names = [column.name for column in columns]
+    query = select(*columns).order_by(Inquiry.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+    if status:
+        query = query.where(Inquiry.status == status)
+
+    async def rows() -> AsyncIterator[str]:
+        if format == "csv":
+            yield _csv_lines([names])
+        # Own session: the stream outlives the request dependencies
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(query)
+            async for partition in result.partitions():
+                if format == "csv":
+                    yield _csv_lines([[_csv_value(value) for value in row] for row in partition])
+                else:
+                    yield "".join(
+                        json.dumps(dict(zip(names, map(_export_value, row)))) + "\n"
+                        for row in partition
+                    )
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"inquiries.{format}"
+    return StreamingResponse(
+        rows(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+def _export_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def _csv_value(value: Any) -> Any:
+    """Export value with formula-like text neutralised by a leading quote"""
+    value = _export_value(value)
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+def _csv_lines(rows: List[List[Any]]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
 
 @router.get("/{inquiry_id}", response_model=InquirySchema)
-def read_inquiry(
+async def read_inquiry(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     inquiry_id: int,
     current_user = Depends(get_current_admin_user),
 ) -> Any:
     """Get inquiry by ID (admin only)"""
-    inquiry = db.query(Inquiry).filter(Inquiry.id == inquiry_id).first()
+    inquiry = await db.get(Inquiry, inquiry_id)
     if not inquiry:
         raise HTTPException(status_code=404, detail="Inquiry not found")
     return inquiry
 
 @router.put("/{inquiry_id}", response_model=InquirySchema)
-def update_inquiry(
+async def update_inquiry(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     inquiry_id: int,
     inquiry_in: InquiryUpdate,
     current_user = Depends(get_current_admin_user),
 ) -> Any:
     """Update inquiry (admin only)"""
-    inquiry = db.query(Inquiry).filter(Inquiry.id == inquiry_id).first()
+    inquiry = await db.get(Inquiry, inquiry_id)
     if not inquiry:
         raise HTTPException(status_code=404, detail="Inquiry not found")
 
     for field, value in inquiry_in.model_dump(exclude_unset=True).items():
         setattr(inquiry, field, value)
     db.add(inquiry)
-    db.commit()
-    db.refresh(inquiry)
+    await db.commit()
+    await db.refresh(inquiry)
     return inquiry
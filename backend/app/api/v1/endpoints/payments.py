@@ -3,18 +3,18 @@ Payment endpoints with Stripe integration
 """
 
 import stripe
-from typing import Any, Dict
-from fastapi import APIRouter, Body, Depends, HTTPException, Request
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Request
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import get_current_active_user
 from app.core.config import settings
-from app.core.database import get_db
-from app.models.user import User
-
-# Initialize Stripe
-stripe.api_key = settings.STRIPE_SECRET_KEY
+from app.core.database import get_async_db
+from app.schemas.auth import UserPrincipal
+from app.services.stripe_customers import get_customer_id, list_payment_methods
+from app.services.stripe_gateway import stripe_gateway
+from app.services.stripe_webhooks import webhook_processor
 
 router = APIRouter()
 
@@ -24,10 +24,11 @@ class PaymentIntentRequest(BaseModel):
     currency: str = "usd"
 
 @router.post("/create-payment-intent")
-def create_payment_intent(
+async def create_payment_intent(
     *,
     payment_data: PaymentIntentRequest = Body(...),
-    current_user: User = Depends(get_current_active_user),
+    idempotency_key: Optional[str] = Header(None),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Dict[str, Any]:
     """Create Stripe payment intent"""
     try:
@@ -37,23 +38,38 @@ def create_payment_intent(
         if amount <= 0:
             raise HTTPException(status_code=400, detail="Invalid amount")
 
-        # Create payment intent
-        intent = stripe.PaymentIntent.create(
+        # Create payment intent; a client-supplied Idempotency-Key makes
+        # resubmitting the same checkout safe. Stripe keys are account-wide,
+        # so it is scoped to the user: another user's key must not replay
+        # (or collide with) their payment intent.
+        intent = await stripe_gateway.create_payment_intent(
             amount=int(amount * 100),  # Convert to cents
             currency=currency,
             metadata={"user_id": current_user.id},
+            idempotency_key=f"{current_user.id}:{idempotency_key}" if idempotency_key else None,
         )
 
         return {
-            "client_secret": intent.client_secret,
-            "payment_intent_id": intent.id,
+            "client_secret": intent["client_secret"],
+            "payment_intent_id": intent["id"],
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/webhook")
-async def stripe_webhook(request: Request) -> Dict[str, str]:
-    """Handle Stripe webhooks"""
+async def stripe_webhook(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+) -> Dict[str, str]:
+    """
+    Receive Stripe webhooks
+
+    Verified events are stored and acknowledged straight away; the webhook
+    processor applies them in the background. Redeliveries of an event
+    that was already stored are acknowledged without being stored again.
+    """
     payload = await request.body()
     sig_header = request.headers.get("stripe-signature")
 
@@ -66,39 +82,25 @@ async def stripe_webhook(request: Request) -> Dict[str, str]:
     except stripe.error.SignatureVerificationError:
         raise HTTPException(status_code=400, detail="Invalid signature")
 
-    # Handle the event
-    if event.type == "payment_intent.succeeded":
-        payment_intent = event.data.object
-        # TODO: Update payment status in database
-        print(f"Payment succeeded: {payment_intent.id}")
-
+    await webhook_processor.ingest(db, event.to_dict_recursive())
     return {"status": "success"}
 
 @router.get("/payment-methods")
-def get_payment_methods(
-    current_user: User = Depends(get_current_active_user),
+async def get_payment_methods(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Dict[str, Any]:
     """Get user's saved payment methods"""
     try:
-        # Get or create customer
-        customers = stripe.Customer.list(email=current_user.email)
-        if customers.data:
-            customer = customers.data[0]
-        else:
-            customer = stripe.Customer.create(
-                email=current_user.email,
-                name=current_user.full_name,
-            )
+        # Local user -> customer mapping (found or created remotely on first use)
+        customer_id = await get_customer_id(db, current_user)
 
-        # Get payment methods
-        payment_methods = stripe.PaymentMethod.list(
-            customer=customer.id,
-            type="card",
-        )
+        # Get payment methods (cached until a webhook reports a change)
+        payment_methods = await list_payment_methods(customer_id)
 
         return {
-            "customer_id": customer.id,
-            "payment_methods": payment_methods.data,
+            "customer_id": customer_id,
+            "payment_methods": payment_methods,
         }
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -2,12 +2,16 @@
 Project endpoints
 """
 
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.core.auth import get_current_active_user, get_current_admin_user
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.pagination import paginate, page_items
+from app.core.responses import typed_response
 from app.models.project import Project, ProjectUpdate
 from app.models.user import User
 from app.schemas.project import (
@@ -20,56 +24,73 @@ from app.schemas.project import (
 
 router = APIRouter()
 
+async def _get_project(db: AsyncSession, project_id: int) -> Optional[Project]:
+    """Load a project with its updates (async sessions cannot lazy load)"""
+    result = await db.execute(
+        select(Project)
+        .options(selectinload(Project.updates))
+        .where(Project.id == project_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
+
 @router.post("/", response_model=ProjectSchema)
-def create_project(
+async def create_project(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     project_in: ProjectCreate,
     current_user = Depends(get_current_admin_user),
 ) -> Any:
     """Create a new project (admin only)"""
     # Verify client exists
-    client = db.query(User).filter(User.id == project_in.client_id).first()
+    client = await db.get(User, project_in.client_id)
     if not client:
         raise HTTPException(status_code=404, detail="Client not found")
 
     project = Project(**project_in.model_dump())
     db.add(project)
-    db.commit()
-    db.refresh(project)
-    return project
+    await db.commit()
+    return await _get_project(db, project.id)
 
 @router.get("/", response_model=List[ProjectSchema])
-def read_projects(
-    db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100,
+async def read_projects(
+    db: AsyncSession = Depends(get_async_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    status: Optional[str] = None,
+    project_type: Optional[str] = None,
+    skip: int = Query(0, ge=0, deprecated=True),
     current_user = Depends(get_current_active_user),
 ) -> Any:
-    """Get projects (filtered by user role)"""
-    if current_user.is_admin:
-        # Admin sees all projects
-        projects = db.query(Project).offset(skip).limit(limit).all()
-    else:
+    """
+    Get projects, newest first (filtered by user role)
+
+    Pass the X-Next-Cursor header of one page as ?cursor= to get the next.
+    """
+    query = select(Project).options(selectinload(Project.updates))
+    if not current_user.is_admin:
         # Client sees only their projects
-        projects = (
-            db.query(Project)
-            .filter(Project.client_id == current_user.id)
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
-    return projects
+        query = query.where(Project.client_id == current_user.id)
+    if status:
+        query = query.where(Project.status == status)
+    if project_type:
+        query = query.where(Project.project_type == project_type)
+    query = paginate(query, Project, cursor, limit)
+    if skip and not cursor:
+        query = query.offset(skip)
+    result = await db.execute(query)
+    items, headers = page_items(result.scalars().all(), limit)
+    return typed_response(List[ProjectSchema], items, headers=headers)
 
 @router.get("/{project_id}", response_model=ProjectSchema)
-def read_project(
+async def read_project(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     project_id: int,
     current_user = Depends(get_current_active_user),
 ) -> Any:
     """Get project by ID"""
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await _get_project(db, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
@@ -80,36 +101,35 @@ def read_project(
     return project
 
 @router.put("/{project_id}", response_model=ProjectSchema)
-def update_project(
+async def update_project(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     project_id: int,
     project_in: ProjectUpdateSchema,
     current_user = Depends(get_current_admin_user),
 ) -> Any:
     """Update project (admin only)"""
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await _get_project(db, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
     for field, value in project_in.model_dump(exclude_unset=True).items():
         setattr(project, field, value)
     db.add(project)
-    db.commit()
-    db.refresh(project)
-    return project
+    await db.commit()
+    return await _get_project(db, project_id)
 
 @router.post("/{project_id}/updates", response_model=ProjectUpdateResponse)
-def create_project_update(
+async def create_project_update(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     project_id: int,
     update_in: ProjectUpdateCreate,
     current_user = Depends(get_current_admin_user),
 ) -> Any:
     """Create project update (admin only)"""
     # Verify project exists
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
@@ -119,6 +139,6 @@ def create_project_update(
 
     update = ProjectUpdate(**update_in.model_dump())
     db.add(update)
-    db.commit()
-    db.refresh(update)
+    await db.commit()
+    await db.refresh(update)
     return update
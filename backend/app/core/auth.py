@@ -2,23 +2,73 @@
 Authentication dependencies for FastAPI
 """
 
-from typing import Generator
+import asyncio
+import hmac
+from typing import Any, Dict, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import jwt, JWTError
-from sqlalchemy.orm import Session
+from jose import JWTError
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import SharedCache, TTLCache, get_cache_backend
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.security import decode_access_token, token_cache
 from app.models.user import User
-from app.schemas.auth import TokenData
+from app.schemas.auth import TokenData, UserPrincipal
 
 security = HTTPBearer()
+metrics_security = HTTPBearer(auto_error=False)
 
-def get_current_user(
+# Principal snapshots keyed by token subject (email), in this process and
+# in the shared cache so other workers start warm. Entries are dropped
+# whenever the user row changes, but only in this process and the shared
+# cache: other workers keep their copy for up to AUTH_USER_LOCAL_TTL_SECONDS
+# (the in-process stand-in for the shared cache is process-local too, so it
+# gets the same limit). AUTH_USER_CACHE_TTL_SECONDS bounds staleness for
+# writes made outside the application.
+user_cache = TTLCache(
+    maxsize=settings.AUTH_USER_CACHE_SIZE,
+    ttl=min(settings.AUTH_USER_LOCAL_TTL_SECONDS, settings.AUTH_USER_CACHE_TTL_SECONDS),
+)
+shared_user_cache = SharedCache("auth:user", ttl=settings.AUTH_USER_CACHE_TTL_SECONDS)
+_pending_invalidations = set()
+
+def _shared_user_ttl() -> float:
+    if get_cache_backend().shared:
+        return shared_user_cache.ttl
+    return user_cache.ttl
+
+def invalidate_cached_user(email: str):
+    """Drop the cached principal for a user"""
+    user_cache.pop(email)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # Sync callers (scripts, workers) have no loop; the TTL covers them
+        return
+    task = loop.create_task(shared_user_cache.delete(email))
+    _pending_invalidations.add(task)
+    task.add_done_callback(_pending_invalidations.discard)
+
+@event.listens_for(User, "after_update")
+def _invalidate_on_update(mapper, connection, target):
+    # Covers profile edits and admin deactivation alike; after an email
+    # change the principal is still cached under the previous address
+    invalidate_cached_user(target.email)
+    for previous in inspect(target).attrs.email.history.deleted:
+        if previous and previous != target.email:
+            invalidate_cached_user(previous)
+
+@event.listens_for(User, "after_delete")
+def _invalidate_on_delete(mapper, connection, target):
+    invalidate_cached_user(target.email)
+
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_async_db)
+) -> UserPrincipal:
     """Get current authenticated user"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -27,7 +77,7 @@ def get_current_user(
     )
 
     try:
-        payload = jwt.decode(credentials.credentials, settings.SECRET_KEY, algorithms=["HS256"])
+        payload = decode_access_token(credentials.credentials)
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
@@ -35,20 +85,33 @@ def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    user = db.query(User).filter(User.email == token_data.email).first()
-    if user is None:
-        raise credentials_exception
-    if not user.is_active:
+    principal = user_cache.get(token_data.email)
+    if principal is None:
+        shared = await shared_user_cache.get(token_data.email)
+        if shared is not None:
+            principal = UserPrincipal.model_validate(shared)
+        else:
+            result = await db.execute(select(User).where(User.email == token_data.email))
+            user = result.scalars().first()
+            if user is None:
+                raise credentials_exception
+            principal = UserPrincipal.model_validate(user)
+            await shared_user_cache.set(
+                token_data.email, principal.model_dump(mode="json"), ttl=_shared_user_ttl()
+            )
+        user_cache.set(token_data.email, principal)
+
+    if not principal.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
-    return user
+    return principal
 
-def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_active_user(current_user: UserPrincipal = Depends(get_current_user)) -> UserPrincipal:
     """Get current active user"""
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
-def get_current_admin_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_admin_user(current_user: UserPrincipal = Depends(get_current_user)) -> UserPrincipal:
     """Get current admin user"""
     if not current_user.is_admin:
         raise HTTPException(
@@ -57,7 +120,7 @@ def get_current_admin_user(current_user: User = Depends(get_current_user)) -> Us
         )
     return current_user
 
-def get_current_super_admin_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_super_admin_user(current_user: UserPrincipal = Depends(get_current_user)) -> UserPrincipal:
     """Get current super admin user"""
     if not current_user.is_super_admin:
         raise HTTPException(
@@ -65,3 +128,27 @@ def get_current_super_admin_user(current_user: User = Depends(get_current_user))
             detail="Not enough permissions"
         )
     return current_user
+
+async def require_metrics_access(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(metrics_security),
+    db: AsyncSession = Depends(get_async_db)
+) -> None:
+    """Allow the metrics scraper (METRICS_TOKEN) or an admin user"""
+    if credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    token = settings.METRICS_TOKEN
+    if token and hmac.compare_digest(credentials.credentials.encode(), token.encode()):
+        return
+    await get_current_admin_user(await get_current_user(credentials, db))
+
+def get_auth_cache_stats() -> Dict[str, Any]:
+    """Cache counters for the authentication dependencies"""
+    return {
+        "user_cache": user_cache.stats(),
+        "shared_user_cache": shared_user_cache.stats(),
+        "token_cache": token_cache.stats(),
+    }
@@ -0,0 +1,328 @@
+"""
+Caching utilities
+
+TTLCache is a bounded in-process LRU. SharedCache is a namespaced cache
+over a pluggable backend: Redis when REDIS_URL is configured, so every
+worker shares one warm cache, otherwise an in-process TTLCache stand-in.
+Values are serialized with orjson (falling back to the json module), and
+backend failures degrade to cache misses.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import structlog
+
+from app.core.config import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # pragma: no cover - redis is in requirements.txt
+    redis_asyncio = None
+
+logger = structlog.get_logger(__name__)
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after a time-to-live"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or default if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store a value; ttl overrides the cache default for this entry"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def incr(self, key: Hashable, ttl: Optional[float] = None) -> int:
+        """Add one to a counter; a new counter expires after ttl, an existing one keeps its expiry"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                entry = (now + (self.ttl if ttl is None else ttl), 0)
+            count = entry[1] + 1
+            self._data[key] = (entry[0], count)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+            return count
+
+    def pop(self, key: Hashable) -> Any:
+        """Remove an entry, returning its value if it was cached"""
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return entry[1] if entry else None
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+def dumps(value: Any) -> bytes:
+    """Serialize a JSON-compatible value for a cache backend"""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+def loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class CacheBackend:
+    """Byte-oriented key/value store with per-key TTLs"""
+
+    name = "base"
+    # Whether every worker sees the same entries (and so the same deletes)
+    shared = True
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        raise NotImplementedError
+
+    async def set_many(self, items: Iterable[Tuple[str, bytes]], ttl: float):
+        raise NotImplementedError
+
+    async def delete(self, keys: Sequence[str]):
+        raise NotImplementedError
+
+    async def incr(self, key: str, ttl: float) -> int:
+        """Increment a counter that expires ttl seconds after it was created"""
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class MemoryBackend(CacheBackend):
+    """Per-process stand-in used when no Redis is configured"""
+
+    name = "memory"
+    shared = False
+
+    def __init__(self, maxsize: int):
+        self._cache = TTLCache(maxsize=maxsize, ttl=0)
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        return [self._cache.get(key) for key in keys]
+
+    async def set_many(self, items: Iterable[Tuple[str, bytes]], ttl: float):
+        for key, value in items:
+            self._cache.set(key, value, ttl=ttl)
+
+    async def delete(self, keys: Sequence[str]):
+        for key in keys:
+            self._cache.pop(key)
+
+    async def incr(self, key: str, ttl: float) -> int:
+        return self._cache.incr(key, ttl=ttl)
+
+
+class RedisBackend(CacheBackend):
+    """Redis backend; multi-key reads are one MGET, writes one pipeline"""
+
+    name = "redis"
+
+    def __init__(self, url: str):
+        # Accept bare host names (REDIS_URL=redis.internal) as well as URLs
+        if "://" not in url:
+            url = f"redis://{url}"
+        self._client = redis_asyncio.from_url(
+            url,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            health_check_interval=30,
+        )
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        return await self._client.mget(keys)
+
+    async def set_many(self, items: Iterable[Tuple[str, bytes]], ttl: float):
+        milliseconds = max(int(ttl * 1000), 1)
+        async with self._client.pipeline(transaction=False) as pipe:
+            for key, value in items:
+                pipe.set(key, value, px=milliseconds)
+            await pipe.execute()
+
+    async def delete(self, keys: Sequence[str]):
+        await self._client.delete(*keys)
+
+    async def incr(self, key: str, ttl: float) -> int:
+        # SET NX starts the window; later increments leave the expiry alone
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.set(key, 0, px=max(int(ttl * 1000), 1), nx=True)
+            pipe.incr(key)
+            _, count = await pipe.execute()
+        return count
+
+    async def close(self):
+        await self._client.aclose()
+
+
+_backend: Optional[CacheBackend] = None
+
+
+def get_cache_backend() -> CacheBackend:
+    """Process-wide backend, chosen from settings on first use"""
+    global _backend
+    if _backend is None:
+        if settings.REDIS_URL and redis_asyncio is not None:
+            _backend = RedisBackend(settings.REDIS_URL)
+        else:
+            if settings.REDIS_URL:
+                logger.warning("REDIS_URL is set but redis is not installed; using in-process cache")
+            _backend = MemoryBackend(maxsize=settings.CACHE_MEMORY_SIZE)
+    return _backend
+
+
+def set_cache_backend(backend: Optional[CacheBackend]):
+    """Replace the process-wide backend (None re-reads settings on next use)"""
+    global _backend
+    _backend = backend
+
+
+async def close_cache_backend():
+    global _backend
+    if _backend is not None:
+        await _backend.close()
+        _backend = None
+
+
+class SharedCache:
+    """Namespaced, serialized view of the process-wide cache backend"""
+
+    def __init__(self, namespace: str, ttl: float):
+        self.namespace = namespace
+        self.ttl = ttl
+        self._prefix = f"{settings.CACHE_KEY_PREFIX}:{namespace}:"
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _key(self, key: Any) -> str:
+        return f"{self._prefix}{key}"
+
+    async def get(self, key: Any) -> Any:
+        """Cached value, or None if missing, expired or unreachable"""
+        return (await self.get_many([key]))[0]
+
+    async def get_many(self, keys: Sequence[Any]) -> List[Any]:
+        """Values for several keys in one round trip (None where missing)"""
+        if not keys:
+            return []
+        try:
+            raw = await get_cache_backend().get_many([self._key(key) for key in keys])
+        except Exception as e:
+            self.errors += 1
+            self.misses += len(keys)
+            logger.warning("Shared cache read failed", namespace=self.namespace, error=str(e))
+            return [None] * len(keys)
+        values = []
+        for data in raw:
+            if data is None:
+                self.misses += 1
+                values.append(None)
+            else:
+                self.hits += 1
+                values.append(loads(data))
+        return values
+
+    async def set(self, key: Any, value: Any, ttl: Optional[float] = None):
+        await self.set_many([(key, value)], ttl=ttl)
+
+    async def set_many(self, items: Sequence[Tuple[Any, Any]], ttl: Optional[float] = None):
+        """Store several values in one round trip"""
+        ttl = self.ttl if ttl is None else ttl
+        if not items or ttl <= 0:
+            return
+        try:
+            await get_cache_backend().set_many(
+                [(self._key(key), dumps(value)) for key, value in items], ttl
+            )
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Shared cache write failed", namespace=self.namespace, error=str(e))
+
+    async def delete(self, *keys: Any):
+        if not keys:
+            return
+        try:
+            await get_cache_backend().delete([self._key(key) for key in keys])
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Shared cache delete failed", namespace=self.namespace, error=str(e))
+
+    async def incr(self, key: Any, ttl: Optional[float] = None) -> Optional[int]:
+        """Count an event in a window of ttl seconds; None if the backend is unreachable"""
+        try:
+            return await get_cache_backend().incr(self._key(key), self.ttl if ttl is None else ttl)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Shared cache increment failed", namespace=self.namespace, error=str(e))
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": get_cache_backend().name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
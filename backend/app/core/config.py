@@ -15,6 +15,26 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
     SECRET_KEY: str = secrets.token_urlsafe(32)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 days
+    # Authenticated user snapshots cached per token subject. Invalidations
+    # (e.g. deactivation) clear the shared cache but cannot reach other
+    # workers' in-process copies, so those live for the shorter local TTL.
+    AUTH_USER_CACHE_SIZE: int = 10000
+    AUTH_USER_CACHE_TTL_SECONDS: float = 60.0
+    AUTH_USER_LOCAL_TTL_SECONDS: float = 5.0
+    # Verified JWT claims cached until each token's exp
+    AUTH_TOKEN_CACHE_SIZE: int = 10000
+    # bcrypt worker processes and the cap on queued + running hash jobs;
+    # requests beyond the cap get a 503
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    # Bearer token for the /metrics endpoints (e.g. the Prometheus scraper);
+    # without it they are open to admin users only
+    METRICS_TOKEN: Optional[str] = None
+
+    # Reverse proxies (comma-separated addresses or CIDR ranges) whose
+    # X-Forwarded-For / X-Forwarded-Proto headers are believed; from any
+    # other peer they are ignored, so clients cannot pick their own IP
+    TRUSTED_PROXY_IPS: str = "127.0.0.1"
 
     # Server
     SERVER_NAME: str = "ShortForge API"
@@ -71,10 +91,90 @@ class Settings(BaseSettings):
 
         return f"postgresql://{user}:{password}@{server}:{port}/{db}"
 
+    @field_validator("STRIPE_WEBHOOK_WORKER_ENABLED", "JOBS_POLL_ENABLED", mode="before")
+    @classmethod
+    def default_off_for_sqlite(cls, v: Optional[bool], info: ValidationInfo) -> bool:
+        # Background database loops only default on for a pooled database
+        if v is None or v == "":
+            return not info.data.get("DATABASE_URL", "").startswith("sqlite")
+        return v
+
+    # Database connection pool (ignored for SQLite)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 300  # seconds before a connection is replaced
+    # "always" pings on every checkout, "idle" only after DB_POOL_PRE_PING_IDLE_SECONDS
+    # without use, "never" trusts pooled connections
+    DB_POOL_PRE_PING: str = "idle"
+    DB_POOL_PRE_PING_IDLE_SECONDS: float = 30.0
+
+    # Shared cache (core/cache.py): Redis when REDIS_URL is set, otherwise a
+    # per-process in-memory stand-in. A bare host name is accepted.
+    REDIS_URL: Optional[str] = None
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 0.5
+    CACHE_KEY_PREFIX: str = "shortforge"
+    CACHE_MEMORY_SIZE: int = 10000
+
+    # Per-request SQL instrumentation and the threshold above which a
+    # statement is logged on its own. A request is summarised in the log only
+    # when its database time or query count reaches the SQL_REQUEST_SUMMARY_*
+    # limits. The Server-Timing header exposes query counts and timings to
+    # any client, so it is off unless enabled (e.g. in development).
+    SQL_INSTRUMENTATION_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    SQL_REQUEST_SUMMARY_MIN_DB_MS: float = 500.0
+    SQL_REQUEST_SUMMARY_MIN_QUERIES: int = 50
+    SQL_SERVER_TIMING_ENABLED: bool = False
+
+    @field_validator("DB_POOL_PRE_PING")
+    @classmethod
+    def validate_pre_ping(cls, v: str) -> str:
+        if v not in ("always", "idle", "never"):
+            raise ValueError("DB_POOL_PRE_PING must be one of: always, idle, never")
+        return v
+
     # Stripe
     STRIPE_SECRET_KEY: str = ""
     STRIPE_WEBHOOK_SECRET: str = ""
     STRIPE_PUBLISHABLE_KEY: str = ""
+    # Async Stripe gateway (services/stripe_gateway.py)
+    STRIPE_API_BASE: str = "https://api.stripe.com"
+    STRIPE_API_VERSION: str = "2023-10-16"
+    STRIPE_TIMEOUT_SECONDS: float = 10.0
+    STRIPE_MAX_RETRIES: int = 2
+    STRIPE_MAX_CONNECTIONS: int = 20
+    # Cached card lists per customer; webhook events invalidate them early
+    STRIPE_PAYMENT_METHODS_CACHE_TTL_SECONDS: int = 5 * 60
+    # Webhook events are stored on receipt and drained in the background
+    # (in-process unless disabled; python -m app.workers.stripe_webhooks
+    # runs a standalone drainer). Failed events retry with exponential
+    # backoff and are dead-lettered after the max attempts. The in-process
+    # drainer defaults to off on SQLite, where every session shares one
+    # connection and the drainer's commits collide with request sessions.
+    STRIPE_WEBHOOK_WORKER_ENABLED: Optional[bool] = None
+    STRIPE_WEBHOOK_BATCH_SIZE: int = 50
+    STRIPE_WEBHOOK_MAX_ATTEMPTS: int = 8
+    STRIPE_WEBHOOK_POLL_SECONDS: float = 5.0
+    STRIPE_WEBHOOK_RETRY_BASE_SECONDS: float = 5.0
+    STRIPE_WEBHOOK_CLAIM_TIMEOUT_SECONDS: float = 5 * 60
+
+    # In-process background jobs (core/jobs.py). Each queue runs this many
+    # workers unless it declares its own limit; failed jobs retry with
+    # exponential backoff. Persisted jobs left behind by a stopped process
+    # are picked up by the poll loop (running ones after the claim timeout).
+    # On SQLite the poll loop defaults to off, since it would share the one
+    # connection with request sessions; leftover jobs are then picked up
+    # once at startup instead.
+    JOBS_POLL_ENABLED: Optional[bool] = None
+    JOBS_DEFAULT_CONCURRENCY: int = 4
+    JOBS_MAX_ATTEMPTS: int = 3
+    JOBS_RETRY_BASE_SECONDS: float = 2.0
+    JOBS_RETRY_MAX_SECONDS: float = 10 * 60
+    JOBS_POLL_SECONDS: float = 30.0
+    JOBS_CLAIM_TIMEOUT_SECONDS: float = 10 * 60
+    # How long shutdown waits for queued jobs to finish
+    JOBS_DRAIN_TIMEOUT_SECONDS: float = 20.0
 
     # Email
     SMTP_TLS: bool = True
@@ -84,6 +184,51 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: Optional[str] = None
     EMAILS_FROM_EMAIL: Optional[str] = None
     EMAILS_FROM_NAME: Optional[str] = None
+    # Outgoing mail (services/email.py): each pooled SMTP connection stays
+    # open between messages and sends whatever is queued as one batch
+    SMTP_POOL_SIZE: int = 2
+    SMTP_BATCH_SIZE: int = 50
+    SMTP_TIMEOUT_SECONDS: float = 10.0
+    SMTP_IDLE_TIMEOUT_SECONDS: float = 60.0
+    # Also notify this address of new inquiries (none when unset)
+    INQUIRY_NOTIFICATION_EMAIL: Optional[str] = None
+    # The public inquiry form sends mail to the address it is given; limit
+    # submissions per email address and per client IP in each window
+    INQUIRY_RATE_LIMIT_WINDOW_SECONDS: int = 60 * 60
+    INQUIRY_RATE_LIMIT_PER_EMAIL: int = 3
+    INQUIRY_RATE_LIMIT_PER_IP: int = 10
+
+    # Business intelligence read model: snapshots older than this are rebuilt
+    # on request (0 disables the check and relies on the refresh job alone)
+    BI_READ_MODEL_MAX_AGE_SECONDS: int = 60 * 60  # 1 hour
+    # Business intelligence payloads in the shared cache
+    BI_CACHE_TTL_SECONDS: int = 5 * 60
+    # Bulk lookup (POST /business-intelligence/domains:batch)
+    BI_BATCH_MAX_DOMAINS: int = 5000
+    BI_BATCH_CHUNK_SIZE: int = 200
+    BI_BATCH_PITCH_CONCURRENCY: int = 8
+
+    # Marketing pitch cache (in-process LRU in front of the pitch_cache table)
+    PITCH_CACHE_TTL_SECONDS: int = 60 * 60 * 24 * 7  # 7 days
+    PITCH_CACHE_MEMORY_SIZE: int = 1024
+    # Lifetime of pitches in process-local tiers, which invalidations made by
+    # other workers cannot reach
+    PITCH_CACHE_LOCAL_TTL_SECONDS: int = 60
+    # Longest a request waits on a (possibly shared) pitch generation before
+    # falling back to the static pitch
+    PITCH_GENERATION_TIMEOUT_SECONDS: float = 20.0
+    # Stale-while-revalidate: serve whatever pitch is cached immediately and
+    # regenerate in the background once it is older than the fresh window.
+    # Pitches older than the max stale window are replaced by the fallback
+    # pitch until the background regeneration lands.
+    PITCH_SWR_ENABLED: bool = False
+    PITCH_SWR_FRESH_SECONDS: int = 60 * 60  # 1 hour
+    PITCH_SWR_MAX_STALE_SECONDS: int = 60 * 60 * 24 * 3  # 3 days
+    # Background regenerations running at once (the "pitch" job queue)
+    PITCH_REFRESH_CONCURRENCY: int = 2
+    # Only serve pitches produced by the pre-generation worker
+    # (python -m app.workers.pitch_pregeneration); never call the LLM inline
+    PITCH_PRECOMPUTED_ONLY: bool = False
 
     # ElevenLabs
     ELEVENLABS_API_KEY: str = ""
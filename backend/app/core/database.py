@@ -2,13 +2,168 @@
 Database configuration and session management
 """
 
-from sqlalchemy import create_engine
+import threading
+import time
+from typing import Any, AsyncGenerator, Dict
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
 
 from app.core.config import settings
 
+
+class PoolMetrics:
+    """Connection pool usage counters"""
+
+    # Upper bounds (ms) of the checkout wait histogram buckets
+    WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.overflow_checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.pre_pings = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.wait_buckets = [0] * (len(self.WAIT_BUCKETS_MS) + 1)
+
+    def record_checkout(self, wait_ms: float, overflow: bool):
+        with self._lock:
+            self.checkouts += 1
+            if overflow:
+                self.overflow_checkouts += 1
+            self.wait_total_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+            for i, bound in enumerate(self.WAIT_BUCKETS_MS):
+                if wait_ms <= bound:
+                    self.wait_buckets[i] += 1
+                    break
+            else:
+                self.wait_buckets[-1] += 1
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def increment(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            bounds = [str(b) for b in self.WAIT_BUCKETS_MS] + ["+Inf"]
+            return {
+                "checkouts": self.checkouts,
+                "overflow_checkouts": self.overflow_checkouts,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "pre_pings": self.pre_pings,
+                "checkout_wait_ms": {
+                    "total": round(self.wait_total_ms, 3),
+                    "max": round(self.wait_max_ms, 3),
+                    "avg": round(self.wait_total_ms / self.checkouts, 3) if self.checkouts else 0.0,
+                    "buckets": dict(zip(bounds, self.wait_buckets)),
+                },
+            }
+
+
+class _InstrumentedPoolMixin:
+    """Times every checkout, including the wait for a free connection"""
+
+    metrics: PoolMetrics
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        wait_ms = (time.perf_counter() - start) * 1000
+        self.metrics.record_checkout(wait_ms, overflow=self.checkedout() > self.size())
+        return connection
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    """QueuePool for the sync engine"""
+
+    # Class level so the counters survive Pool.recreate() on dispose
+    metrics = PoolMetrics()
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """QueuePool for the async engine"""
+
+    metrics = PoolMetrics()
+
+
+def _async_database_url(url: str) -> str:
+    """Map a sync database URL onto its async driver equivalent"""
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith("postgres://"):
+        # Heroku/Railway style scheme
+        return url.replace("postgres://", "postgresql+asyncpg://", 1)
+    if url.startswith("postgresql://") or url.startswith("postgresql+psycopg2://"):
+        return "postgresql+asyncpg://" + url.split("://", 1)[1]
+    return url
+
+
+def _pool_options() -> Dict[str, Any]:
+    """Engine keyword arguments for the Postgres connection pool"""
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING == "always",
+    }
+
+
+def _instrument_pool(target, metrics: PoolMetrics):
+    """Attach pool event listeners for connection counters and idle pre-ping"""
+
+    @event.listens_for(target, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.increment("connects")
+
+    @event.listens_for(target, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.increment("invalidations")
+
+    @event.listens_for(target, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        connection_record.info["last_checkin"] = time.monotonic()
+
+    if settings.DB_POOL_PRE_PING != "idle":
+        return
+
+    @event.listens_for(target, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        # Only ping connections that sat idle long enough to have been dropped
+        # by the server or a proxy; hot connections skip the extra round trip
+        last_checkin = connection_record.info.get("last_checkin")
+        if last_checkin is None:
+            return
+        if time.monotonic() - last_checkin < settings.DB_POOL_PRE_PING_IDLE_SECONDS:
+            return
+        metrics.increment("pre_pings")
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+        except Exception:
+            # The pool discards this connection and retries with a fresh one
+            raise exc.DisconnectionError()
+        finally:
+            cursor.close()
+
+
 # Create database engine
 if settings.DATABASE_URL.startswith("sqlite"):
     # SQLite for testing
@@ -17,17 +172,37 @@ if settings.DATABASE_URL.startswith("sqlite"):
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
+    async_engine = create_async_engine(
+        _async_database_url(settings.DATABASE_URL),
+        poolclass=StaticPool,
+    )
 else:
     # PostgreSQL for production
     engine = create_engine(
         settings.DATABASE_URL,
-        pool_pre_ping=True,
-        pool_recycle=300,
+        poolclass=InstrumentedQueuePool,
+        **_pool_options(),
+    )
+    async_engine = create_async_engine(
+        _async_database_url(settings.DATABASE_URL),
+        poolclass=InstrumentedAsyncQueuePool,
+        **_pool_options(),
     )
+    _instrument_pool(engine, InstrumentedQueuePool.metrics)
+    _instrument_pool(async_engine.sync_engine, InstrumentedAsyncQueuePool.metrics)
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async session factory; objects stay usable after commit so handlers can
+# return them without triggering a lazy refresh outside the event loop
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # Create Base class for models
 Base = declarative_base()
 
@@ -39,6 +214,49 @@ def get_db() -> Session:
     finally:
         db.close()
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Get async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
 def create_tables():
     """Create all database tables"""
     Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist; add indexes declared since
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+async def dispose_engines():
+    """Release pooled connections held by the database engines"""
+    await async_engine.dispose()
+    engine.dispose()
+
+def _pool_stats(pool) -> Dict[str, Any]:
+    """Current occupancy plus cumulative counters for one engine's pool"""
+    stats: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "in_use": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+        })
+    if isinstance(pool, _InstrumentedPoolMixin):
+        stats.update(pool.metrics.snapshot())
+    return stats
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Connection pool statistics for both engines"""
+    return {
+        "async": _pool_stats(async_engine.pool),
+        "sync": _pool_stats(engine.pool),
+        "config": {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+            "pre_ping": settings.DB_POOL_PRE_PING,
+        },
+    }
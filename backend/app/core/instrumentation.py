@@ -0,0 +1,210 @@
+"""
+SQL instrumentation
+
+Engine event listeners attribute query count, total database time and the
+slowest statement to the request being served (tracked in a contextvar by
+QueryStatsMiddleware). Requests whose database time or query count
+reaches SQL_REQUEST_SUMMARY_MIN_DB_MS / SQL_REQUEST_SUMMARY_MIN_QUERIES
+are logged with their totals, and with SQL_SERVER_TIMING_ENABLED the
+totals are also returned as a Server-Timing header. Statements slower
+than SLOW_QUERY_THRESHOLD_MS are logged individually with their
+parameters redacted.
+
+QueryCounter records every statement the application engines execute
+while it is active, so a test can pin an endpoint to a fixed query
+budget:
+
+    with QueryCounter() as queries:
+        client.get("/api/v1/projects/", headers=headers)
+    queries.assert_at_most(2)
+
+It listens engine-wide, so statements from concurrent work are counted
+too; use it where the code under test is the only thing running.
+"""
+
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Sequence
+
+import structlog
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.database import async_engine, engine
+
+logger = structlog.get_logger(__name__)
+
+# Longest statement text kept for logs
+MAX_STATEMENT_LENGTH = 1000
+
+
+class RequestQueryStats:
+    """SQL totals for one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_statement: Optional[str] = None
+
+    def record(self, statement: str, elapsed_ms: float):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_statement = statement
+
+    def needs_summary(self) -> bool:
+        """Whether the request used enough of the database to be logged"""
+        return (
+            self.total_ms >= settings.SQL_REQUEST_SUMMARY_MIN_DB_MS
+            or self.count >= settings.SQL_REQUEST_SUMMARY_MIN_QUERIES
+        )
+
+    def server_timing(self, total_ms: float) -> str:
+        return (
+            f'db;dur={self.total_ms:.1f};desc="{self.count} queries", '
+            f"db-slowest;dur={self.slowest_ms:.1f}, "
+            f"total;dur={total_ms:.1f}"
+        )
+
+
+_request_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def current_query_stats() -> Optional[RequestQueryStats]:
+    """SQL totals for the request being served, if any"""
+    return _request_stats.get()
+
+
+def _redact(parameters: Any) -> Any:
+    """Keep the shape of bound parameters, never their values"""
+    if isinstance(parameters, dict):
+        return {key: "?" for key in parameters}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: report the batch size only
+            return f"<{len(parameters)} parameter sets>"
+        return ["?"] * len(parameters)
+    return "?"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context: a shared connection (SQLite's static
+    # pool) can interleave statements from several tasks
+    if context is not None:
+        context._query_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started_at", None)
+    if started is None:
+        return
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    statement = statement[:MAX_STATEMENT_LENGTH]
+
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed_ms)
+
+    if elapsed_ms >= settings.SLOW_QUERY_THRESHOLD_MS:
+        logger.warning(
+            "Slow SQL statement",
+            duration_ms=round(elapsed_ms, 1),
+            statement=statement,
+            parameters=_redact(parameters),
+        )
+
+
+_installed = False
+
+
+def install_query_instrumentation():
+    """Attach the timing listeners to both application engines (idempotent)"""
+    global _installed
+    if _installed or not settings.SQL_INSTRUMENTATION_ENABLED:
+        return
+    # Async engines emit their events on the wrapped sync engine
+    for target in (engine, async_engine.sync_engine):
+        event.listen(target, "before_cursor_execute", _before_cursor_execute)
+        event.listen(target, "after_cursor_execute", _after_cursor_execute)
+    _installed = True
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware that scopes SQL totals to each HTTP request"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+        server_timing = settings.SQL_SERVER_TIMING_ENABLED
+
+        async def send_with_timing(message: Dict[str, Any]):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if server_timing:
+                    # Streamed bodies may query after this point; those show
+                    # up in the log line but not in the header
+                    total_ms = (time.perf_counter() - started) * 1000
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", stats.server_timing(total_ms).encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stats.reset(token)
+            if stats.count and stats.needs_summary():
+                logger.warning(
+                    "Request SQL summary",
+                    method=scope["method"],
+                    path=scope["path"],
+                    status_code=status_code,
+                    queries=stats.count,
+                    db_ms=round(stats.total_ms, 1),
+                    slowest_ms=round(stats.slowest_ms, 1),
+                    slowest_statement=stats.slowest_statement,
+                    duration_ms=round((time.perf_counter() - started) * 1000, 1),
+                )
+
+
+class QueryCounter:
+    """Counts SQL statements executed on the application engines"""
+
+    def __init__(self, engines: Optional[Sequence[Engine]] = None):
+        self.engines = list(engines) if engines is not None else [engine, async_engine.sync_engine]
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self) -> "QueryCounter":
+        for target in self.engines:
+            event.listen(target, "before_cursor_execute", self._before_cursor_execute)
+        return self
+
+    def __exit__(self, *exc_info: Any):
+        for target in self.engines:
+            event.remove(target, "before_cursor_execute", self._before_cursor_execute)
+
+    def assert_at_most(self, budget: int):
+        """Fail with the executed statements if the budget was exceeded"""
+        if self.count > budget:
+            statements = "\n".join(f"  {statement}" for statement in self.statements)
+            raise AssertionError(f"Expected at most {budget} queries, ran {self.count}:\n{statements}")
@@ -0,0 +1,464 @@
+"""
+Background jobs
+
+An in-process asyncio job queue for work that belongs after the response
+(confirmation emails, pitch regeneration). Handlers are registered by
+name against a queue, and each queue runs a fixed number of worker tasks,
+which is its concurrency limit. Failed jobs are retried with exponential
+backoff until they run out of attempts.
+
+Jobs enqueued with persist=True are written to background_jobs first, so
+they outlive the process: a row is claimed atomically before it runs, and
+rows left pending (or stuck running past the claim timeout) by a stopped
+process are queued again by the poll loop, or by a single recover() call
+when polling is off. On shutdown the runner stops
+accepting jobs and drains what is queued, up to a timeout.
+"""
+
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import structlog
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.metrics import JOB_QUEUE_DEPTH, JOB_RUN_DURATION, JOB_WAIT_DURATION, JOBS_COMPLETED
+from app.models.job import BackgroundJob, JobStatus
+
+logger = structlog.get_logger(__name__)
+
+Handler = Callable[..., Awaitable[Any]]
+
+# Persisted jobs queued per recovery pass
+RECOVERY_BATCH_SIZE = 500
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class Job:
+    """One queued unit of work"""
+
+    def __init__(
+        self,
+        task: str,
+        queue: str,
+        payload: Dict[str, Any],
+        max_attempts: int,
+        key: Optional[str] = None,
+        row_id: Optional[int] = None,
+        attempts: int = 0,
+    ):
+        self.id = uuid.uuid4().hex
+        self.task = task
+        self.queue = queue
+        self.payload = payload
+        self.max_attempts = max_attempts
+        self.key = key
+        self.row_id = row_id
+        self.attempts = attempts
+        self.ready_at = time.monotonic()
+
+
+class _Queue:
+    """Pending jobs and the workers consuming them"""
+
+    def __init__(self, name: str, concurrency: int, max_attempts: int):
+        self.name = name
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        # Created with the workers, on the event loop that first needs them
+        self.pending: Optional[asyncio.Queue] = None
+        self.workers: List[asyncio.Task] = []
+        self.running: Dict[str, Job] = {}
+        self.scheduled = 0
+        self.waited = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+
+class JobRunner:
+    """Named job handlers, their queues and the workers draining them"""
+
+    def __init__(
+        self,
+        default_concurrency: int,
+        max_attempts: int,
+        retry_base_seconds: float,
+        retry_max_seconds: float,
+        poll_interval: float,
+        claim_timeout_seconds: float,
+        poll_enabled: bool = True,
+    ):
+        self.default_concurrency = default_concurrency
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.poll_interval = poll_interval
+        self.poll_enabled = poll_enabled
+        self.claim_timeout_seconds = claim_timeout_seconds
+        self._tasks: Dict[str, Tuple[Handler, str, int]] = {}
+        self._queues: Dict[str, _Queue] = {}
+        # Dedupe keys of queued/running jobs, persisted rows queued here
+        self._keys: Set[str] = set()
+        self._rows: Set[int] = set()
+        # Jobs waiting out a retry delay: job ID -> (job, timer)
+        self._timers: Dict[str, Tuple[Job, asyncio.TimerHandle]] = {}
+        self._poller: Optional[asyncio.Task] = None
+        self._closed = False
+        self.succeeded = 0
+        self.retried = 0
+        self.failed = 0
+        self.dropped = 0
+        self.add_queue("default")
+
+    def add_queue(self, name: str, concurrency: Optional[int] = None, max_attempts: Optional[int] = None):
+        """Declare a queue; concurrency is its number of workers"""
+        self._queues[name] = _Queue(
+            name,
+            concurrency or self.default_concurrency,
+            max_attempts or self.max_attempts,
+        )
+
+    def task(self, name: str, queue: str = "default", max_attempts: Optional[int] = None):
+        """Decorator registering a coroutine function as the handler for a job name"""
+        def register(handler: Handler) -> Handler:
+            if queue not in self._queues:
+                self.add_queue(queue)
+            self._tasks[name] = (handler, queue, max_attempts or self._queues[queue].max_attempts)
+            return handler
+        return register
+
+    async def enqueue(
+        self,
+        task: str,
+        payload: Optional[Dict[str, Any]] = None,
+        *,
+        key: Optional[str] = None,
+        persist: bool = False,
+        delay: float = 0.0,
+    ) -> bool:
+        """
+        Queue a job for a registered handler
+
+        The payload is passed to the handler as keyword arguments; with
+        persist=True it is stored as JSON. A job whose key matches one that
+        is already queued or running here is skipped.
+
+        Returns:
+            False if the job was skipped, or dropped because the runner is
+            shut down (persisted jobs are still stored for the next process)
+        """
+        handler, queue_name, max_attempts = self._tasks[task]
+        if key is not None and key in self._keys:
+            return False
+        payload = payload or {}
+
+        row_id = None
+        if persist:
+            row_id = await self._insert(task, queue_name, payload, max_attempts, delay)
+        if self._closed:
+            if not persist:
+                self.dropped += 1
+                logger.warning("Background job dropped; runner is shut down", task=task)
+            return False
+
+        job = Job(task, queue_name, payload, max_attempts, key=key, row_id=row_id)
+        if key is not None:
+            self._keys.add(key)
+        if row_id is not None:
+            self._rows.add(row_id)
+        self._schedule(job, delay)
+        return True
+
+    def _schedule(self, job: Job, delay: float):
+        queue = self._queues[job.queue]
+        if delay > 0:
+            queue.scheduled += 1
+            handle = asyncio.get_running_loop().call_later(delay, self._release_timer, job)
+            self._timers[job.id] = (job, handle)
+            self._update_depth(queue)
+        else:
+            self._put(job)
+
+    def _release_timer(self, job: Job):
+        self._timers.pop(job.id, None)
+        self._queues[job.queue].scheduled -= 1
+        self._put(job)
+
+    def _put(self, job: Job):
+        queue = self._queues[job.queue]
+        if queue.pending is None:
+            queue.pending = asyncio.Queue()
+            queue.workers = [asyncio.create_task(self._work(queue)) for _ in range(queue.concurrency)]
+        job.ready_at = time.monotonic()
+        queue.pending.put_nowait(job)
+        self._update_depth(queue)
+
+    def _finish(self, job: Job):
+        if job.key is not None:
+            self._keys.discard(job.key)
+        if job.row_id is not None:
+            self._rows.discard(job.row_id)
+
+    async def _work(self, queue: _Queue):
+        while True:
+            job = await queue.pending.get()
+            try:
+                await self._run(queue, job)
+            except Exception as e:
+                # Bookkeeping failed (e.g. the database is down); keep the worker alive
+                logger.error("Background job bookkeeping failed", task=job.task, error=str(e))
+                self._finish(job)
+            finally:
+                queue.pending.task_done()
+                self._update_depth(queue)
+
+    async def _run(self, queue: _Queue, job: Job):
+        waited = time.monotonic() - job.ready_at
+        JOB_WAIT_DURATION.observe(waited, queue.name)
+        queue.waited += 1
+        queue.wait_total += waited
+        queue.wait_max = max(queue.wait_max, waited)
+
+        if job.row_id is not None and not await self._claim(job):
+            # Another process picked it up first
+            self._finish(job)
+            return
+
+        job.attempts += 1
+        handler = self._tasks[job.task][0]
+        queue.running[job.id] = job
+        self._update_depth(queue)
+        started = time.monotonic()
+        try:
+            await handler(**job.payload)
+            error = None
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        finally:
+            queue.running.pop(job.id, None)
+        elapsed = time.monotonic() - started
+
+        if error is None:
+            outcome = "succeeded"
+            self.succeeded += 1
+            if job.row_id is not None:
+                await self._mark(job.row_id, JobStatus.SUCCEEDED)
+            self._finish(job)
+        elif job.attempts < job.max_attempts:
+            outcome = "retried"
+            self.retried += 1
+            delay = min(self.retry_base_seconds * 2 ** (job.attempts - 1), self.retry_max_seconds)
+            logger.warning(
+                "Background job failed; will retry",
+                task=job.task,
+                attempt=job.attempts,
+                retry_in_seconds=delay,
+                error=error,
+            )
+            if job.row_id is not None:
+                await self._mark(job.row_id, JobStatus.PENDING, error, run_at=_utcnow() + timedelta(seconds=delay))
+            self._schedule(job, delay)
+        else:
+            outcome = "failed"
+            self.failed += 1
+            logger.error("Background job failed", task=job.task, attempts=job.attempts, error=error)
+            if job.row_id is not None:
+                await self._mark(job.row_id, JobStatus.FAILED, error)
+            self._finish(job)
+
+        JOB_RUN_DURATION.observe(elapsed, queue.name, job.task, outcome)
+        JOBS_COMPLETED.inc(queue.name, job.task, outcome)
+
+    async def _insert(self, task: str, queue: str, payload: Dict[str, Any], max_attempts: int, delay: float) -> int:
+        async with AsyncSessionLocal() as db:
+            row = BackgroundJob(
+                queue=queue,
+                task=task,
+                payload=payload,
+                status=JobStatus.PENDING.value,
+                max_attempts=max_attempts,
+                run_at=_utcnow() + timedelta(seconds=delay),
+            )
+            db.add(row)
+            await db.commit()
+            return row.id
+
+    async def _claim(self, job: Job) -> bool:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(BackgroundJob)
+                .where(BackgroundJob.id == job.row_id, BackgroundJob.status == JobStatus.PENDING.value)
+                .values(
+                    status=JobStatus.RUNNING.value,
+                    claimed_at=_utcnow(),
+                    attempts=BackgroundJob.attempts + 1,
+                )
+            )
+            await db.commit()
+        return result.rowcount == 1
+
+    async def _mark(
+        self,
+        row_id: int,
+        status: JobStatus,
+        error: Optional[str] = None,
+        run_at: Optional[datetime] = None,
+    ):
+        values: Dict[str, Any] = {"status": status.value, "claimed_at": None, "last_error": error}
+        if status == JobStatus.PENDING:
+            values["run_at"] = run_at
+        else:
+            values["finished_at"] = _utcnow()
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(BackgroundJob).where(BackgroundJob.id == row_id).values(**values))
+            await db.commit()
+
+    async def recover(self) -> int:
+        """Queue persisted jobs that are due but not queued in this process"""
+        if not self._tasks:
+            return 0
+        now = _utcnow()
+        stale = now - timedelta(seconds=self.claim_timeout_seconds)
+        async with AsyncSessionLocal() as db:
+            # Claimed by a process that stopped mid-job
+            await db.execute(
+                update(BackgroundJob)
+                .where(BackgroundJob.status == JobStatus.RUNNING.value, BackgroundJob.claimed_at < stale)
+                .values(status=JobStatus.PENDING.value, claimed_at=None)
+            )
+            await db.commit()
+            result = await db.execute(
+                select(BackgroundJob)
+                .where(
+                    BackgroundJob.status == JobStatus.PENDING.value,
+                    BackgroundJob.run_at <= now,
+                    BackgroundJob.task.in_(list(self._tasks)),
+                )
+                .order_by(BackgroundJob.id)
+                .limit(RECOVERY_BATCH_SIZE)
+            )
+            rows = result.scalars().all()
+
+        queued = 0
+        for row in rows:
+            if row.id in self._rows:
+                continue
+            self._rows.add(row.id)
+            queue = self._tasks[row.task][1]
+            self._schedule(Job(row.task, queue, row.payload, row.max_attempts, row_id=row.id, attempts=row.attempts), 0)
+            queued += 1
+        if queued:
+            logger.info("Recovered persisted background jobs", jobs=queued)
+        return queued
+
+    async def _poll(self):
+        while True:
+            try:
+                await self.recover()
+            except Exception as e:
+                logger.error("Background job recovery failed", error=str(e))
+            await asyncio.sleep(self.poll_interval)
+
+    def start(self):
+        """Accept jobs and start polling for persisted ones (if enabled)"""
+        self._closed = False
+        if self._poller is None and self.poll_enabled:
+            self._poller = asyncio.create_task(self._poll())
+
+    async def stop(self, timeout: float):
+        """Stop accepting jobs, wait up to timeout for queued ones, then cancel the workers"""
+        self._closed = True
+        if self._poller is not None:
+            self._poller.cancel()
+            try:
+                await self._poller
+            except asyncio.CancelledError:
+                pass
+            self._poller = None
+
+        queues = [queue for queue in self._queues.values() if queue.pending is not None]
+        try:
+            await asyncio.wait_for(asyncio.gather(*(queue.pending.join() for queue in queues)), timeout)
+        except asyncio.TimeoutError:
+            left = sum(queue.pending.qsize() + len(queue.running) for queue in queues)
+            logger.warning("Background jobs left undrained at shutdown", jobs=left)
+
+        # Retries still waiting out their delay; persisted ones stay in the table
+        for job, handle in self._timers.values():
+            handle.cancel()
+            self._queues[job.queue].scheduled -= 1
+            if job.row_id is None:
+                self.dropped += 1
+        self._timers.clear()
+
+        interrupted = [job.row_id for queue in queues for job in queue.running.values() if job.row_id is not None]
+        for queue in queues:
+            self.dropped += sum(1 for job in queue.running.values() if job.row_id is None)
+            for worker in queue.workers:
+                worker.cancel()
+            await asyncio.gather(*queue.workers, return_exceptions=True)
+            while not queue.pending.empty():
+                if queue.pending.get_nowait().row_id is None:
+                    self.dropped += 1
+            queue.pending = None
+            queue.workers = []
+            queue.running.clear()
+            self._update_depth(queue)
+        self._keys.clear()
+        self._rows.clear()
+
+        if interrupted:
+            # Hand interrupted jobs straight back instead of waiting out the claim timeout
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    update(BackgroundJob)
+                    .where(BackgroundJob.id.in_(interrupted))
+                    .values(status=JobStatus.PENDING.value, claimed_at=None)
+                )
+                await db.commit()
+
+    def _update_depth(self, queue: _Queue):
+        JOB_QUEUE_DEPTH.set(queue.pending.qsize() if queue.pending is not None else 0, queue.name, "queued")
+        JOB_QUEUE_DEPTH.set(len(queue.running), queue.name, "running")
+        JOB_QUEUE_DEPTH.set(queue.scheduled, queue.name, "scheduled")
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depths, wait times and outcome counters"""
+        return {
+            "queues": {
+                name: {
+                    "concurrency": queue.concurrency,
+                    "queued": queue.pending.qsize() if queue.pending is not None else 0,
+                    "running": len(queue.running),
+                    "scheduled": queue.scheduled,
+                    "wait_ms": {
+                        "avg": round(queue.wait_total / queue.waited * 1000, 1) if queue.waited else None,
+                        "max": round(queue.wait_max * 1000, 1),
+                    },
+                }
+                for name, queue in self._queues.items()
+            },
+            "succeeded": self.succeeded,
+            "retried": self.retried,
+            "failed": self.failed,
+            "dropped": self.dropped,
+        }
+
+
+# Global runner instance
+jobs = JobRunner(
+    default_concurrency=settings.JOBS_DEFAULT_CONCURRENCY,
+    max_attempts=settings.JOBS_MAX_ATTEMPTS,
+    retry_base_seconds=settings.JOBS_RETRY_BASE_SECONDS,
+    retry_max_seconds=settings.JOBS_RETRY_MAX_SECONDS,
+    poll_interval=settings.JOBS_POLL_SECONDS,
+    claim_timeout_seconds=settings.JOBS_CLAIM_TIMEOUT_SECONDS,
+    poll_enabled=settings.JOBS_POLL_ENABLED,
+)
@@ -0,0 +1,254 @@
+"""
+Prometheus metrics
+
+A small in-process registry rendered in the Prometheus text exposition
+format at /metrics. Metrics are updated with plain dict and list
+operations on the event loop thread, so recording a request costs a few
+microseconds; values derived from other components (connection pools)
+are collected when /metrics is scraped.
+"""
+
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Seconds; covers fast cached responses through slow LLM-backed ones
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1):
+        self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        return self._values.get(labelvalues, 0)
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labelvalues, value in list(self._values.items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labelvalues)} {_number(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    """Value that can go up and down"""
+
+    type = "gauge"
+
+    def dec(self, *labelvalues: str, amount: float = 1):
+        self.inc(*labelvalues, amount=-amount)
+
+    def set(self, value: float, *labelvalues: str):
+        self._values[labelvalues] = value
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed buckets"""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # labelvalues -> [per-bucket counts (+Inf last), sum]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labelvalues: str):
+        series = self._values.get(labelvalues)
+        if series is None:
+            series = self._values[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labelvalues, (counts, total) in list(self._values.items()):
+            lines.extend(render_histogram_series(self.name, self.labelnames, labelvalues, self.buckets, counts, total))
+        return lines
+
+
+def render_histogram_series(
+    name: str,
+    labelnames: Sequence[str],
+    labelvalues: Sequence[str],
+    buckets: Sequence[float],
+    counts: Sequence[int],
+    total: float,
+) -> List[str]:
+    """Exposition lines for one histogram series from per-bucket counts"""
+    lines = []
+    cumulative = 0
+    for bound, count in zip(list(buckets) + ["+Inf"], counts):
+        cumulative += count
+        le = 'le="+Inf"' if bound == "+Inf" else f'le="{_number(bound)}"'
+        lines.append(f"{name}_bucket{_labels(labelnames, labelvalues, le)} {cumulative}")
+    lines.append(f"{name}_sum{_labels(labelnames, labelvalues)} {_number(total)}")
+    lines.append(f"{name}_count{_labels(labelnames, labelvalues)} {cumulative}")
+    return lines
+
+
+class Registry:
+    """Metrics rendered together at /metrics"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Iterable[str]]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[str]]):
+        """Register a callable producing exposition lines at scrape time"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "http_requests_total", "HTTP requests by route template and status", ("method", "route", "status"),
+))
+HTTP_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route"),
+))
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served",
+))
+PITCH_GENERATION_DURATION = REGISTRY.register(Histogram(
+    "pitch_generation_duration_seconds", "Marketing pitch LLM call latency", ("mode", "outcome"),
+))
+PITCH_FALLBACKS = REGISTRY.register(Counter(
+    "pitch_fallbacks_total", "Static fallback pitches served, by reason", ("reason",),
+))
+JOB_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "job_queue_depth", "Background jobs by queue and state (queued, running, scheduled)", ("queue", "state"),
+))
+JOB_WAIT_DURATION = REGISTRY.register(Histogram(
+    "job_wait_seconds", "Time background jobs spend queued before a worker picks them up", ("queue",),
+))
+JOB_RUN_DURATION = REGISTRY.register(Histogram(
+    "job_run_seconds", "Background job handler latency", ("queue", "task", "outcome"),
+))
+JOBS_COMPLETED = REGISTRY.register(Counter(
+    "jobs_total", "Background job attempts by outcome (succeeded, retried, failed)", ("queue", "task", "outcome"),
+))
+EMAILS_SENT = REGISTRY.register(Counter(
+    "emails_sent_total", "Outgoing email messages by outcome", ("outcome",),
+))
+EMAIL_BATCH_SIZE = REGISTRY.register(Histogram(
+    "email_batch_size", "Messages sent per SMTP batch", buckets=(1, 2, 5, 10, 25, 50, 100),
+))
+
+
+_POOL_GAUGES = ("size", "max_overflow", "in_use", "idle", "overflow")
+_POOL_COUNTERS = ("checkouts", "overflow_checkouts", "timeouts", "connects", "invalidations", "pre_pings")
+
+
+def pool_metric_lines(pool_stats: Dict[str, Any]) -> List[str]:
+    """Exposition lines for the output of database.get_pool_stats()"""
+    lines: List[str] = []
+    engines = [(name, pool_stats[name]) for name in ("async", "sync") if name in pool_stats]
+    for key in _POOL_GAUGES:
+        name = f"db_pool_{key}"
+        lines += [f"# HELP {name} Connection pool {key.replace('_', ' ')}", f"# TYPE {name} gauge"]
+        lines += [f'{name}{{engine="{engine}"}} {stats[key]}' for engine, stats in engines if key in stats]
+    for key in _POOL_COUNTERS:
+        name = f"db_pool_{key}_total"
+        lines += [f"# HELP {name} Connection pool {key.replace('_', ' ')}", f"# TYPE {name} counter"]
+        lines += [f'{name}{{engine="{engine}"}} {stats[key]}' for engine, stats in engines if key in stats]
+
+    name = "db_pool_checkout_wait_seconds"
+    lines += [f"# HELP {name} Time spent waiting for a pooled connection", f"# TYPE {name} histogram"]
+    for engine, stats in engines:
+        wait = stats.get("checkout_wait_ms")
+        if not wait:
+            continue
+        bounds = [float(bound) / 1000 for bound in wait["buckets"] if bound != "+Inf"]
+        lines += render_histogram_series(
+            name, ("engine",), (engine,), bounds, list(wait["buckets"].values()), wait["total"] / 1000,
+        )
+    return lines
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status and in-flight requests per route"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            # The router records the matched route in the scope; label by its
+            # template so path parameters do not explode the series count
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            HTTP_REQUESTS.inc(method, template, str(status_code))
+            HTTP_REQUEST_DURATION.observe(elapsed, method, template)
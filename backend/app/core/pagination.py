@@ -0,0 +1,61 @@
+"""
+Keyset (cursor) pagination
+
+Listings are ordered newest first on (created_at, id) and each page
+continues strictly after the last row of the previous one, so a page
+costs the same index range scan wherever it is in the table. Cursors are
+opaque URL-safe strings encoding that last (created_at, id) pair.
+
+The cursor timestamp is bound with the column's type and compared with
+the bare column, so the (..., created_at, id) indexes serve both the
+predicate and the order. On SQLite that relies on every timestamp being
+stored in the format SQLAlchemy binds (see models.base.current_timestamp):
+text in another format, e.g. from CURRENT_TIMESTAMP, does not compare
+correctly.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import Select, literal, tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """Opaque cursor pointing just after a row"""
+    raw = json.dumps([created_at.isoformat(), id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of encode_cursor; a malformed cursor is a 400"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate(query: Select, model: Any, cursor: Optional[str], limit: int) -> Select:
+    """Order a query on (created_at, id) descending and apply the cursor"""
+    if cursor:
+        created_at, id = decode_cursor(cursor)
+        after = tuple_(literal(created_at, model.created_at.type), literal(id, model.id.type))
+        query = query.where(tuple_(model.created_at, model.id) < after)
+    # One extra row tells us whether another page exists
+    return query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+
+
+def page_items(rows: Sequence[Any], limit: int) -> Tuple[List[Any], Dict[str, str]]:
+    """Trim the look-ahead row; return the page and its next-cursor header"""
+    items = list(rows[:limit])
+    headers = {}
+    if len(rows) > limit:
+        last = items[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
+    return items, headers
@@ -0,0 +1,59 @@
+"""
+Client address behind a reverse proxy
+
+X-Forwarded-For and X-Forwarded-Proto are only believed when the
+connection comes from one of TRUSTED_PROXY_IPS (addresses or CIDR
+ranges). Anyone else can put whatever they like in those headers, so for
+them the socket peer stays the client address. The client is the
+nearest X-Forwarded-For hop that is not itself a trusted proxy: entries
+to the left of it were written by the client and prove nothing.
+"""
+
+import ipaddress
+from typing import List, Optional, Union
+
+Network = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+def parse_trusted_proxies(value: str) -> Optional[List[Network]]:
+    """Comma-separated addresses/CIDRs; None for "*" (trust every peer)"""
+    entries = [entry.strip() for entry in value.split(",") if entry.strip()]
+    if "*" in entries:
+        return None
+    return [ipaddress.ip_network(entry, strict=False) for entry in entries]
+
+
+class ProxyHeadersMiddleware:
+    """ASGI middleware taking the client address and scheme from a trusted proxy"""
+
+    def __init__(self, app, trusted_proxies: str):
+        self.app = app
+        self.networks = parse_trusted_proxies(trusted_proxies)
+
+    def is_trusted(self, host: str) -> bool:
+        if self.networks is None:
+            return True
+        try:
+            address = ipaddress.ip_address(host)
+        except ValueError:
+            return False
+        return any(address in network for network in self.networks)
+
+    async def __call__(self, scope, receive, send):
+        client = scope.get("client")
+        if scope["type"] in ("http", "websocket") and client and self.is_trusted(client[0]):
+            headers = dict(scope["headers"])
+            forwarded_for = headers.get(b"x-forwarded-for")
+            forwarded_proto = headers.get(b"x-forwarded-proto")
+            if forwarded_for or forwarded_proto:
+                scope = dict(scope)
+            if forwarded_for:
+                hops = [hop.strip() for hop in forwarded_for.decode("latin-1").split(",") if hop.strip()]
+                if hops:
+                    host = next((hop for hop in reversed(hops) if not self.is_trusted(hop)), hops[0])
+                    scope["client"] = (host, 0)
+            if forwarded_proto:
+                proto = forwarded_proto.decode("latin-1").split(",")[0].strip().lower()
+                if proto in ("http", "https"):
+                    scope["scheme"] = proto if scope["type"] == "http" else {"http": "ws", "https": "wss"}[proto]
+        await self.app(scope, receive, send)
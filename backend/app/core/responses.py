@@ -0,0 +1,64 @@
+"""
+JSON response rendering
+
+ORJSONResponse is the application's default response class. Endpoints
+with large or list-shaped bodies can return typed_response() instead of
+relying on response_model: the value is validated and serialized to JSON
+in one pydantic-core pass, skipping FastAPI's second validation and the
+jsonable_encoder walk. Keep response_model on the route for the OpenAPI
+schema.
+"""
+
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+import orjson
+from fastapi.responses import ORJSONResponse as _ORJSONResponse
+from fastapi.responses import Response
+from pydantic import BaseModel, TypeAdapter
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    """Types orjson does not serialize natively"""
+    if isinstance(value, Decimal):
+        # Same convention as jsonable_encoder: whole numbers stay integers
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, bytes):
+        return value.decode()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def json_dumps(value: Any) -> bytes:
+    """Serialize a value to JSON bytes"""
+    return orjson.dumps(value, default=_default, option=_OPTIONS)
+
+
+class ORJSONResponse(_ORJSONResponse):
+    """JSON response rendered with orjson, including Decimal and model values"""
+
+    def render(self, content: Any) -> bytes:
+        return json_dumps(content)
+
+
+@lru_cache(maxsize=None)
+def _adapter(type_: Any) -> TypeAdapter:
+    return TypeAdapter(type_)
+
+
+def typed_response(
+    type_: Any,
+    value: Any,
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """Validate value (ORM objects included) as type_ and render it as JSON"""
+    adapter = _adapter(type_)
+    body = adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+    return Response(body, status_code=status_code, headers=headers, media_type="application/json")
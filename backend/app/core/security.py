@@ -2,15 +2,23 @@
 Security utilities for authentication and authorization
 """
 
+import hashlib
+import time
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Dict, Union
 from jose import jwt
 from passlib.context import CryptContext
 
+from app.core.cache import TTLCache
 from app.core.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Claims of already-verified tokens, keyed by a SHA-256 digest of the token.
+# Each entry expires with the token itself, so a cache hit is exactly as
+# valid as a fresh decode.
+token_cache = TTLCache(maxsize=settings.AUTH_TOKEN_CACHE_SIZE, ttl=0)
+
 def create_access_token(
     subject: Union[str, Any], expires_delta: timedelta = None
 ) -> str:
@@ -34,10 +42,28 @@ def get_password_hash(password: str) -> str:
     """Hash a password"""
     return pwd_context.hash(password)
 
+def decode_access_token(token: str) -> Dict[str, Any]:
+    """Verify JWT token and return its claims
+
+    Raises jose.JWTError if the token is invalid or expired.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        return dict(payload)
+
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        ttl = exp - time.time()
+        if ttl > 0:
+            token_cache.set(key, dict(payload), ttl=ttl)
+    return payload
+
 def verify_token(token: str) -> Union[str, None]:
     """Verify JWT token and return subject"""
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+        payload = decode_access_token(token)
         subject: str = payload.get("sub")
         if subject is None:
             return None
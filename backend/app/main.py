@@ -4,16 +4,28 @@ A comprehensive backend for AI/Automation/IT consultancy services
 """
 
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 import structlog
 import uvicorn
 
+from app.core.auth import get_auth_cache_stats, require_metrics_access
+from app.core.cache import close_cache_backend
 from app.core.config import settings
-from app.core.database import create_tables
+from app.core.database import AsyncSessionLocal, create_tables, dispose_engines, get_pool_stats
+from app.core.instrumentation import QueryStatsMiddleware, install_query_instrumentation
+from app.core.jobs import jobs
+from app.core.metrics import REGISTRY, MetricsMiddleware, pool_metric_lines
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.proxy import ProxyHeadersMiddleware
+from app.core.responses import ORJSONResponse
 from app.api.v1.api import api_router
+from app.services.email import email_dispatcher
+from app.services.password_hashing import password_hasher
+from app.services.stripe_gateway import stripe_gateway
+from app.services.stripe_webhooks import webhook_processor
 from app.core.logging import setup_logging
 
 # Setup structured logging
@@ -36,8 +48,27 @@ async def lifespan(app: FastAPI):
         # Don't crash the app if database is unavailable - let endpoints handle it
         logger.warning("Continuing startup without database tables")
 
+    jobs.start()
+    if not jobs.poll_enabled:
+        # No poll loop: queue jobs left by the previous process once, before
+        # any request shares the database connection
+        try:
+            await jobs.recover()
+        except Exception as e:
+            logger.error("Background job recovery failed", error=str(e))
+    if settings.STRIPE_WEBHOOK_WORKER_ENABLED:
+        webhook_processor.start()
+
     yield
     logger.info("Shutting down ShortForge API")
+    # Let queued post-request work finish while its dependencies are still up
+    await jobs.stop(timeout=settings.JOBS_DRAIN_TIMEOUT_SECONDS)
+    await email_dispatcher.close()
+    await webhook_processor.stop()
+    password_hasher.shutdown()
+    await dispose_engines()
+    await close_cache_backend()
+    await stripe_gateway.close()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -45,8 +76,19 @@ app = FastAPI(
     version="1.0.0",
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+# Attribute SQL time to requests (slow query and request summary logs,
+# optional Server-Timing header)
+if settings.SQL_INSTRUMENTATION_ENABLED:
+    install_query_instrumentation()
+    app.add_middleware(QueryStatsMiddleware)
+
+# Per-route request metrics, exposed at /metrics
+app.add_middleware(MetricsMiddleware)
+REGISTRY.add_collector(lambda: pool_metric_lines(get_pool_stats()))
+
 # Set up CORS
 app.add_middleware(
     CORSMiddleware,
@@ -54,8 +96,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+# Outermost: everything below sees the client address the proxy reported,
+# but only when the connection comes from a trusted proxy
+app.add_middleware(ProxyHeadersMiddleware, trusted_proxies=settings.TRUSTED_PROXY_IPS)
+
 # Mount static files for uploaded documents
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
@@ -72,6 +119,37 @@ async def root_health_check():
     """Root health check endpoint for Railway"""
     return {"status": "healthy", "service": "shortforge-api", "message": "API is running"}
 
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(require_metrics_access)])
+async def prometheus_metrics():
+    """Metrics in the Prometheus text exposition format"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/metrics/db", dependencies=[Depends(require_metrics_access)])
+async def database_metrics():
+    """Database connection pool metrics"""
+    return get_pool_stats()
+
+@app.get("/metrics/auth", dependencies=[Depends(require_metrics_access)])
+async def auth_metrics():
+    """Authentication cache metrics"""
+    return {**get_auth_cache_stats(), "password_hasher": password_hasher.stats()}
+
+@app.get("/metrics/jobs", dependencies=[Depends(require_metrics_access)])
+async def job_metrics():
+    """Background job queue depths, wait times and outcomes"""
+    return jobs.stats()
+
+@app.get("/metrics/email", dependencies=[Depends(require_metrics_access)])
+async def email_metrics():
+    """Outgoing email throughput and batching"""
+    return email_dispatcher.stats()
+
+@app.get("/metrics/webhooks", dependencies=[Depends(require_metrics_access)])
+async def webhook_metrics():
+    """Stripe webhook ingestion throughput, processing lag and backlog"""
+    async with AsyncSessionLocal() as db:
+        return await webhook_processor.stats(db)
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler"""
@@ -88,4 +166,5 @@ if __name__ == "__main__":
         port=8000,
         reload=True,
         log_config=None,  # Use our custom logging
+        proxy_headers=False,  # Handled by ProxyHeadersMiddleware
     )
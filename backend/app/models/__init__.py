@@ -0,0 +1,16 @@
+"""
+Database models
+
+Importing every model here registers them all with the declarative
+registry, so string-based relationship targets always resolve.
+"""
+
+from app.models.user import User, UserRole
+from app.models.inquiry import Inquiry, InquiryStatus
+from app.models.project import Project, ProjectStatus, ProjectType, ProjectUpdate
+from app.models.document import Document
+from app.models.pitch_cache import PitchCacheEntry
+from app.models.business_intelligence import BusinessIntelligenceSnapshot
+from app.models.stripe_customer import StripeCustomer
+from app.models.webhook_event import StripeWebhookEvent, WebhookEventStatus
+from app.models.job import BackgroundJob, JobStatus
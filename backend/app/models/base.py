@@ -4,10 +4,29 @@ Base model with common fields
 
 from datetime import datetime
 from sqlalchemy import Column, DateTime, Integer, func
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import declared_attr
+from sqlalchemy.sql.functions import FunctionElement
 
 from app.core.database import Base
 
+class current_timestamp(FunctionElement):
+    """The database's current time, stored the way SQLAlchemy writes datetimes"""
+
+    type = DateTime()
+    name = "current_timestamp"
+    inherit_cache = True
+
+@compiles(current_timestamp)
+def _compile_current_timestamp(element, compiler, **kw):
+    return compiler.process(func.now(), **kw)
+
+@compiles(current_timestamp, "sqlite")
+def _compile_current_timestamp_sqlite(element, compiler, **kw):
+    # SQLite keeps timestamps as text; CURRENT_TIMESTAMP has no fraction while
+    # bound datetimes carry microseconds, and the two do not compare as strings
+    return "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+
 class BaseModel(Base):
     """Base model with common fields"""
 
@@ -17,8 +36,8 @@ class BaseModel(Base):
 
     @declared_attr
     def created_at(cls):
-        return Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+        return Column(DateTime(timezone=True), server_default=current_timestamp(), nullable=False)
 
     @declared_attr
     def updated_at(cls):
-        return Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+        return Column(DateTime(timezone=True), server_default=current_timestamp(), onupdate=current_timestamp(), nullable=False)
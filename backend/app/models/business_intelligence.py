@@ -0,0 +1,18 @@
+"""
+Business intelligence read model
+"""
+
+from sqlalchemy import JSON, Column, DateTime, String, func
+
+from app.core.database import Base
+
+class BusinessIntelligenceSnapshot(Base):
+    """Transformed business intelligence payload for a domain's latest bundle"""
+
+    __tablename__ = "business_intelligence_snapshots"
+
+    domain_id = Column(String(64), primary_key=True)
+    bundle_id = Column(String(64))
+    bundle_created_at = Column(DateTime(timezone=True), index=True)
+    payload = Column(JSON, nullable=False)
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
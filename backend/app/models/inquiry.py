@@ -3,8 +3,7 @@ Inquiry model for contact form submissions
 """
 
 from enum import Enum
-from typing import Optional
-from sqlalchemy import Column, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from app.models.base import BaseModel
@@ -20,6 +19,12 @@ class Inquiry(BaseModel):
     """Inquiry model"""
 
     __tablename__ = "inquiries"
+    # Back keyset pagination on (created_at, id), alone and per filter
+    __table_args__ = (
+        Index("ix_inquiries_created_at_id", "created_at", "id"),
+        Index("ix_inquiries_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_inquiries_service_interest_created_at_id", "service_interest", "created_at", "id"),
+    )
 
     name = Column(String(255), nullable=False)
     email = Column(String(255), nullable=False)
@@ -0,0 +1,35 @@
+"""
+Persisted background jobs
+"""
+
+from enum import Enum
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String, Text
+
+from app.models.base import BaseModel
+
+class JobStatus(str, Enum):
+    """Background job status"""
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+class BackgroundJob(BaseModel):
+    """Job enqueued with persist=True (see app.core.jobs)"""
+
+    __tablename__ = "background_jobs"
+    __table_args__ = (
+        # Recovery scan: due pending jobs, oldest first
+        Index("ix_background_jobs_status_run_at", "status", "run_at"),
+    )
+
+    queue = Column(String(100), nullable=False)
+    task = Column(String(255), nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(String(20), default=JobStatus.PENDING.value, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, nullable=False)
+    last_error = Column(Text)
+    run_at = Column(DateTime(timezone=True), nullable=False)
+    claimed_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
@@ -0,0 +1,19 @@
+"""
+Persistent marketing pitch cache
+"""
+
+from sqlalchemy import JSON, Column, DateTime, String
+
+from app.models.base import BaseModel
+
+class PitchCacheEntry(BaseModel):
+    """Generated pitch keyed by a fingerprint of its business context"""
+
+    __tablename__ = "pitch_cache"
+
+    fingerprint = Column(String(64), unique=True, index=True, nullable=False)
+    domain_id = Column(String(64), index=True)
+    agent_name = Column(String(255), nullable=False)
+    pitch = Column(JSON, nullable=False)
+    generated_at = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
@@ -3,8 +3,7 @@ Project model and related schemas
 """
 
 from enum import Enum
-from typing import Optional
-from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from app.models.base import BaseModel
@@ -28,6 +27,13 @@ class Project(BaseModel):
     """Project model"""
 
     __tablename__ = "projects"
+    # Back keyset pagination on (created_at, id), alone and per filter
+    __table_args__ = (
+        Index("ix_projects_created_at_id", "created_at", "id"),
+        Index("ix_projects_client_id_created_at_id", "client_id", "created_at", "id"),
+        Index("ix_projects_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_projects_project_type_created_at_id", "project_type", "created_at", "id"),
+    )
 
     title = Column(String(255), nullable=False)
     description = Column(Text)
@@ -41,7 +47,11 @@ class Project(BaseModel):
 
     # Relationships
     client = relationship("User", back_populates="projects")
-    updates = relationship("ProjectUpdate", back_populates="project", cascade="all, delete-orphan")
+    # Always eager loaded (selectinload) by the endpoints; an accidental lazy
+    # load while serializing a list would otherwise run one query per project
+    updates = relationship(
+        "ProjectUpdate", back_populates="project", cascade="all, delete-orphan", lazy="raise_on_sql"
+    )
     documents = relationship("Document", back_populates="project", cascade="all, delete-orphan")
 
 class ProjectUpdate(BaseModel):
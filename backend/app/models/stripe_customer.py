@@ -0,0 +1,19 @@
+"""
+Local mapping from users to Stripe customers
+"""
+
+from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy.orm import relationship
+
+from app.models.base import BaseModel
+
+class StripeCustomer(BaseModel):
+    """Stripe customer ID for a user, filled on first use and synced by webhooks"""
+
+    __tablename__ = "stripe_customers"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), unique=True, index=True, nullable=False)
+    customer_id = Column(String(255), unique=True, index=True, nullable=False)
+    email = Column(String(255))
+
+    user = relationship("User")
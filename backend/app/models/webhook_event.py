@@ -0,0 +1,34 @@
+"""
+Durable Stripe webhook event log
+"""
+
+from enum import Enum
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String, Text
+
+from app.models.base import BaseModel
+
+class WebhookEventStatus(str, Enum):
+    """Webhook event processing status"""
+    PENDING = "pending"
+    PROCESSING = "processing"
+    PROCESSED = "processed"
+    DEAD = "dead"
+
+class StripeWebhookEvent(BaseModel):
+    """Stripe event as received, keyed by its event ID for deduplication"""
+
+    __tablename__ = "stripe_webhook_events"
+    __table_args__ = (
+        # Drain order: due pending events, oldest first
+        Index("ix_stripe_webhook_events_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    event_id = Column(String(255), unique=True, index=True, nullable=False)
+    event_type = Column(String(255), nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(String(20), default=WebhookEventStatus.PENDING.value, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(Text)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False)
+    claimed_at = Column(DateTime(timezone=True))
+    processed_at = Column(DateTime(timezone=True))
@@ -4,7 +4,9 @@ Authentication schemas
 
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
+
+from app.models.user import UserRole
 
 class UserBase(BaseModel):
     """Base user schema"""
@@ -49,6 +51,26 @@ class TokenData(BaseModel):
     email: Optional[str] = None
     user_id: Optional[int] = None
 
+class UserPrincipal(BaseModel):
+    """Snapshot of the authenticated user used by request dependencies"""
+    model_config = ConfigDict(frozen=True, from_attributes=True)
+
+    id: int
+    email: str
+    full_name: str
+    role: str
+    is_active: bool
+
+    @property
+    def is_admin(self) -> bool:
+        """Check if user is admin or super admin"""
+        return self.role in [UserRole.ADMIN.value, UserRole.SUPER_ADMIN.value]
+
+    @property
+    def is_super_admin(self) -> bool:
+        """Check if user is super admin"""
+        return self.role == UserRole.SUPER_ADMIN.value
+
 class LoginRequest(BaseModel):
     """Login request schema"""
     email: EmailStr
@@ -0,0 +1,13 @@
+"""
+Business intelligence schemas
+"""
+
+from typing import List
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+
+class BusinessIntelligenceBatchRequest(BaseModel):
+    """Bulk business intelligence lookup request"""
+    domain_ids: List[str] = Field(..., min_length=1, max_length=settings.BI_BATCH_MAX_DOMAINS)
+    include_pitch: bool = True
@@ -0,0 +1,406 @@
+"""
+Business intelligence service
+
+Reads intelligence_bundles rows and transforms them into the business
+intelligence format consumed by the frontend and the pitch generator.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import bindparam, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import SharedCache
+from app.core.config import settings
+from app.models.business_intelligence import BusinessIntelligenceSnapshot
+
+# Payloads shared across workers in front of the read model table
+bi_cache = SharedCache("bi", ttl=settings.BI_CACHE_TTL_SECONDS)
+
+# Only the bundle columns the transform reads; the full row (with every
+# large JSON blob) is fetched separately when a caller asks for raw_data
+BUNDLE_COLUMNS = """
+    ib.id, ib.domain_id, ib.created_at,
+    ib.lead_company, ib.lead_industry, ib.lead_location, ib.lead_name, ib.lead_title,
+    ib.llm_digest, ib.content_summaries, ib.keyword_signals,
+    ib.metadata_insights, ib.online_presence
+"""
+
+# Latest bundle for a single domain
+LATEST_BUNDLE_QUERY = text(f"""
+    SELECT {BUNDLE_COLUMNS}, bd.domain
+    FROM intelligence_bundles ib
+    JOIN business_domains bd ON ib.domain_id = bd.id
+    WHERE ib.domain_id = :domain_id
+    ORDER BY ib.created_at DESC
+    LIMIT 1;
+""")
+
+# Latest full bundle row for a single domain
+RAW_BUNDLE_QUERY = text("""
+    SELECT ib.*, bd.domain
+    FROM intelligence_bundles ib
+    JOIN business_domains bd ON ib.domain_id = bd.id
+    WHERE ib.domain_id = :domain_id
+    ORDER BY ib.created_at DESC
+    LIMIT 1;
+""")
+
+# Latest bundle for each of a set of domains, in one pass
+LATEST_BUNDLES_FOR_DOMAINS_QUERY = text(f"""
+    SELECT * FROM (
+        SELECT {BUNDLE_COLUMNS}, bd.domain,
+               ROW_NUMBER() OVER (PARTITION BY ib.domain_id ORDER BY ib.created_at DESC) AS bundle_rank
+        FROM intelligence_bundles ib
+        JOIN business_domains bd ON ib.domain_id = bd.id
+        WHERE ib.domain_id IN :domain_ids
+    ) latest
+    WHERE bundle_rank = 1;
+""").bindparams(bindparam("domain_ids", expanding=True))
+
+# Keyset-paginated walk over business_domains
+FIRST_DOMAIN_PAGE_QUERY = text("""
+    SELECT bd.id
+    FROM business_domains bd
+    ORDER BY bd.id
+    LIMIT :limit;
+""")
+
+DOMAIN_PAGE_QUERY = text("""
+    SELECT bd.id
+    FROM business_domains bd
+    WHERE bd.id > :after_id
+    ORDER BY bd.id
+    LIMIT :limit;
+""")
+
+
+LATEST_BUNDLE_CREATED_AT_QUERY = text("""
+    SELECT MAX(created_at) FROM intelligence_bundles;
+""")
+
+
+# Domains that received a bundle at or after a watermark
+DOMAINS_WITH_NEW_BUNDLES_QUERY = text("""
+    SELECT DISTINCT ib.domain_id
+    FROM intelligence_bundles ib
+    WHERE ib.created_at >= :since
+    ORDER BY ib.domain_id;
+""")
+
+
+async def fetch_domain_page(db: AsyncSession, after_id: Any, limit: int) -> List[Any]:
+    """Next page of business domain IDs after after_id (None for the first page)"""
+    if after_id is None:
+        result = await db.execute(FIRST_DOMAIN_PAGE_QUERY, {"limit": limit})
+    else:
+        result = await db.execute(DOMAIN_PAGE_QUERY, {"after_id": after_id, "limit": limit})
+    return list(result.scalars().all())
+
+
+async def fetch_latest_bundles(db: AsyncSession, domain_ids: Sequence[Any]) -> List[Dict[str, Any]]:
+    """Latest intelligence bundle row for each domain, as dictionaries"""
+    if not domain_ids:
+        return []
+    result = await db.execute(LATEST_BUNDLES_FOR_DOMAINS_QUERY, {"domain_ids": list(domain_ids)})
+    columns = [column for column in result.keys() if column != "bundle_rank"]
+    return [
+        {column: row_mapping[column] for column in columns}
+        for row_mapping in result.mappings()
+    ]
+
+
+async def get_business_intelligence(db: AsyncSession, domain_id: Any) -> Optional[Dict[str, Any]]:
+    """
+    Business intelligence for a domain, served from the read model
+
+    The shared cache is checked first. A missing or outdated snapshot is
+    rebuilt from the latest bundle and written back, so the next request
+    is a primary-key lookup.
+    """
+    cached = await bi_cache.get(domain_id)
+    if cached is not None:
+        return cached
+
+    snapshot = await db.get(BusinessIntelligenceSnapshot, str(domain_id))
+    if snapshot is not None and not _snapshot_expired(snapshot):
+        await bi_cache.set(domain_id, snapshot.payload)
+        return snapshot.payload
+
+    result = await db.execute(LATEST_BUNDLE_QUERY, {"domain_id": domain_id})
+    row = result.mappings().fetchone()
+    if not row:
+        return None
+    payload = jsonable_encoder(build_business_intelligence(dict(row)))
+    try:
+        await _store_snapshots(db, [(dict(row), payload)])
+    except IntegrityError:
+        # A concurrent request stored the same snapshot first
+        await db.rollback()
+    return payload
+
+
+async def get_business_intelligence_many(
+    db: AsyncSession, domain_ids: Sequence[Any]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Business intelligence for a batch of domains, keyed by domain ID
+
+    The shared cache is read with one multi-get, remaining snapshots in
+    one query, and missing or outdated ones are rebuilt together from a
+    single latest-bundle query. Domains without any bundle are absent
+    from the result.
+    """
+    if not domain_ids:
+        return {}
+    keys = [str(domain_id) for domain_id in domain_ids]
+    payloads = {
+        key: payload
+        for key, payload in zip(keys, await bi_cache.get_many(keys))
+        if payload is not None
+    }
+
+    uncached = [key for key in keys if key not in payloads]
+    if uncached:
+        result = await db.execute(
+            select(BusinessIntelligenceSnapshot).where(BusinessIntelligenceSnapshot.domain_id.in_(uncached))
+        )
+        from_snapshots = {
+            snapshot.domain_id: snapshot.payload
+            for snapshot in result.scalars()
+            if not _snapshot_expired(snapshot)
+        }
+        await bi_cache.set_many(list(from_snapshots.items()))
+        payloads.update(from_snapshots)
+
+    missing = [domain_id for domain_id in domain_ids if str(domain_id) not in payloads]
+    if missing:
+        bundles = await fetch_latest_bundles(db, missing)
+        snapshots = [(bundle, jsonable_encoder(build_business_intelligence(bundle))) for bundle in bundles]
+        for bundle, payload in snapshots:
+            payloads[str(bundle["domain_id"])] = payload
+        try:
+            await _store_snapshots(db, snapshots)
+        except IntegrityError:
+            await db.rollback()
+    return payloads
+
+
+async def fetch_raw_bundle(db: AsyncSession, domain_id: Any) -> Optional[Dict[str, Any]]:
+    """Full latest intelligence bundle row for a domain, JSON encoded"""
+    result = await db.execute(RAW_BUNDLE_QUERY, {"domain_id": domain_id})
+    row = result.mappings().fetchone()
+    return jsonable_encoder(dict(row)) if row else None
+
+
+async def refresh_snapshots(db: AsyncSession, domain_ids: Sequence[Any]) -> int:
+    """Rebuild read-model snapshots for a batch of domains"""
+    bundles = await fetch_latest_bundles(db, domain_ids)
+    await _store_snapshots(
+        db,
+        [(bundle, jsonable_encoder(build_business_intelligence(bundle))) for bundle in bundles],
+    )
+    return len(bundles)
+
+
+async def latest_bundle_created_at(db: AsyncSession) -> Any:
+    """Creation time of the newest intelligence bundle, as the driver returns it"""
+    result = await db.execute(LATEST_BUNDLE_CREATED_AT_QUERY)
+    return result.scalar()
+
+
+async def fetch_domains_with_new_bundles(db: AsyncSession, since: Any) -> List[Any]:
+    """Domains that received a bundle at or after since"""
+    result = await db.execute(DOMAINS_WITH_NEW_BUNDLES_QUERY, {"since": since})
+    return list(result.scalars().all())
+
+
+async def _store_snapshots(db: AsyncSession, snapshots: Sequence[tuple]):
+    """Upsert (bundle row, payload) pairs into the read model"""
+    if not snapshots:
+        return
+    domain_ids = [str(bundle["domain_id"]) for bundle, _ in snapshots]
+    result = await db.execute(
+        select(BusinessIntelligenceSnapshot).where(BusinessIntelligenceSnapshot.domain_id.in_(domain_ids))
+    )
+    existing = {snapshot.domain_id: snapshot for snapshot in result.scalars()}
+    now = datetime.now(timezone.utc)
+    for bundle, payload in snapshots:
+        domain_id = str(bundle["domain_id"])
+        snapshot = existing.get(domain_id)
+        if snapshot is None:
+            snapshot = BusinessIntelligenceSnapshot(domain_id=domain_id)
+            db.add(snapshot)
+        snapshot.bundle_id = str(bundle["id"]) if bundle.get("id") is not None else None
+        snapshot.bundle_created_at = _as_datetime(bundle.get("created_at"))
+        snapshot.payload = payload
+        snapshot.refreshed_at = now
+    await db.commit()
+    await bi_cache.set_many([(str(bundle["domain_id"]), payload) for bundle, payload in snapshots])
+
+
+def _snapshot_expired(snapshot: BusinessIntelligenceSnapshot) -> bool:
+    max_age = settings.BI_READ_MODEL_MAX_AGE_SECONDS
+    if not max_age:
+        return False
+    refreshed_at = snapshot.refreshed_at
+    if refreshed_at.tzinfo is None:
+        refreshed_at = refreshed_at.replace(tzinfo=timezone.utc)
+    return datetime.now(timezone.utc) - refreshed_at > timedelta(seconds=max_age)
+
+
+def _as_datetime(value: Any) -> Optional[datetime]:
+    """Bundle timestamps may arrive as datetimes or ISO strings"""
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def build_business_intelligence(raw_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Transform an intelligence_bundles row into the business intelligence format"""
+    return {
+        "domain_id": raw_data["domain_id"],
+        "domain": raw_data["domain"],
+        "company_name": raw_data.get("lead_company", ""),
+        "industry": raw_data.get("lead_industry", ""),
+        "description": raw_data.get("llm_digest", ""),
+        "website": f"https://{raw_data['domain']}",
+        "location": raw_data.get("lead_location", ""),
+        "employee_count": None,  # Not available in current schema
+        "revenue_range": None,   # Not available in current schema
+        "key_products": _extract_key_products(raw_data),
+        "target_audience": None,  # Could be derived from content analysis
+        "competitors": [],        # Not available in current schema
+        "pain_points": _extract_pain_points(raw_data),
+        "goals": _extract_goals(raw_data),
+        "budget_range": None,     # Not available in current schema
+        "timeline": None,         # Not available in current schema
+        "decision_makers": _extract_decision_makers(raw_data),
+        "recent_news": [],        # Not available in current schema
+        "social_media": _extract_social_media(raw_data),
+    }
+
+
+def _extract_key_products(data):
+    """Extract key products/services from the intelligence data"""
+    products = []
+
+    # Try to extract from content summaries
+    if data.get("content_summaries"):
+        summaries = data["content_summaries"]
+        if isinstance(summaries, dict) and "services" in summaries:
+            services_text = summaries["services"]
+            if isinstance(services_text, str):
+                # Simple extraction - could be improved with NLP
+                services = [s.strip() for s in services_text.split('\n') if s.strip() and len(s.strip()) > 3]
+                products.extend(services[:5])  # Limit to 5
+
+    # Try to extract from keyword signals
+    if data.get("keyword_signals") and not products:
+        signals = data["keyword_signals"]
+        if isinstance(signals, dict) and "top_keywords" in signals:
+            keywords = signals["top_keywords"]
+            if isinstance(keywords, list):
+                # Use top keywords as potential products/services
+                products.extend(keywords[:3])
+
+    return products if products else ["Business Services"]
+
+
+def _extract_pain_points(data):
+    """Extract potential pain points from the intelligence data"""
+    # This is a simplified extraction - in practice, this would require more sophisticated analysis
+    pain_points = []
+
+    # Could analyze content for common business pain points
+    # For now, return generic ones based on industry
+    industry = data.get("lead_industry", "").lower()
+    if "dental" in industry or "dentist" in industry:
+        pain_points = [
+            "Patient retention and loyalty",
+            "Competition from larger dental chains",
+            "Managing appointment scheduling efficiently",
+            "Keeping up with latest dental technologies"
+        ]
+    else:
+        pain_points = [
+            "Increasing operational efficiency",
+            "Managing customer relationships",
+            "Staying competitive in the market",
+            "Scaling business operations"
+        ]
+
+    return pain_points
+
+
+def _extract_goals(data):
+    """Extract business goals from the intelligence data"""
+    goals = [
+        "Grow business revenue and profitability",
+        "Improve customer satisfaction and retention",
+        "Expand market presence and reach",
+        "Leverage technology for competitive advantage"
+    ]
+
+    # Customize based on industry
+    industry = data.get("lead_industry", "").lower()
+    if "dental" in industry or "dentist" in industry:
+        goals = [
+            "Provide exceptional patient care and outcomes",
+            "Build long-term patient relationships",
+            "Grow practice through community engagement",
+            "Invest in modern dental technologies"
+        ]
+
+    return goals
+
+
+def _extract_decision_makers(data):
+    """Extract decision makers from the intelligence data"""
+    decision_makers = []
+
+    if data.get("lead_name") and data.get("lead_title"):
+        decision_makers.append({
+            "name": data["lead_name"],
+            "role": data["lead_title"]
+        })
+
+    # Could extract more from metadata_insights if available
+    if data.get("metadata_insights"):
+        insights = data["metadata_insights"]
+        if isinstance(insights, dict) and "apollo_contact" in insights:
+            apollo_data = insights["apollo_contact"]
+            if isinstance(apollo_data, dict):
+                name = apollo_data.get("name")
+                title = apollo_data.get("title")
+                if name and title and name != data.get("lead_name"):
+                    decision_makers.append({
+                        "name": name,
+                        "role": title
+                    })
+
+    return decision_makers if decision_makers else [{"name": "Business Owner", "role": "Decision Maker"}]
+
+
+def _extract_social_media(data):
+    """Extract social media information from the intelligence data"""
+    social_media = {
+        "website": f"https://{data['domain']}"
+    }
+
+    # Extract from online_presence if available
+    if data.get("online_presence"):
+        presence = data["online_presence"]
+        if isinstance(presence, dict):
+            if "linkedin_url" in presence:
+                social_media["linkedin"] = presence["linkedin_url"]
+
+    # Default social media handles (could be improved)
+    social_media["twitter"] = f"https://twitter.com/{data['domain'].split('.')[0]}"
+
+    return social_media
@@ -0,0 +1,294 @@
+"""
+Outgoing email
+
+Messages are rendered from string.Template templates compiled once per
+process and delivered by EmailDispatcher: a small pool of persistent SMTP
+connections, each taking whatever is queued (up to SMTP_BATCH_SIZE) and
+sending it as one batch over the open connection, so a burst of mail
+costs one connect/handshake per connection rather than one per message.
+
+Request handlers call enqueue_email, which stores a background job and
+returns; the "email" job queue renders the message and waits on the
+dispatcher, retrying failed deliveries with backoff.
+"""
+
+import asyncio
+import time
+from email.message import EmailMessage
+from email.utils import formataddr
+from functools import lru_cache
+from string import Template
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiosmtplib
+import structlog
+
+from app.core.config import settings
+from app.core.jobs import jobs
+from app.core.metrics import EMAIL_BATCH_SIZE, EMAILS_SENT
+from app.models.inquiry import Inquiry
+
+logger = structlog.get_logger(__name__)
+
+# Template name -> (subject, plain-text body)
+TEMPLATES: Dict[str, Tuple[str, str]] = {
+    # Sent to an unverified address, so it carries no submitted text: the
+    # form must not be usable to relay arbitrary content to third parties
+    "inquiry_confirmation": (
+        "We received your message",
+        """Hello,
+
+Thanks for contacting $project_name. We have received your message and
+will get back to you shortly.
+
+If you did not contact us, you can ignore this email.
+
+The $project_name team
+""",
+    ),
+    "inquiry_notification": (
+        "New inquiry from $name: $subject",
+        """A new inquiry was submitted.
+
+Name: $name
+Email: $email
+Company: $company
+Service interest: $service_interest
+Subject: $subject
+
+$message
+""",
+    ),
+}
+
+# Connection-level failures; the message is retried once on a fresh connection
+CONNECTION_ERRORS = (aiosmtplib.SMTPServerDisconnected, aiosmtplib.SMTPConnectError, OSError)
+
+
+@lru_cache(maxsize=None)
+def get_template(name: str) -> Tuple[Template, Template]:
+    """Compiled subject and body templates"""
+    subject, body = TEMPLATES[name]
+    return Template(subject), Template(body)
+
+
+def render(name: str, context: Dict[str, Any]) -> Tuple[str, str]:
+    """Render a template to (subject, body)"""
+    subject, body = get_template(name)
+    context = {"project_name": settings.PROJECT_NAME, **context}
+    # Header values may not contain line breaks
+    return " ".join(subject.substitute(context).split()), body.substitute(context)
+
+
+def build_message(to: str, subject: str, body: str) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = formataddr((settings.EMAILS_FROM_NAME or settings.PROJECT_NAME, settings.EMAILS_FROM_EMAIL))
+    message["To"] = to
+    message["Subject"] = subject
+    message.set_content(body)
+    return message
+
+
+class EmailDispatcher:
+    """Sends queued messages in batches over pooled SMTP connections"""
+
+    def __init__(
+        self,
+        hostname: Optional[str],
+        port: Optional[int],
+        username: Optional[str],
+        password: Optional[str],
+        use_tls: bool,
+        pool_size: int = 2,
+        batch_size: int = 50,
+        timeout: float = 10.0,
+        idle_timeout: float = 60.0,
+    ):
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.pool_size = pool_size
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        # Created with the senders, on the event loop that first needs them
+        self._queue: Optional[asyncio.Queue] = None
+        self._senders: List[asyncio.Task] = []
+        self.started = time.monotonic()
+        self.sent = 0
+        self.failed = 0
+        self.batches = 0
+        self.connects = 0
+
+    def is_configured(self) -> bool:
+        return bool(self.hostname and settings.EMAILS_FROM_EMAIL)
+
+    async def send(self, message: EmailMessage):
+        """Queue a message and wait until the server has accepted it"""
+        if not self.is_configured():
+            raise RuntimeError("Email is not configured - missing SMTP_HOST or EMAILS_FROM_EMAIL")
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._senders = [asyncio.create_task(self._sender()) for _ in range(self.pool_size)]
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((message, future))
+        await future
+
+    def _client(self) -> aiosmtplib.SMTP:
+        # Port 465 is implicit TLS; elsewhere SMTP_TLS means STARTTLS
+        implicit_tls = self.use_tls and self.port == 465
+        return aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            username=self.username,
+            password=self.password,
+            use_tls=implicit_tls,
+            start_tls=self.use_tls and not implicit_tls,
+            timeout=self.timeout,
+        )
+
+    async def _sender(self):
+        smtp: Optional[aiosmtplib.SMTP] = None
+        try:
+            while True:
+                if smtp is None:
+                    item = await self._queue.get()
+                else:
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout=self.idle_timeout)
+                    except asyncio.TimeoutError:
+                        await self._disconnect(smtp)
+                        smtp = None
+                        continue
+
+                batch = [item]
+                while len(batch) < self.batch_size and not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                smtp = await self._send_batch(smtp, batch)
+        finally:
+            if smtp is not None:
+                smtp.close()
+
+    async def _send_batch(self, smtp: Optional[aiosmtplib.SMTP], batch: List[Tuple[EmailMessage, asyncio.Future]]):
+        """Send a batch over one connection; returns the connection to keep (if any)"""
+        self.batches += 1
+        EMAIL_BATCH_SIZE.observe(len(batch))
+        for message, future in batch:
+            if future.done():
+                continue
+            for attempt in range(2):
+                try:
+                    if smtp is None or not smtp.is_connected:
+                        smtp = self._client()
+                        self.connects += 1
+                        await smtp.connect()
+                    await smtp.send_message(message)
+                except CONNECTION_ERRORS as e:
+                    smtp = self._discard(smtp)
+                    if attempt == 0:
+                        logger.warning("SMTP connection lost; reconnecting", error=str(e))
+                        continue
+                    self._fail(future, e)
+                except Exception as e:
+                    # Rejected by the server (or unencodable); fail this message only
+                    self._fail(future, e)
+                else:
+                    self.sent += 1
+                    EMAILS_SENT.inc("sent")
+                    if not future.done():
+                        future.set_result(None)
+                break
+        return smtp
+
+    def _fail(self, future: asyncio.Future, error: Exception):
+        self.failed += 1
+        EMAILS_SENT.inc("failed")
+        if not future.done():
+            future.set_exception(error)
+
+    @staticmethod
+    def _discard(smtp: Optional[aiosmtplib.SMTP]) -> None:
+        if smtp is not None:
+            smtp.close()
+        return None
+
+    @staticmethod
+    async def _disconnect(smtp: aiosmtplib.SMTP):
+        try:
+            await smtp.quit()
+        except aiosmtplib.SMTPException:
+            smtp.close()
+
+    async def close(self):
+        """Stop the senders and close their connections"""
+        for sender in self._senders:
+            sender.cancel()
+        await asyncio.gather(*self._senders, return_exceptions=True)
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, future = self._queue.get_nowait()
+                if not future.done():
+                    future.set_exception(RuntimeError("Email dispatcher closed"))
+        self._queue = None
+        self._senders = []
+
+    def stats(self) -> Dict[str, Any]:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "sent": self.sent,
+            "failed": self.failed,
+            "batches": self.batches,
+            "avg_batch_size": round((self.sent + self.failed) / self.batches, 2) if self.batches else None,
+            "connects": self.connects,
+            "sent_per_second": round(self.sent / elapsed, 3),
+        }
+
+
+# Global dispatcher instance
+email_dispatcher = EmailDispatcher(
+    hostname=settings.SMTP_HOST,
+    port=settings.SMTP_PORT,
+    username=settings.SMTP_USER,
+    password=settings.SMTP_PASSWORD,
+    use_tls=settings.SMTP_TLS,
+    pool_size=settings.SMTP_POOL_SIZE,
+    batch_size=settings.SMTP_BATCH_SIZE,
+    timeout=settings.SMTP_TIMEOUT_SECONDS,
+    idle_timeout=settings.SMTP_IDLE_TIMEOUT_SECONDS,
+)
+
+# Enough waiting jobs to fill a batch on every connection
+jobs.add_queue("email", concurrency=settings.SMTP_POOL_SIZE * settings.SMTP_BATCH_SIZE)
+
+
+@jobs.task("email.send", queue="email")
+async def send_email(to: str, template: str, context: Dict[str, Any]):
+    """Render a template and deliver it (queued by enqueue_email)"""
+    subject, body = render(template, context)
+    await email_dispatcher.send(build_message(to, subject, body))
+
+
+async def enqueue_email(to: str, template: str, context: Dict[str, Any]) -> bool:
+    """Queue a templated email for delivery; False if email is not configured"""
+    if not email_dispatcher.is_configured():
+        return False
+    return await jobs.enqueue("email.send", {"to": to, "template": template, "context": context}, persist=True)
+
+
+async def notify_inquiry_received(inquiry: Inquiry):
+    """Confirmation to the sender, plus a notification when INQUIRY_NOTIFICATION_EMAIL is set"""
+    await enqueue_email(inquiry.email, "inquiry_confirmation", {})
+    if not settings.INQUIRY_NOTIFICATION_EMAIL:
+        return
+    context = {
+        "name": inquiry.name,
+        "email": inquiry.email,
+        "company": inquiry.company or "-",
+        "service_interest": inquiry.service_interest or "-",
+        "subject": inquiry.subject,
+        "message": inquiry.message,
+    }
+    await enqueue_email(settings.INQUIRY_NOTIFICATION_EMAIL, "inquiry_notification", context)
@@ -0,0 +1,128 @@
+"""
+Password hashing service
+
+bcrypt is deliberately slow, so hashing and verification run in a small
+process pool instead of on the request path. The number of outstanding
+jobs is bounded; once the bound is reached callers are rejected
+immediately so a login burst cannot starve the rest of the API. If a
+worker process dies the pool is replaced and only the calls caught in
+it fail.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+import structlog
+
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_password
+
+logger = structlog.get_logger(__name__)
+
+
+class PasswordHasherUnavailable(Exception):
+    """Raised when a hashing job cannot be run right now"""
+
+
+class PasswordHasherOverloaded(PasswordHasherUnavailable):
+    """Raised when too many hashing jobs are already outstanding"""
+
+
+class PasswordHasher:
+    """Runs bcrypt work in a bounded process pool"""
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.pool_restarts = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn avoids forking a process that is already running threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor):
+        """Drop a broken pool so the next call starts a fresh one"""
+        with self._lock:
+            if self._executor is not executor:
+                # Another caller already replaced it
+                return
+            self._executor = None
+            self.pool_restarts += 1
+        logger.error("Password hashing worker died; restarting the process pool")
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self, _future):
+        with self._lock:
+            self._pending -= 1
+            self.completed += 1
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordHasherOverloaded("Password hashing queue is full")
+            self._pending += 1
+        executor = self._get_executor()
+        try:
+            future = executor.submit(fn, *args)
+        except Exception as e:
+            with self._lock:
+                self._pending -= 1
+            if isinstance(e, BrokenProcessPool):
+                self._discard_executor(executor)
+                raise PasswordHasherUnavailable("Password hashing pool was restarted") from e
+            raise
+        # Released when the worker finishes, not when the caller stops
+        # waiting, so cancelled requests still count against the bound
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wrap_future(future)
+        except BrokenProcessPool as e:
+            self._discard_executor(executor)
+            raise PasswordHasherUnavailable("Password hashing pool was restarted") from e
+
+    async def hash(self, password: str) -> str:
+        """Hash a password"""
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash"""
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "pool_restarts": self.pool_restarts,
+            }
+
+
+# Global service instance
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
@@ -7,10 +7,23 @@ based on business intelligence data for agent conversations.
 
 import os
 import json
-from typing import Dict, Any, Optional
+import asyncio
+import hashlib
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+import structlog
 from openai import AsyncOpenAI
+from sqlalchemy import delete, select
 
+from app.core.cache import SharedCache, TTLCache, get_cache_backend
 from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.jobs import jobs
+from app.core.metrics import PITCH_FALLBACKS, PITCH_GENERATION_DURATION
+from app.models.pitch_cache import PitchCacheEntry
+
+logger = structlog.get_logger(__name__)
 
 
 class MarketingPitch:
@@ -43,12 +56,333 @@ class MarketingPitch:
             "social_proof": self.social_proof,
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MarketingPitch":
+        """Rebuild a pitch from its dictionary form"""
+        return cls(
+            headline=data["headline"],
+            subheadline=data["subheadline"],
+            key_benefits=data.get("key_benefits") or [],
+            call_to_action=data["call_to_action"],
+            personalized_insights=data.get("personalized_insights") or [],
+            social_proof=data.get("social_proof"),
+        )
+
+
+def pitch_fingerprint(business_context: str, agent_name: str) -> str:
+    """Stable cache key for a pitch generated from this context and agent"""
+    return hashlib.sha256(f"{agent_name}\n{business_context}".encode("utf-8")).hexdigest()
+
+
+class CachedPitch:
+    """A cached pitch and when it was generated"""
+
+    def __init__(self, pitch: MarketingPitch, generated_at: datetime):
+        self.pitch = pitch
+        self.generated_at = generated_at
+
+    def age_seconds(self) -> float:
+        return -_seconds_until(self.generated_at)
+
+
+class PitchCache:
+    """
+    Tiered pitch cache
+
+    An in-process LRU sits in front of the shared cache (Redis when
+    configured), which sits in front of the durable pitch_cache table. All
+    tiers honour the same expiry, but process-local tiers (the LRU, and the
+    shared cache when it is the in-process stand-in) keep entries for at
+    most PITCH_CACHE_LOCAL_TTL_SECONDS, which bounds how long another
+    worker's invalidate_domain takes to reach this one. Shared cache and
+    database errors degrade to a cache miss rather than failing the request.
+    """
+
+    def __init__(self, maxsize: int = None, ttl_seconds: int = None, local_ttl_seconds: int = None):
+        self.ttl_seconds = ttl_seconds or settings.PITCH_CACHE_TTL_SECONDS
+        self.local_ttl_seconds = min(
+            local_ttl_seconds or settings.PITCH_CACHE_LOCAL_TTL_SECONDS, self.ttl_seconds
+        )
+        self.memory = TTLCache(
+            maxsize=maxsize or settings.PITCH_CACHE_MEMORY_SIZE,
+            ttl=self.local_ttl_seconds,
+        )
+        self.shared = SharedCache("pitch", ttl=self.ttl_seconds)
+        self.db_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.errors = 0
+
+    async def get(self, fingerprint: str) -> Optional[MarketingPitch]:
+        """Look up a pitch"""
+        cached = await self.get_entry(fingerprint)
+        return cached.pitch if cached else None
+
+    async def get_entry(self, fingerprint: str) -> Optional[CachedPitch]:
+        """Look up a pitch with its age, promoting hits into the faster tiers"""
+        cached = self.memory.get(fingerprint)
+        if cached is not None:
+            return cached
+
+        shared = await self.shared.get(fingerprint)
+        if shared is not None:
+            cached = CachedPitch(
+                MarketingPitch.from_dict(shared["pitch"]),
+                datetime.fromisoformat(shared["generated_at"]),
+            )
+            remaining = self.ttl_seconds - cached.age_seconds()
+            if remaining > 0:
+                self.memory.set(fingerprint, cached, ttl=min(remaining, self.local_ttl_seconds))
+                return cached
+
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    select(PitchCacheEntry).where(PitchCacheEntry.fingerprint == fingerprint)
+                )
+                entry = result.scalars().first()
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Pitch cache lookup failed", error=str(e))
+            entry = None
+
+        remaining = _seconds_until(entry.expires_at) if entry else 0
+        if remaining <= 0:
+            self.misses += 1
+            return None
+
+        self.db_hits += 1
+        generated_at = entry.generated_at
+        if generated_at.tzinfo is None:
+            generated_at = generated_at.replace(tzinfo=timezone.utc)
+        cached = CachedPitch(MarketingPitch.from_dict(entry.pitch), generated_at)
+        self.memory.set(fingerprint, cached, ttl=min(remaining, self.local_ttl_seconds))
+        await self.shared.set(fingerprint, self._shared_value(cached), ttl=self._shared_ttl(remaining))
+        return cached
+
+    def _shared_ttl(self, remaining: float) -> float:
+        if get_cache_backend().shared:
+            return remaining
+        return min(remaining, self.local_ttl_seconds)
+
+    @staticmethod
+    def _shared_value(cached: CachedPitch) -> Dict[str, Any]:
+        return {"pitch": cached.pitch.to_dict(), "generated_at": cached.generated_at.isoformat()}
+
+    async def set(
+        self,
+        fingerprint: str,
+        pitch: MarketingPitch,
+        domain_id: Any = None,
+        agent_name: str = "Forge Assistant",
+    ):
+        """Store a pitch in both tiers"""
+        generated_at = datetime.now(timezone.utc)
+        cached = CachedPitch(pitch, generated_at)
+        self.memory.set(fingerprint, cached)
+        await self.shared.set(fingerprint, self._shared_value(cached), ttl=self._shared_ttl(self.ttl_seconds))
+        self.stores += 1
+        expires_at = generated_at + timedelta(seconds=self.ttl_seconds)
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    select(PitchCacheEntry).where(PitchCacheEntry.fingerprint == fingerprint)
+                )
+                entry = result.scalars().first()
+                if entry is None:
+                    entry = PitchCacheEntry(fingerprint=fingerprint)
+                    db.add(entry)
+                entry.domain_id = str(domain_id) if domain_id is not None else None
+                entry.agent_name = agent_name
+                entry.pitch = pitch.to_dict()
+                entry.generated_at = generated_at
+                entry.expires_at = expires_at
+                await db.commit()
+        except Exception as e:
+            # Includes a concurrent insert of the same fingerprint; either row is fine
+            self.errors += 1
+            logger.warning("Pitch cache store failed", error=str(e))
+
+    async def invalidate_domain(self, domain_id: Any) -> int:
+        """Remove every cached pitch generated for a domain
+
+        Other workers keep serving their process-local copies for up to
+        PITCH_CACHE_LOCAL_TTL_SECONDS.
+        """
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(PitchCacheEntry.fingerprint).where(PitchCacheEntry.domain_id == str(domain_id))
+            )
+            fingerprints = list(result.scalars().all())
+            await db.execute(
+                delete(PitchCacheEntry).where(PitchCacheEntry.domain_id == str(domain_id))
+            )
+            await db.commit()
+        for fingerprint in fingerprints:
+            self.memory.pop(fingerprint)
+        await self.shared.delete(*fingerprints)
+        return len(fingerprints)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for every tier"""
+        memory = self.memory.stats()
+        hits = memory["hits"] + self.shared.hits + self.db_hits
+        lookups = hits + self.misses
+        return {
+            "memory": memory,
+            "shared": self.shared.stats(),
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "errors": self.errors,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class IncrementalJSONObjectParser:
+    """
+    Emits the top-level members of a JSON object as each one completes
+
+    Text is fed in arbitrary chunks. Anything before the opening brace
+    (such as a markdown code fence) is ignored. A member is complete once
+    the parser sees the comma or closing brace that ends it at depth one.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._scanned = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._member_start: Optional[int] = None
+        self.done = False
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        """Consume more text and return newly completed (key, value) pairs"""
+        self._buffer += text
+        members = []
+        for index in range(self._scanned, len(self._buffer)):
+            if self.done:
+                break
+            char = self._buffer[index]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                    self._member_start = index + 1
+                continue
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    members.extend(self._complete_member(index))
+                    self.done = True
+            elif char == "," and self._depth == 1:
+                members.extend(self._complete_member(index))
+                self._member_start = index + 1
+        self._scanned = len(self._buffer)
+        return members
+
+    def _complete_member(self, end: int) -> List[Tuple[str, Any]]:
+        segment = self._buffer[self._member_start:end].strip()
+        if not segment:
+            return []
+        return list(json.loads("{" + segment + "}").items())
+
+
+class _InFlightCall:
+    """A shared generation task and the number of callers awaiting it"""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Request coalescing for concurrent calls with the same key
+
+    The first caller starts the work; callers arriving while it runs await
+    the same task and share its result or exception. A caller that times
+    out or is cancelled stops waiting without disturbing the others, and
+    the task itself is cancelled once nobody is waiting on it.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _InFlightCall] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    async def do(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Any]],
+        timeout: Optional[float] = None,
+    ) -> Any:
+        call = self._calls.get(key)
+        if call is None:
+            call = _InFlightCall(asyncio.ensure_future(factory()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda task: self._finish(key, call))
+            self.leaders += 1
+        else:
+            self.followers += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(call.task), timeout)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                call.task.cancel()
+
+    def _finish(self, key: str, call: _InFlightCall):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        if not call.task.cancelled():
+            # Mark the exception as retrieved even if every waiter left
+            call.task.exception()
+
+    def running(self, key: str) -> bool:
+        """Whether a call for this key is in progress (do() would join it)"""
+        return key in self._calls
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._calls),
+            "leaders": self.leaders,
+            "followers": self.followers,
+        }
+
+
+def _seconds_until(moment: datetime) -> float:
+    """Seconds from now until a stored timestamp (naive values are UTC)"""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return (moment - datetime.now(timezone.utc)).total_seconds()
+
 
 class PitchGenerationService:
     """Service for generating marketing pitches using OpenAI"""
 
-    def __init__(self):
+    def __init__(self, cache: Optional[PitchCache] = None):
         self.client = None
+        self.cache = cache or PitchCache()
+        self._inflight = SingleFlight()
+        self.tokens_used = 0
         self._initialized = False
         self._api_key_missing = False
 
@@ -87,7 +421,9 @@ class PitchGenerationService:
 
         Uses GPT-4o mini to create personalized marketing copy that encourages
         visitors to start an agent conversation. Analyzes business intelligence
-        to create compelling, targeted messaging.
+        to create compelling, targeted messaging. Pitches are cached by a
+        fingerprint of the business context, so unchanged intelligence is
+        served without another API call.
 
         Args:
             business_intelligence: Business data to base pitch on
@@ -95,24 +431,243 @@ class PitchGenerationService:
 
         Returns:
             Structured marketing pitch
-
-        Raises:
-            Exception: If pitch generation fails
         """
+        # Construct comprehensive business context for AI
+        business_context = self._build_business_context(business_intelligence)
+        fingerprint = pitch_fingerprint(business_context, agent_name)
+
+        cached_pitch = await self.cache.get(fingerprint)
+        if cached_pitch is not None:
+            return cached_pitch
+
         # Initialize client if needed
         self._initialize_client()
 
         # Check if we can generate pitches
         if getattr(self, '_api_key_missing', False):
             # Fall back to static pitch generation
+            PITCH_FALLBACKS.inc("unavailable")
             return self._generate_fallback_pitch(business_intelligence, agent_name)
 
         try:
-            # Construct comprehensive business context for AI
-            business_context = self._build_business_context(business_intelligence)
+            # Concurrent requests for the same context share one generation
+            return await self._inflight.do(
+                fingerprint,
+                lambda: self._generate_and_store(
+                    fingerprint,
+                    business_context,
+                    agent_name,
+                    business_intelligence.get("domain_id"),
+                ),
+                timeout=settings.PITCH_GENERATION_TIMEOUT_SECONDS,
+            )
+        except Exception as e:
+            # Fallback pitch in case of API failure or timeout; never cached
+            PITCH_FALLBACKS.inc("timeout" if isinstance(e, asyncio.TimeoutError) else "error")
+            return self._generate_fallback_pitch(business_intelligence, agent_name)
 
-            # Create detailed prompt for pitch generation
-            prompt = f"""You are a marketing copywriter specializing in AI agent introductions. Based on the following business intelligence about a company, create a compelling marketing pitch that encourages visitors to start an AI agent conversation.
+    async def _generate_and_store(
+        self,
+        fingerprint: str,
+        business_context: str,
+        agent_name: str,
+        domain_id: Any,
+    ) -> MarketingPitch:
+        """Generate a pitch and write it to the cache"""
+        marketing_pitch = await self._request_pitch(business_context, agent_name)
+        await self.cache.set(fingerprint, marketing_pitch, domain_id=domain_id, agent_name=agent_name)
+        return marketing_pitch
+
+    async def _stream_and_store(
+        self,
+        fingerprint: str,
+        business_context: str,
+        agent_name: str,
+        domain_id: Any,
+        fields: asyncio.Queue,
+    ) -> MarketingPitch:
+        """Stream a pitch from OpenAI, queueing (field, value) pairs as they complete, and cache it"""
+        started = time.perf_counter()
+        try:
+            stream = await self.client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=self._build_messages(business_context, agent_name),
+                temperature=0.7,
+                max_tokens=1000,
+                stream=True,
+            )
+            parser = IncrementalJSONObjectParser()
+            content = ""
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                content += delta
+                for member in parser.feed(delta):
+                    fields.put_nowait(member)
+            marketing_pitch = self._parse_pitch(content)
+        except Exception:
+            PITCH_GENERATION_DURATION.observe(time.perf_counter() - started, "stream", "error")
+            raise
+        PITCH_GENERATION_DURATION.observe(time.perf_counter() - started, "stream", "success")
+        await self.cache.set(fingerprint, marketing_pitch, domain_id=domain_id, agent_name=agent_name)
+        return marketing_pitch
+
+    async def get_pitch_swr(
+        self,
+        business_intelligence: Dict[str, Any],
+        agent_name: str = "Forge Assistant"
+    ) -> Tuple[MarketingPitch, Dict[str, Any]]:
+        """
+        Return a pitch immediately using stale-while-revalidate
+
+        Serves the cached pitch regardless of age (within the max stale
+        window), or the fallback pitch if none is usable, and schedules a
+        background regeneration when the cached copy is not fresh. Never
+        waits on the LLM.
+
+        Returns:
+            The pitch and freshness metadata describing where it came from
+        """
+        business_context = self._build_business_context(business_intelligence)
+        fingerprint = pitch_fingerprint(business_context, agent_name)
+        domain_id = business_intelligence.get("domain_id")
+
+        cached = await self.cache.get_entry(fingerprint)
+        if cached is not None:
+            age = cached.age_seconds()
+            meta = {
+                "generated_at": cached.generated_at.isoformat(),
+                "age_seconds": round(age, 3),
+                "revalidating": False,
+            }
+            if age <= settings.PITCH_SWR_FRESH_SECONDS:
+                return cached.pitch, {"status": "fresh", **meta}
+            if age <= settings.PITCH_SWR_MAX_STALE_SECONDS:
+                meta["revalidating"] = await self._schedule_refresh(
+                    fingerprint, business_context, agent_name, domain_id
+                )
+                return cached.pitch, {"status": "stale", **meta}
+
+        revalidating = await self._schedule_refresh(fingerprint, business_context, agent_name, domain_id)
+        PITCH_FALLBACKS.inc("swr_miss")
+        return self._generate_fallback_pitch(business_intelligence, agent_name), {
+            "status": "fallback",
+            "generated_at": None,
+            "age_seconds": None,
+            "revalidating": revalidating,
+        }
+
+    async def get_precomputed_pitch(
+        self,
+        business_intelligence: Dict[str, Any],
+        agent_name: str = "Forge Assistant"
+    ) -> Tuple[MarketingPitch, Dict[str, Any]]:
+        """
+        Return a cached pitch, or the fallback pitch, without ever calling the LLM
+
+        Returns:
+            The pitch and metadata describing where it came from
+        """
+        cached = await self.cache.get_entry(self.fingerprint(business_intelligence, agent_name))
+        if cached is None:
+            PITCH_FALLBACKS.inc("not_precomputed")
+            return self._generate_fallback_pitch(business_intelligence, agent_name), {
+                "status": "fallback",
+                "generated_at": None,
+                "age_seconds": None,
+            }
+        return cached.pitch, {
+            "status": "precomputed",
+            "generated_at": cached.generated_at.isoformat(),
+            "age_seconds": round(cached.age_seconds(), 3),
+        }
+
+    async def regenerate_pitch(
+        self,
+        business_intelligence: Dict[str, Any],
+        agent_name: str = "Forge Assistant"
+    ) -> MarketingPitch:
+        """
+        Generate a pitch with the LLM and store it, ignoring any cached copy
+
+        Unlike generate_pitch this never falls back, so batch callers can
+        retry.
+
+        Raises:
+            Exception: If the service is unavailable or generation fails
+        """
+        if not self.is_available():
+            raise Exception("Pitch generation unavailable - missing OPENAI_API_KEY")
+        business_context = self._build_business_context(business_intelligence)
+        fingerprint = pitch_fingerprint(business_context, agent_name)
+        return await self._inflight.do(
+            fingerprint,
+            lambda: self._generate_and_store(
+                fingerprint,
+                business_context,
+                agent_name,
+                business_intelligence.get("domain_id"),
+            ),
+        )
+
+    def fingerprint(self, business_intelligence: Dict[str, Any], agent_name: str = "Forge Assistant") -> str:
+        """Cache key for the pitch generated from this business intelligence"""
+        return pitch_fingerprint(self._build_business_context(business_intelligence), agent_name)
+
+    async def _schedule_refresh(
+        self,
+        fingerprint: str,
+        business_context: str,
+        agent_name: str,
+        domain_id: Any,
+    ) -> bool:
+        """Queue a background regeneration; returns False if unavailable"""
+        if not self.is_available():
+            return False
+        # One queued refresh per pitch; later requests find it already pending
+        await jobs.enqueue(
+            "pitch.refresh",
+            {
+                "fingerprint": fingerprint,
+                "business_context": business_context,
+                "agent_name": agent_name,
+                "domain_id": domain_id,
+            },
+            key=f"pitch:{fingerprint}",
+        )
+        return True
+
+    async def refresh_pitch(
+        self,
+        fingerprint: str,
+        business_context: str,
+        agent_name: str,
+        domain_id: Any,
+    ) -> MarketingPitch:
+        """Regenerate and store a cached pitch, joining an in-flight generation if there is one"""
+        return await self._inflight.do(
+            fingerprint,
+            lambda: self._generate_and_store(fingerprint, business_context, agent_name, domain_id),
+            timeout=settings.PITCH_GENERATION_TIMEOUT_SECONDS,
+        )
+
+    async def invalidate_domain(self, domain_id: Any) -> int:
+        """Drop every cached pitch for a domain"""
+        return await self.cache.invalidate_domain(domain_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache and request coalescing counters"""
+        return {
+            "cache": self.cache.stats(),
+            "single_flight": self._inflight.stats(),
+            "background_refreshes": jobs.stats()["queues"]["pitch"],
+            "tokens_used": self.tokens_used,
+        }
+
+    def _build_prompt(self, business_context: str, agent_name: str) -> str:
+        """Build the pitch generation prompt"""
+        return f"""You are a marketing copywriter specializing in AI agent introductions. Based on the following business intelligence about a company, create a compelling marketing pitch that encourages visitors to start an AI agent conversation.
 
 Business Context:
 {business_context}
@@ -144,54 +699,72 @@ Format your response as valid JSON with these exact keys:
   "social_proof": "string (optional)"
 }}"""
 
+    def _build_messages(self, business_context: str, agent_name: str) -> list[Dict[str, str]]:
+        """Chat messages for a pitch completion request"""
+        return [
+            {
+                "role": "system",
+                "content": "You are a marketing expert who creates compelling pitches for AI agent conversations. Always respond with valid JSON."
+            },
+            {
+                "role": "user",
+                "content": self._build_prompt(business_context, agent_name)
+            }
+        ]
+
+    async def _request_pitch(self, business_context: str, agent_name: str) -> MarketingPitch:
+        """
+        Request a pitch from OpenAI
+
+        Raises:
+            Exception: If the API call fails or returns an invalid pitch
+        """
+        started = time.perf_counter()
+        try:
             response = await self.client.chat.completions.create(
                 model="gpt-4o-mini",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a marketing expert who creates compelling pitches for AI agent conversations. Always respond with valid JSON."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
+                messages=self._build_messages(business_context, agent_name),
                 temperature=0.7,
                 max_tokens=1000,
             )
+        except Exception:
+            PITCH_GENERATION_DURATION.observe(time.perf_counter() - started, "request", "error")
+            raise
+        PITCH_GENERATION_DURATION.observe(time.perf_counter() - started, "request", "success")
 
-            content = response.choices[0].message.content
+        if response.usage:
+            self.tokens_used += response.usage.total_tokens
 
-            if not content:
-                raise Exception("No content received from OpenAI API")
+        content = response.choices[0].message.content
 
-            # Clean the content by removing markdown code block formatting if present
-            cleaned_content = content.strip().replace("```json\n", "").replace("\n```", "").replace("```", "")
+        if not content:
+            raise Exception("No content received from OpenAI API")
 
-            # Parse and validate the JSON response
-            pitch_data = json.loads(cleaned_content)
+        return self._parse_pitch(content)
 
-            # Validate required fields
-            required_fields = ["headline", "subheadline", "key_benefits", "call_to_action", "personalized_insights"]
-            for field in required_fields:
-                if field not in pitch_data:
-                    raise Exception(f"Invalid pitch structure received from OpenAI: missing {field}")
+    def _parse_pitch(self, content: str) -> MarketingPitch:
+        """Parse and validate the JSON pitch returned by the model"""
+        # Clean the content by removing markdown code block formatting if present
+        cleaned_content = content.strip().replace("```json\n", "").replace("\n```", "").replace("```", "")
 
-            # Ensure arrays are properly formatted
-            marketing_pitch = MarketingPitch(
-                headline=pitch_data["headline"],
-                subheadline=pitch_data["subheadline"],
-                key_benefits=pitch_data["key_benefits"] if isinstance(pitch_data["key_benefits"], list) else [],
-                call_to_action=pitch_data["call_to_action"],
-                personalized_insights=pitch_data["personalized_insights"] if isinstance(pitch_data["personalized_insights"], list) else [],
-                social_proof=pitch_data.get("social_proof"),
-            )
+        # Parse and validate the JSON response
+        pitch_data = json.loads(cleaned_content)
 
-            return marketing_pitch
+        # Validate required fields
+        required_fields = ["headline", "subheadline", "key_benefits", "call_to_action", "personalized_insights"]
+        for field in required_fields:
+            if field not in pitch_data:
+                raise Exception(f"Invalid pitch structure received from OpenAI: missing {field}")
 
-        except Exception as e:
-            # Fallback pitch in case of API failure
-            return self._generate_fallback_pitch(business_intelligence, agent_name)
+        # Ensure arrays are properly formatted
+        return MarketingPitch(
+            headline=pitch_data["headline"],
+            subheadline=pitch_data["subheadline"],
+            key_benefits=pitch_data["key_benefits"] if isinstance(pitch_data["key_benefits"], list) else [],
+            call_to_action=pitch_data["call_to_action"],
+            personalized_insights=pitch_data["personalized_insights"] if isinstance(pitch_data["personalized_insights"], list) else [],
+            social_proof=pitch_data.get("social_proof"),
+        )
 
     def _build_business_context(self, bi: Dict[str, Any]) -> str:
         """Build comprehensive business context string for AI prompt"""
@@ -248,6 +821,83 @@ Format your response as valid JSON with these exact keys:
 
         return "\n".join(context_parts) if context_parts else "General business seeking AI consultation services"
 
+    async def stream_pitch(
+        self,
+        business_intelligence: Dict[str, Any],
+        agent_name: str = "Forge Assistant"
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a pitch field by field
+
+        Yields {"event": "pitch_field", "field": ..., "value": ...} as each
+        top-level pitch field becomes available, followed by a single
+        {"event": "pitch", "pitch": ..., "source": ...} with the complete
+        pitch. Cached pitches are replayed. Otherwise the request joins the
+        single-flight for the pitch: the first caller streams the completion
+        from OpenAI and parses it incrementally, while callers arriving
+        during a generation (streamed or not) wait for it and replay its
+        fields. Any failure before the pitch completes falls back to the
+        static pitch.
+        """
+        business_context = self._build_business_context(business_intelligence)
+        fingerprint = pitch_fingerprint(business_context, agent_name)
+
+        source = "cache"
+        marketing_pitch = await self.cache.get(fingerprint)
+        emitted: Set[str] = set()
+
+        if marketing_pitch is None and self.is_available():
+            source = "generated"
+            fields: asyncio.Queue = asyncio.Queue()
+            # Only fed if this request starts the generation
+            generation = asyncio.ensure_future(self._inflight.do(
+                fingerprint,
+                lambda: self._stream_and_store(
+                    fingerprint,
+                    business_context,
+                    agent_name,
+                    business_intelligence.get("domain_id"),
+                    fields,
+                ),
+                timeout=settings.PITCH_GENERATION_TIMEOUT_SECONDS,
+            ))
+            next_field: Optional[asyncio.Future] = None
+            try:
+                while not generation.done() or not fields.empty():
+                    if fields.empty():
+                        next_field = asyncio.ensure_future(fields.get())
+                        await asyncio.wait({next_field, generation}, return_when=asyncio.FIRST_COMPLETED)
+                        if not next_field.done():
+                            continue
+                        field, value = next_field.result()
+                    else:
+                        field, value = fields.get_nowait()
+                    emitted.add(field)
+                    yield {"event": "pitch_field", "field": field, "value": value}
+                marketing_pitch = generation.result()
+            except Exception as e:
+                logger.warning("Streaming pitch generation failed", error=str(e))
+                marketing_pitch = None
+                # Re-send every field so clients replace any partial output
+                emitted.clear()
+            finally:
+                # Client went away: stop waiting (the generation carries on
+                # while other requests still wait for it)
+                if next_field is not None:
+                    next_field.cancel()
+                generation.cancel()
+
+        if marketing_pitch is None:
+            PITCH_FALLBACKS.inc("error" if source == "generated" else "unavailable")
+            source = "fallback"
+            marketing_pitch = self._generate_fallback_pitch(business_intelligence, agent_name)
+
+        pitch_data = marketing_pitch.to_dict()
+        for field, value in pitch_data.items():
+            if field not in emitted:
+                yield {"event": "pitch_field", "field": field, "value": value}
+        yield {"event": "pitch", "pitch": pitch_data, "source": source}
+
     def _generate_fallback_pitch(self, bi: Dict[str, Any], agent_name: str) -> MarketingPitch:
         """Generate fallback marketing pitch when OpenAI API fails"""
         company_name = bi.get("company_name", "your company")
@@ -274,3 +924,11 @@ Format your response as valid JSON with these exact keys:
 
 # Global service instance
 pitch_service = PitchGenerationService()
+
+jobs.add_queue("pitch", concurrency=settings.PITCH_REFRESH_CONCURRENCY, max_attempts=2)
+
+
+@jobs.task("pitch.refresh", queue="pitch")
+async def refresh_pitch(fingerprint: str, business_context: str, agent_name: str, domain_id: Any):
+    """Stale-while-revalidate regeneration queued by get_pitch_swr"""
+    await pitch_service.refresh_pitch(fingerprint, business_context, agent_name, domain_id)
@@ -0,0 +1,127 @@
+"""
+Stripe customer mapping
+
+Keeps a local user -> Stripe customer ID mapping so payment-method
+lookups skip the remote customer search, and caches each customer's
+payment methods in the shared cache. Both are kept current by Stripe
+webhook events (see sync_from_event).
+"""
+
+from typing import Any, Dict, List, Optional
+
+import structlog
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import SharedCache
+from app.core.config import settings
+from app.models.stripe_customer import StripeCustomer
+from app.models.user import User
+from app.schemas.auth import UserPrincipal
+from app.services.stripe_gateway import stripe_gateway
+
+logger = structlog.get_logger(__name__)
+
+# Card lists by customer ID; webhook events drop entries as cards change
+payment_methods_cache = SharedCache(
+    "stripe:payment_methods", ttl=settings.STRIPE_PAYMENT_METHODS_CACHE_TTL_SECONDS
+)
+
+CUSTOMER_EVENTS = {"customer.created", "customer.updated", "customer.deleted"}
+PAYMENT_METHOD_EVENTS = {
+    "payment_method.attached",
+    "payment_method.detached",
+    "payment_method.updated",
+    "payment_method.automatically_updated",
+}
+
+
+async def get_customer_id(db: AsyncSession, user: UserPrincipal) -> str:
+    """
+    Stripe customer ID for a user
+
+    Served from the local mapping; on first use the customer is found by
+    email (or created) and the mapping stored.
+    """
+    result = await db.execute(select(StripeCustomer.customer_id).where(StripeCustomer.user_id == user.id))
+    customer_id = result.scalar()
+    if customer_id:
+        return customer_id
+
+    customers = await stripe_gateway.list_customers(email=user.email)
+    if customers:
+        customer_id = customers[0]["id"]
+    else:
+        customer = await stripe_gateway.create_customer(
+            email=user.email,
+            name=user.full_name,
+            metadata={"user_id": user.id},
+        )
+        customer_id = customer["id"]
+
+    db.add(StripeCustomer(user_id=user.id, customer_id=customer_id, email=user.email))
+    try:
+        await db.commit()
+    except IntegrityError:
+        # A concurrent request stored the mapping first
+        await db.rollback()
+        result = await db.execute(select(StripeCustomer.customer_id).where(StripeCustomer.user_id == user.id))
+        customer_id = result.scalar() or customer_id
+    return customer_id
+
+
+async def list_payment_methods(customer_id: str) -> List[Dict[str, Any]]:
+    """A customer's cards, from the shared cache when possible"""
+    cached = await payment_methods_cache.get(customer_id)
+    if cached is not None:
+        return cached
+    payment_methods = await stripe_gateway.list_payment_methods(customer_id, type="card")
+    await payment_methods_cache.set(customer_id, payment_methods)
+    return payment_methods
+
+
+async def invalidate_payment_methods(customer_id: str):
+    await payment_methods_cache.delete(customer_id)
+
+
+async def sync_from_event(db: AsyncSession, event_type: str, obj: Dict[str, Any], previous: Optional[Dict[str, Any]] = None):
+    """Apply a Stripe webhook event to the mapping and the payment-method cache"""
+    if event_type in PAYMENT_METHOD_EVENTS:
+        # A detached card no longer names its customer; the previous value does
+        customer_id = obj.get("customer") or (previous or {}).get("customer")
+        if customer_id:
+            await invalidate_payment_methods(customer_id)
+        return
+
+    if event_type not in CUSTOMER_EVENTS:
+        return
+
+    customer_id = obj["id"]
+    await invalidate_payment_methods(customer_id)
+    if event_type == "customer.deleted":
+        await db.execute(delete(StripeCustomer).where(StripeCustomer.customer_id == customer_id))
+        await db.commit()
+        return
+
+    mapping = (await db.execute(
+        select(StripeCustomer).where(StripeCustomer.customer_id == customer_id)
+    )).scalars().first()
+    if mapping is not None:
+        mapping.email = obj.get("email") or mapping.email
+        await db.commit()
+        return
+
+    # Customers created outside this API are linked by our metadata, then email
+    user_id = (obj.get("metadata") or {}).get("user_id")
+    if user_id is None and obj.get("email"):
+        user_id = (await db.execute(select(User.id).where(User.email == obj["email"]))).scalar()
+    if user_id is None:
+        return
+    db.add(StripeCustomer(user_id=int(user_id), customer_id=customer_id, email=obj.get("email")))
+    try:
+        await db.commit()
+    except IntegrityError:
+        # The user is already mapped (to this or an earlier customer)
+        await db.rollback()
+        logger.info("Stripe customer not linked; user already mapped", customer_id=customer_id, user_id=user_id)
@@ -0,0 +1,209 @@
+"""
+Async Stripe gateway
+
+Talks to the Stripe REST API over one pooled httpx.AsyncClient, so
+payment endpoints never block a worker thread on a remote round trip and
+connections are kept alive between calls. Every POST carries an
+idempotency key, which makes retrying network errors, rate limits and
+5xx responses safe.
+"""
+
+import asyncio
+import random
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+import httpx
+
+from app.core.config import settings
+
+RETRYABLE_STATUS_CODES = {409, 429, 500, 502, 503, 504}
+
+
+class StripeError(Exception):
+    """Error response (or exhausted retries) from the Stripe API"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, code: Optional[str] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.code = code
+
+
+def _encode_params(params: Dict[str, Any], prefix: str = "") -> List[Tuple[str, str]]:
+    """Flatten params into Stripe's form encoding (metadata[key]=..., expand[]=...)"""
+    pairs: List[Tuple[str, str]] = []
+    for key, value in params.items():
+        name = f"{prefix}[{key}]" if prefix else str(key)
+        if value is None:
+            continue
+        if isinstance(value, dict):
+            pairs.extend(_encode_params(value, name))
+        elif isinstance(value, (list, tuple)):
+            for index, item in enumerate(value):
+                if isinstance(item, dict):
+                    pairs.extend(_encode_params(item, f"{name}[{index}]"))
+                else:
+                    pairs.append((f"{name}[]", str(item)))
+        elif isinstance(value, bool):
+            pairs.append((name, "true" if value else "false"))
+        else:
+            pairs.append((name, str(value)))
+    return pairs
+
+
+class StripeGateway:
+    """Minimal async Stripe API client"""
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://api.stripe.com",
+        timeout: float = 10.0,
+        max_retries: int = 2,
+        max_connections: int = 20,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.max_connections = max_connections
+        self._client: Optional[httpx.AsyncClient] = None
+        self.requests = 0
+        self.retries = 0
+        self.errors = 0
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                auth=(self.api_key, ""),
+                headers={"Stripe-Version": settings.STRIPE_API_VERSION},
+                timeout=httpx.Timeout(self.timeout, connect=min(self.timeout, 5.0)),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=60.0,
+                ),
+            )
+        return self._client
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Call the API and return the decoded JSON object"""
+        if not self.api_key:
+            raise StripeError("Stripe is not configured - missing STRIPE_SECRET_KEY")
+
+        encoded = _encode_params(params or {})
+        headers = {}
+        if method == "POST":
+            # The same key on every attempt lets Stripe drop duplicates
+            headers["Idempotency-Key"] = idempotency_key or str(uuid.uuid4())
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+            request_kwargs = {"content": urlencode(encoded)}
+        else:
+            request_kwargs = {"params": encoded}
+
+        client = self._get_client()
+        for attempt in range(self.max_retries + 1):
+            self.requests += 1
+            try:
+                response = await client.request(method, path, headers=headers, **request_kwargs)
+            except httpx.TransportError as e:
+                if attempt < self.max_retries:
+                    await self._backoff(attempt)
+                    continue
+                self.errors += 1
+                raise StripeError(f"Stripe request failed: {e}") from e
+
+            if response.status_code < 400:
+                return response.json()
+
+            should_retry = response.headers.get("stripe-should-retry")
+            retryable = (
+                should_retry == "true"
+                or (should_retry is None and response.status_code in RETRYABLE_STATUS_CODES)
+            )
+            if retryable and attempt < self.max_retries:
+                await self._backoff(attempt, response.headers.get("retry-after"))
+                continue
+
+            self.errors += 1
+            raise self._error(response)
+
+    async def _backoff(self, attempt: int, retry_after: Optional[str] = None):
+        self.retries += 1
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = min(0.5 * 2 ** attempt, 8.0) * random.uniform(0.5, 1.0)
+        await asyncio.sleep(delay)
+
+    @staticmethod
+    def _error(response: httpx.Response) -> StripeError:
+        try:
+            error = response.json().get("error", {})
+        except ValueError:
+            error = {}
+        message = error.get("message") or f"Stripe API error ({response.status_code})"
+        return StripeError(message, status_code=response.status_code, code=error.get("code"))
+
+    async def create_payment_intent(
+        self,
+        amount: int,
+        currency: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        return await self.request(
+            "POST",
+            "/v1/payment_intents",
+            {"amount": amount, "currency": currency, "metadata": metadata},
+            idempotency_key=idempotency_key,
+        )
+
+    async def list_customers(self, email: str, limit: int = 1) -> List[Dict[str, Any]]:
+        result = await self.request("GET", "/v1/customers", {"email": email, "limit": limit})
+        return result["data"]
+
+    async def create_customer(
+        self,
+        email: str,
+        name: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        return await self.request(
+            "POST",
+            "/v1/customers",
+            {"email": email, "name": name, "metadata": metadata},
+            idempotency_key=idempotency_key,
+        )
+
+    async def list_payment_methods(self, customer_id: str, type: str = "card") -> List[Dict[str, Any]]:
+        result = await self.request("GET", "/v1/payment_methods", {"customer": customer_id, "type": type})
+        return result["data"]
+
+    async def close(self):
+        """Close pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"requests": self.requests, "retries": self.retries, "errors": self.errors}
+
+
+# Global gateway instance
+stripe_gateway = StripeGateway(
+    api_key=settings.STRIPE_SECRET_KEY,
+    base_url=settings.STRIPE_API_BASE,
+    timeout=settings.STRIPE_TIMEOUT_SECONDS,
+    max_retries=settings.STRIPE_MAX_RETRIES,
+    max_connections=settings.STRIPE_MAX_CONNECTIONS,
+)
@@ -0,0 +1,263 @@
+"""
+Stripe webhook ingestion and processing
+
+The webhook endpoint only verifies the signature and appends the event to
+stripe_webhook_events; the unique event ID makes Stripe's redeliveries a
+no-op. WebhookProcessor drains the table in batches off the request path:
+claimed events are handled one at a time in arrival order, failures are
+retried with exponential backoff, and events that keep failing are
+parked as dead for inspection.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import structlog
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.webhook_event import StripeWebhookEvent, WebhookEventStatus
+from app.services.stripe_customers import sync_from_event
+
+logger = structlog.get_logger(__name__)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _aware(value: datetime) -> datetime:
+    # SQLite hands timestamps back without a zone
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+async def handle_event(db: AsyncSession, event: Dict[str, Any]):
+    """Apply one Stripe event; raising marks it for retry
+
+    Customer and payment method events update the customer mapping and
+    the payment method cache. There is no local payments table, so
+    payment_intent.succeeded is only logged: Stripe remains the record of
+    payment status, and the stored event row keeps the full payload.
+    """
+    event_type = event["type"]
+    data = event.get("data") or {}
+    obj = data.get("object") or {}
+
+    await sync_from_event(db, event_type, obj, data.get("previous_attributes"))
+
+    if event_type == "payment_intent.succeeded":
+        logger.info(
+            "Payment succeeded",
+            payment_intent_id=obj.get("id"),
+            amount=obj.get("amount"),
+            currency=obj.get("currency"),
+            user_id=(obj.get("metadata") or {}).get("user_id"),
+        )
+
+
+class WebhookProcessor:
+    """Drains stored webhook events in batches"""
+
+    def __init__(
+        self,
+        batch_size: int,
+        max_attempts: int,
+        poll_interval: float,
+        retry_base_seconds: float,
+        claim_timeout_seconds: float,
+    ):
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.retry_base_seconds = retry_base_seconds
+        self.claim_timeout_seconds = claim_timeout_seconds
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.started = time.monotonic()
+        self.ingested = 0
+        self.duplicates = 0
+        self.processed = 0
+        self.retried = 0
+        self.dead = 0
+        self.lag_total_ms = 0.0
+        self.lag_max_ms = 0.0
+        self.last_lag_ms: Optional[float] = None
+
+    async def ingest(self, db: AsyncSession, event: Dict[str, Any]) -> bool:
+        """Store a verified event; False if it was already received"""
+        db.add(StripeWebhookEvent(
+            event_id=event["id"],
+            event_type=event["type"],
+            payload=event,
+            status=WebhookEventStatus.PENDING.value,
+            next_attempt_at=_utcnow(),
+        ))
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            self.duplicates += 1
+            return False
+        self.ingested += 1
+        self.notify()
+        return True
+
+    def notify(self):
+        """Wake the drain loop early"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _claim(self) -> List[StripeWebhookEvent]:
+        now = _utcnow()
+        stale = now - timedelta(seconds=self.claim_timeout_seconds)
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(StripeWebhookEvent)
+                .where(or_(
+                    and_(
+                        StripeWebhookEvent.status == WebhookEventStatus.PENDING.value,
+                        StripeWebhookEvent.next_attempt_at <= now,
+                    ),
+                    # Claimed by a worker that died mid-batch
+                    and_(
+                        StripeWebhookEvent.status == WebhookEventStatus.PROCESSING.value,
+                        StripeWebhookEvent.claimed_at < stale,
+                    ),
+                ))
+                .order_by(StripeWebhookEvent.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            events = list(result.scalars().all())
+            for event in events:
+                event.status = WebhookEventStatus.PROCESSING.value
+                event.claimed_at = now
+                event.attempts += 1
+            await db.commit()
+        return events
+
+    async def _process_one(self, event: StripeWebhookEvent):
+        try:
+            async with AsyncSessionLocal() as db:
+                await handle_event(db, event.payload)
+            error = None
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+
+        now = _utcnow()
+        async with AsyncSessionLocal() as db:
+            row = await db.get(StripeWebhookEvent, event.id)
+            row.claimed_at = None
+            if error is None:
+                row.status = WebhookEventStatus.PROCESSED.value
+                row.processed_at = now
+                row.last_error = None
+                self.processed += 1
+                lag_ms = (now - _aware(event.created_at)).total_seconds() * 1000
+                self.last_lag_ms = lag_ms
+                self.lag_total_ms += lag_ms
+                self.lag_max_ms = max(self.lag_max_ms, lag_ms)
+            elif event.attempts >= self.max_attempts:
+                row.status = WebhookEventStatus.DEAD.value
+                row.last_error = error
+                self.dead += 1
+                logger.error("Stripe webhook event dead-lettered", event_id=event.event_id, error=error)
+            else:
+                delay = min(self.retry_base_seconds * 2 ** (event.attempts - 1), 3600)
+                row.status = WebhookEventStatus.PENDING.value
+                row.next_attempt_at = now + timedelta(seconds=delay)
+                row.last_error = error
+                self.retried += 1
+                logger.warning(
+                    "Stripe webhook event failed; will retry",
+                    event_id=event.event_id,
+                    attempt=event.attempts,
+                    retry_in_seconds=delay,
+                    error=error,
+                )
+            await db.commit()
+
+    async def process_batch(self) -> int:
+        """Claim and handle one batch; returns the number of events handled"""
+        events = await self._claim()
+        for event in events:
+            await self._process_one(event)
+        return len(events)
+
+    async def run(self):
+        """Drain continuously until cancelled"""
+        self._wakeup = asyncio.Event()
+        while True:
+            try:
+                handled = await self.process_batch()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Stripe webhook drain failed", error=str(e))
+                handled = 0
+            if handled == self.batch_size:
+                continue
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        """Run the drain loop as a background task"""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def stats(self, db: AsyncSession) -> Dict[str, Any]:
+        """Throughput counters plus the current backlog from the table"""
+        result = await db.execute(
+            select(StripeWebhookEvent.status, func.count()).group_by(StripeWebhookEvent.status)
+        )
+        backlog = {status: count for status, count in result.all()}
+        oldest_pending = (await db.execute(
+            select(func.min(StripeWebhookEvent.created_at))
+            .where(StripeWebhookEvent.status == WebhookEventStatus.PENDING.value)
+        )).scalar()
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return {
+            "ingested": self.ingested,
+            "duplicates": self.duplicates,
+            "processed": self.processed,
+            "retried": self.retried,
+            "dead": self.dead,
+            "ingested_per_second": round(self.ingested / elapsed, 3),
+            "processed_per_second": round(self.processed / elapsed, 3),
+            "lag_ms": {
+                "last": round(self.last_lag_ms, 1) if self.last_lag_ms is not None else None,
+                "avg": round(self.lag_total_ms / self.processed, 1) if self.processed else None,
+                "max": round(self.lag_max_ms, 1),
+            },
+            "backlog": backlog,
+            "oldest_pending_age_seconds": (
+                round((_utcnow() - _aware(oldest_pending)).total_seconds(), 1) if oldest_pending else None
+            ),
+        }
+
+
+# Global processor instance
+webhook_processor = WebhookProcessor(
+    batch_size=settings.STRIPE_WEBHOOK_BATCH_SIZE,
+    max_attempts=settings.STRIPE_WEBHOOK_MAX_ATTEMPTS,
+    poll_interval=settings.STRIPE_WEBHOOK_POLL_SECONDS,
+    retry_base_seconds=settings.STRIPE_WEBHOOK_RETRY_BASE_SECONDS,
+    claim_timeout_seconds=settings.STRIPE_WEBHOOK_CLAIM_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,3 @@
+"""
+Background workers and batch jobs
+"""
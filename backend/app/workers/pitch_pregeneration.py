@@ -0,0 +1,208 @@
+"""
+Batch pitch pre-generation
+
+Walks every business domain in keyset-ordered chunks, builds its business
+intelligence from the latest intelligence bundle and generates a marketing
+pitch into the persistent pitch cache. Progress is checkpointed after each
+chunk, so an interrupted run resumes where it stopped.
+
+Usage:
+    python -m app.workers.pitch_pregeneration [--chunk-size 200] [--concurrency 8]
+        [--checkpoint .pitch_pregeneration.json] [--force] [--restart]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+import openai
+import structlog
+
+from app.core.database import AsyncSessionLocal, create_tables
+from app.core.logging import setup_logging
+from app.services.business_intelligence import (
+    build_business_intelligence,
+    fetch_domain_page,
+    fetch_latest_bundles,
+)
+from app.services.pitch import pitch_service
+
+logger = structlog.get_logger(__name__)
+
+AGENT_NAME = "Forge Assistant"
+
+
+class RateLimitGate:
+    """Pauses every worker once the API reports a rate limit"""
+
+    def __init__(self):
+        self._resume_at = 0.0
+
+    async def wait(self):
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def backoff(self, seconds: float):
+        self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+
+class PregenerationStats:
+    """Throughput counters for a pre-generation run"""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.tokens_at_start = pitch_service.tokens_used
+        self.domains = 0
+        self.generated = 0
+        self.skipped = 0
+        self.failed = 0
+        self.rate_limited = 0
+
+    def report(self) -> Dict[str, Any]:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        tokens = pitch_service.tokens_used - self.tokens_at_start
+        return {
+            "domains": self.domains,
+            "generated": self.generated,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "rate_limited": self.rate_limited,
+            "elapsed_seconds": round(elapsed, 1),
+            "domains_per_second": round(self.domains / elapsed, 2),
+            "tokens": tokens,
+            "tokens_per_second": round(tokens / elapsed, 1),
+        }
+
+
+def _retry_after(error: openai.RateLimitError) -> Optional[float]:
+    """Seconds the API asked us to wait, if it said"""
+    try:
+        return float(error.response.headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def _load_checkpoint(path: str) -> Optional[Any]:
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f).get("after_id")
+
+
+def _save_checkpoint(path: str, after_id: Any, stats: PregenerationStats):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"after_id": after_id, "stats": stats.report()}, f)
+    os.replace(tmp_path, path)
+
+
+async def _generate_one(
+    business_intelligence: Dict[str, Any],
+    semaphore: asyncio.Semaphore,
+    gate: RateLimitGate,
+    stats: PregenerationStats,
+    max_retries: int,
+):
+    """Generate one domain's pitch, backing off on rate limits"""
+    async with semaphore:
+        for attempt in range(max_retries + 1):
+            await gate.wait()
+            try:
+                await pitch_service.regenerate_pitch(business_intelligence, AGENT_NAME)
+                stats.generated += 1
+                return
+            except openai.RateLimitError as e:
+                stats.rate_limited += 1
+                gate.backoff(_retry_after(e) or min(2 ** attempt, 60))
+            except Exception as e:
+                logger.warning(
+                    "Pitch pre-generation attempt failed",
+                    domain_id=business_intelligence.get("domain_id"),
+                    attempt=attempt + 1,
+                    error=str(e),
+                )
+                await asyncio.sleep(min(2 ** attempt, 30))
+        stats.failed += 1
+
+
+async def run(
+    chunk_size: int = 200,
+    concurrency: int = 8,
+    checkpoint_path: str = ".pitch_pregeneration.json",
+    force: bool = False,
+    restart: bool = False,
+    max_retries: int = 3,
+) -> Dict[str, Any]:
+    """Pre-generate pitches for every business domain"""
+    if not pitch_service.is_available():
+        raise SystemExit("OPENAI_API_KEY is not configured")
+
+    create_tables()
+    after_id = None if restart else _load_checkpoint(checkpoint_path)
+    if after_id is not None:
+        logger.info("Resuming pitch pre-generation", after_id=after_id)
+
+    stats = PregenerationStats()
+    semaphore = asyncio.Semaphore(concurrency)
+    gate = RateLimitGate()
+
+    while True:
+        async with AsyncSessionLocal() as db:
+            domain_ids = await fetch_domain_page(db, after_id, chunk_size)
+            if not domain_ids:
+                break
+            bundles = await fetch_latest_bundles(db, domain_ids)
+
+        pending = []
+        for bundle in bundles:
+            business_intelligence = build_business_intelligence(bundle)
+            stats.domains += 1
+            if not force:
+                cached = await pitch_service.cache.get_entry(
+                    pitch_service.fingerprint(business_intelligence, AGENT_NAME)
+                )
+                if cached is not None:
+                    stats.skipped += 1
+                    continue
+            pending.append(_generate_one(business_intelligence, semaphore, gate, stats, max_retries))
+        await asyncio.gather(*pending)
+
+        after_id = domain_ids[-1]
+        _save_checkpoint(checkpoint_path, after_id, stats)
+        logger.info("Pitch pre-generation progress", after_id=after_id, **stats.report())
+
+    # A finished pass starts from the beginning next time; cached pitches are skipped
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    report = stats.report()
+    logger.info("Pitch pre-generation complete", **report)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate marketing pitches for all business domains")
+    parser.add_argument("--chunk-size", type=int, default=200, help="domains fetched per keyset page")
+    parser.add_argument("--concurrency", type=int, default=8, help="maximum concurrent LLM requests")
+    parser.add_argument("--checkpoint", default=".pitch_pregeneration.json", help="checkpoint file path")
+    parser.add_argument("--max-retries", type=int, default=3, help="retries per domain")
+    parser.add_argument("--force", action="store_true", help="regenerate pitches that are already cached")
+    parser.add_argument("--restart", action="store_true", help="ignore any existing checkpoint")
+    args = parser.parse_args()
+
+    setup_logging()
+    asyncio.run(run(
+        chunk_size=args.chunk_size,
+        concurrency=args.concurrency,
+        checkpoint_path=args.checkpoint,
+        force=args.force,
+        restart=args.restart,
+        max_retries=args.max_retries,
+    ))
+
+
+if __name__ == "__main__":
+    main()
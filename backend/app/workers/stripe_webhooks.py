@@ -0,0 +1,46 @@
+"""
+Stripe webhook drainer
+
+Processes stored Stripe webhook events outside the API process. Use it
+when the API runs with STRIPE_WEBHOOK_WORKER_ENABLED=false (the default on
+SQLite), or to drain a backlog once (--once).
+
+Usage:
+    python -m app.workers.stripe_webhooks [--once]
+"""
+
+import argparse
+import asyncio
+
+import structlog
+
+from app.core.database import AsyncSessionLocal, create_tables
+from app.core.logging import setup_logging
+from app.services.stripe_webhooks import webhook_processor
+
+logger = structlog.get_logger(__name__)
+
+
+async def run(once: bool = False):
+    """Drain the backlog once, or keep draining"""
+    create_tables()
+    if once:
+        while await webhook_processor.process_batch():
+            pass
+        async with AsyncSessionLocal() as db:
+            logger.info("Stripe webhook backlog drained", **await webhook_processor.stats(db))
+        return
+    await webhook_processor.run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Process stored Stripe webhook events")
+    parser.add_argument("--once", action="store_true", help="drain the current backlog and exit")
+    args = parser.parse_args()
+
+    setup_logging()
+    asyncio.run(run(once=args.once))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Load benchmark: sync Session vs AsyncSession inside async endpoints
+
+Mounts two copies of the business intelligence bundle lookup on the app:
+"before" runs it on a sync Session from get_db (as the endpoint used to),
+"after" awaits it on an AsyncSession from get_async_db. Each request also
+pays a simulated database round trip (--latency-ms, a SQLite function
+that sleeps inside the driver). /health runs alongside to show how much
+a blocked event loop delays cheap requests.
+
+On SQLite both modes share one connection, so the lookups themselves
+queue up either way; the difference shows in the /health column.
+
+Usage:
+    python tests/backend/bench_async_db.py [--concurrency 20] [--requests 400] [--latency-ms 2]
+
+Set BENCH_DATABASE_URL to run against Postgres instead (the latency
+function is then skipped and the real round trip is measured).
+"""
+
+import argparse
+import asyncio
+import time
+
+import bench_common
+from bench_common import ServerThread, report, run_concurrent, seed_bi_tables
+
+import httpx
+from fastapi import Depends
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.database import async_engine, create_tables, engine, get_async_db, get_db
+from app.main import app
+from app.services.business_intelligence import LATEST_BUNDLE_QUERY
+
+SQLITE = engine.url.get_backend_name() == "sqlite"
+ROUND_TRIP = text("SELECT bench_sleep(:ms)") if SQLITE else text("SELECT 1")
+
+
+def _add_sleep_function(dbapi_connection, connection_record):
+    dbapi_connection.create_function("bench_sleep", 1, lambda ms: time.sleep(ms / 1000) or 0)
+
+
+@app.get("/bench/before/{domain_id}")
+async def bundle_before(domain_id: int, db: Session = Depends(get_db)):
+    db.execute(ROUND_TRIP, {"ms": app.state.latency_ms})
+    row = db.execute(LATEST_BUNDLE_QUERY, {"domain_id": domain_id}).mappings().first()
+    return {"found": row is not None}
+
+
+@app.get("/bench/after/{domain_id}")
+async def bundle_after(domain_id: int, db: AsyncSession = Depends(get_async_db)):
+    await db.execute(ROUND_TRIP, {"ms": app.state.latency_ms})
+    row = (await db.execute(LATEST_BUNDLE_QUERY, {"domain_id": domain_id})).mappings().first()
+    return {"found": row is not None}
+
+
+async def run(base_url: str, mode: str, concurrency: int, requests: int):
+    limits = httpx.Limits(max_connections=concurrency + 2)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits) as client:
+        counter = 0
+
+        async def lookup():
+            nonlocal counter
+            counter += 1
+            response = await client.get(f"/bench/{mode}/{counter % 100 + 1}")
+            assert response.status_code == 200, response.text
+
+        async def health():
+            response = await client.get("/health")
+            assert response.status_code == 200
+
+        # Warm up connections and route resolution
+        await lookup()
+        lookups, health_checks = await asyncio.gather(
+            run_concurrent(lookup, concurrency, requests),
+            run_concurrent(health, 2, requests // 4),
+        )
+    report(f"{mode}: bundle lookup (c={concurrency})", lookups)
+    report(f"{mode}: /health alongside", health_checks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync vs async session load benchmark")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="simulated round trip (SQLite only)")
+    args = parser.parse_args()
+
+    if SQLITE:
+        seed_bi_tables()
+        event.listen(engine, "connect", _add_sleep_function)
+        event.listen(async_engine.sync_engine, "connect", _add_sleep_function)
+    create_tables()
+    app.state.latency_ms = args.latency_ms
+
+    print(f"Database: {engine.url.get_backend_name()}, simulated round trip {args.latency_ms}ms")
+    with ServerThread(app) as server:
+        for mode in ("before", "after"):
+            asyncio.run(run(server.url, mode, args.concurrency, args.requests))
+
+
+if __name__ == "__main__":
+    main()
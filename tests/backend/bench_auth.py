@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: cost of the get_current_user dependency
+
+Calls the dependency directly (no HTTP) for one signed-in user in three
+states: principal cached in this process, cached only in the shared
+cache (another worker served the user first), and nothing cached, which
+verifies the JWT and loads the user row on every call as the dependency
+did before principals were cached. Set BENCH_DATABASE_URL to time the
+uncached path against Postgres.
+
+Usage:
+    python tests/backend/bench_auth.py [--iterations 2000]
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Callable, List
+
+import bench_common
+from bench_common import report
+
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core.auth import get_current_user, shared_user_cache, user_cache
+from app.core.database import AsyncSessionLocal, SessionLocal, create_tables
+from app.core.security import create_access_token, token_cache
+from app.models.user import User
+
+EMAIL = "bench@example.com"
+
+
+async def measure(label: str, reset: Callable[[], object], iterations: int):
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=create_access_token(EMAIL))
+    samples: List[float] = []
+    async with AsyncSessionLocal() as db:
+        # Warm up the connection and the statement cache
+        await get_current_user(credentials, db)
+        for _ in range(iterations):
+            pending = reset()
+            if pending is not None:
+                await pending
+            started = time.perf_counter()
+            await get_current_user(credentials, db)
+            samples.append((time.perf_counter() - started) * 1e6)
+    report(label, samples, unit="us")
+
+
+def cold():
+    """Forget everything cached about the user and the token"""
+    user_cache.clear()
+    token_cache.clear()
+    return shared_user_cache.delete(EMAIL)
+
+
+async def run(iterations: int):
+    await measure("principal cached in process", lambda: None, iterations)
+    await measure("principal in shared cache only", user_cache.clear, iterations)
+    await measure("nothing cached (JWT verify + user row)", cold, iterations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Auth dependency microbenchmark")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    create_tables()
+    with SessionLocal() as db:
+        db.add(User(email=EMAIL, hashed_password="x", full_name="Bench User"))
+        db.commit()
+
+    asyncio.run(run(args.iterations))
+
+
+if __name__ == "__main__":
+    main()
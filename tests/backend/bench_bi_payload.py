@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark: business intelligence payload size and serialization time
+
+Seeds synthetic bundles carrying large blobs (--blob-kb per heavy column)
+and builds the response body for each domain two ways:
+
+  before  SELECT ib.*, the transform, the whole row as raw_data, and
+          FastAPI's default jsonable_encoder + json.dumps rendering
+  after   the projected columns, the transform, no raw_data, rendered
+          with orjson (what the endpoint does unless ?include=raw_data)
+
+Usage:
+    python tests/backend/bench_bi_payload.py [--domains 200] [--blob-kb 256]
+"""
+
+import argparse
+import asyncio
+import json
+import sqlite3
+import time
+from typing import List
+
+import bench_common
+from bench_common import SQLITE_PATH, report, seed_bi_tables
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.database import AsyncSessionLocal, engine
+from app.core.responses import json_dumps
+from app.services.business_intelligence import (
+    LATEST_BUNDLE_QUERY,
+    RAW_BUNDLE_QUERY,
+    build_business_intelligence,
+)
+
+HEAVY_COLUMNS = ("raw_html", "crawl_data")
+
+
+def seed(domains: int, blob_kb: int):
+    line = "Custom software development for growing teams\n"
+    summaries = json.dumps({"services": line * 20, "about": "x" * 2000})
+    seed_bi_tables(domains, bundle_extra={"content_summaries": summaries, "keyword_signals": json.dumps(["ai"] * 200)})
+    blob = ("<div>" + "lorem ipsum " * 80 + "</div>\n") * (blob_kb * 1024 // 1000)
+    con = sqlite3.connect(SQLITE_PATH)
+    for column in HEAVY_COLUMNS:
+        con.execute(f"ALTER TABLE intelligence_bundles ADD COLUMN {column} TEXT")
+        con.execute(f"UPDATE intelligence_bundles SET {column} = ?", (blob,))
+    con.commit()
+    con.close()
+
+
+async def measure(mode: str, domains: int):
+    build_ms: List[float] = []
+    render_ms: List[float] = []
+    sizes: List[int] = []
+    async with AsyncSessionLocal() as db:
+        for domain_id in range(1, domains + 1):
+            started = time.perf_counter()
+            query = RAW_BUNDLE_QUERY if mode == "before" else LATEST_BUNDLE_QUERY
+            row = dict((await db.execute(query, {"domain_id": domain_id})).mappings().first())
+            data = build_business_intelligence(row)
+            if mode == "before":
+                data["raw_data"] = row
+            built = time.perf_counter()
+            if mode == "before":
+                body = json.dumps(jsonable_encoder({"data": data, "marketing_pitch": None})).encode()
+            else:
+                body = json_dumps({"data": jsonable_encoder(data), "marketing_pitch": None})
+            rendered = time.perf_counter()
+            build_ms.append((built - started) * 1000)
+            render_ms.append((rendered - built) * 1000)
+            sizes.append(len(body))
+    report(f"{mode}: query + transform", build_ms)
+    report(f"{mode}: serialization", render_ms)
+    print(f"{mode}: payload {sum(sizes) / len(sizes) / 1024:.1f} KiB per domain")
+    return sum(sizes) / len(sizes), sum(render_ms) / len(render_ms)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BI payload size and serialization benchmark")
+    parser.add_argument("--domains", type=int, default=200)
+    parser.add_argument("--blob-kb", type=int, default=256, help="size of each heavy bundle column")
+    args = parser.parse_args()
+
+    if engine.url.get_backend_name() != "sqlite":
+        raise SystemExit("This benchmark seeds its own SQLite database; unset BENCH_DATABASE_URL")
+    seed(args.domains, args.blob_kb)
+
+    async def run():
+        before_size, before_render = await measure("before", args.domains)
+        after_size, after_render = await measure("after", args.domains)
+        print(f"payload {before_size / after_size:.0f}x smaller, serialization {before_render / after_render:.0f}x faster")
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
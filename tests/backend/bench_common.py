@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Shared setup for the backend benchmark scripts
+
+Import this before anything from the backend: it points the app at a
+throwaway SQLite database (unless BENCH_DATABASE_URL is set), puts the
+backend on sys.path and runs from the backend directory.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from typing import Awaitable, Callable, Dict, List
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'backend')
+sys.path.insert(0, BACKEND_DIR)
+# The app mounts ./static relative to the working directory
+os.chdir(BACKEND_DIR)
+
+BENCH_DIR = tempfile.mkdtemp(prefix="shortforge-bench-")
+SQLITE_PATH = os.path.join(BENCH_DIR, "bench.db")
+
+os.environ['DATABASE_URL'] = os.environ.get('BENCH_DATABASE_URL', f"sqlite:///{SQLITE_PATH}")
+os.environ.setdefault('POSTGRES_PASSWORD', 'dummy')
+os.environ.setdefault('SECRET_KEY', 'bench-secret-key')
+os.environ.setdefault('STRIPE_WEBHOOK_WORKER_ENABLED', 'false')
+# Keep per-statement log lines out of the timings
+os.environ.setdefault('SQL_INSTRUMENTATION_ENABLED', 'false')
+for key in list(os.environ.keys()):
+    if key.startswith('NEXT_PUBLIC_'):
+        del os.environ[key]
+
+# Configured before the app's setup_logging, which then leaves it alone;
+# request and info logs would otherwise dominate the timings
+logging.basicConfig(level=logging.WARNING)
+
+
+def seed_bi_tables(domains: int = 100, bundle_extra: Dict[str, str] = None):
+    """Create the externally managed BI tables in the bench SQLite file"""
+    extra = bundle_extra or {}
+    con = sqlite3.connect(SQLITE_PATH)
+    con.executescript("""
+    CREATE TABLE IF NOT EXISTS business_domains (id INTEGER PRIMARY KEY, domain TEXT);
+    CREATE TABLE IF NOT EXISTS intelligence_bundles (
+        id INTEGER PRIMARY KEY, domain_id INTEGER, created_at TEXT, lead_company TEXT,
+        lead_industry TEXT, llm_digest TEXT, lead_location TEXT, lead_name TEXT, lead_title TEXT,
+        content_summaries TEXT, keyword_signals TEXT, metadata_insights TEXT, online_presence TEXT
+    );
+    """)
+    con.executemany("INSERT INTO business_domains VALUES (?, ?)", [(i, f"domain{i}.com") for i in range(1, domains + 1)])
+    con.executemany(
+        "INSERT INTO intelligence_bundles VALUES (?, ?, '2024-01-01', ?, 'Software', ?, 'NYC', 'Jo', 'CEO', ?, ?, ?, ?)",
+        [
+            (
+                i, i, f"Company {i}", f"Company {i} builds software",
+                extra.get("content_summaries"), extra.get("keyword_signals"),
+                extra.get("metadata_insights"), extra.get("online_presence"),
+            )
+            for i in range(1, domains + 1)
+        ],
+    )
+    con.commit()
+    con.close()
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def report(label: str, samples: List[float], unit: str = "ms"):
+    """Print count, p50, p99 and max of latencies (in milliseconds unless unit says otherwise)"""
+    print(
+        f"{label:<44} n={len(samples):<6} p50={percentile(samples, 50):8.2f}{unit} "
+        f"p99={percentile(samples, 99):8.2f}{unit} max={max(samples):8.2f}{unit}"
+    )
+
+
+async def run_concurrent(call: Callable[[], Awaitable[None]], concurrency: int, total: int) -> List[float]:
+    """Run call total times from concurrency workers; returns per-call latencies in ms"""
+    samples: List[float] = []
+    remaining = total
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            await call()
+            samples.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples
+
+
+def timeit_us(fn: Callable[[], object], iterations: int) -> float:
+    """Mean cost of fn in microseconds"""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+class ServerThread:
+    """Serve an ASGI app with uvicorn on its own thread and event loop
+
+    Load generated from another loop sees the server's event loop stalls,
+    which an in-process ASGI transport would hide.
+    """
+
+    def __init__(self, app, port: int = 0):
+        import uvicorn
+
+        if not port:
+            with socket.socket() as probe:
+                probe.bind(("127.0.0.1", 0))
+                port = probe.getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, lifespan="off", log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def __enter__(self) -> "ServerThread":
+        self.thread.start()
+        while not self.server.started:
+            if not self.thread.is_alive():
+                raise RuntimeError("Benchmark server failed to start")
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark: streaming export of a large inquiries table
+
+Seeds --rows synthetic inquiries into SQLite and downloads
+/api/v1/inquiries/export over HTTP, discarding the body as it arrives.
+Reports throughput and the process's resident memory while streaming,
+which should stay flat whatever the table size. For comparison it also
+times one deprecated ?skip= page at the start and at the end of the
+table, the deep-OFFSET pattern the export replaces.
+
+Usage:
+    python tests/backend/bench_inquiry_export.py [--rows 1000000] [--format csv]
+"""
+
+import argparse
+import asyncio
+import resource
+import sqlite3
+import time
+
+import bench_common
+from bench_common import SQLITE_PATH, ServerThread
+
+import httpx
+
+from app.core.database import SessionLocal, create_tables, engine
+from app.core.security import create_access_token
+from app.main import app
+from app.models.user import User, UserRole
+
+ADMIN = "export-admin@example.com"
+
+
+def seed(rows: int):
+    con = sqlite3.connect(SQLITE_PATH)
+    batch = 50000
+    for start in range(0, rows, batch):
+        con.executemany(
+            "INSERT INTO inquiries (name, email, company, subject, message, status, service_interest, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, 'new', 'AI Agents', datetime('now'), datetime('now'))",
+            [
+                (f"Person {i}", f"person{i}@example.com", f"Company {i % 1000}", "Project enquiry",
+                 "We would like to discuss an automation project, ideally next quarter.")
+                for i in range(start, min(start + batch, rows))
+            ],
+        )
+    con.commit()
+    con.close()
+
+
+def rss_mib() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize() / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def export(base_url: str, headers, fmt: str):
+    samples = []
+    size = 0
+    lines = 0
+    started = time.perf_counter()
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, timeout=None) as client:
+        async with client.stream("GET", "/api/v1/inquiries/export", params={"format": fmt}) as response:
+            assert response.status_code == 200, response.status_code
+            async for chunk in response.aiter_bytes():
+                size += len(chunk)
+                lines += chunk.count(b"\n")
+                if len(samples) < lines // 50000:
+                    samples.append(rss_mib())
+    elapsed = time.perf_counter() - started
+    rows = lines - (1 if fmt == "csv" else 0)
+    print(f"export ({fmt}): {rows} rows, {size / 2**20:.0f} MiB in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s)")
+    if samples:
+        print(f"resident memory while streaming: {min(samples):.0f}-{max(samples):.0f} MiB over {len(samples)} samples")
+
+
+async def offset_pages(base_url: str, headers, rows: int):
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, timeout=None) as client:
+        for skip in (0, max(rows - 500, 0)):
+            started = time.perf_counter()
+            response = await client.get("/api/v1/inquiries/", params={"skip": skip, "limit": 500})
+            assert response.status_code == 200, response.status_code
+            print(f"one ?skip={skip} page of 500: {(time.perf_counter() - started) * 1000:.0f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inquiry export benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--format", choices=("csv", "ndjson"), default="csv")
+    args = parser.parse_args()
+
+    if engine.url.get_backend_name() != "sqlite":
+        raise SystemExit("This benchmark seeds its own SQLite database; unset BENCH_DATABASE_URL")
+    create_tables()
+    started = time.perf_counter()
+    seed(args.rows)
+    print(f"seeded {args.rows} inquiries in {time.perf_counter() - started:.1f}s")
+    with SessionLocal() as db:
+        db.add(User(email=ADMIN, hashed_password="!", full_name="Export Admin", role=UserRole.ADMIN.value))
+        db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(ADMIN)}"}
+
+    print(f"resident memory before: {rss_mib():.0f} MiB")
+    with ServerThread(app) as server:
+        asyncio.run(export(server.url, headers, args.format))
+        asyncio.run(offset_pages(server.url, headers, args.rows))
+
+
+if __name__ == "__main__":
+    main()
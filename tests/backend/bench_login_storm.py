@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Load benchmark: login storm vs /health tail latency
+
+Fires concurrent logins for one user while /health is polled alongside.
+"inline" mounts a copy of the login check that runs bcrypt on the event
+loop (as the endpoint used to); "pool" is the real /api/v1/auth/login,
+which hands bcrypt to the bounded process pool and answers 503 once
+PASSWORD_HASH_MAX_PENDING jobs are outstanding.
+
+Usage:
+    python tests/backend/bench_login_storm.py [--concurrency 50] [--requests 300]
+"""
+
+import argparse
+import asyncio
+from collections import Counter
+
+import bench_common
+from bench_common import ServerThread, report, run_concurrent
+
+import httpx
+from fastapi import Depends, HTTPException
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import SessionLocal, create_tables, get_async_db
+from app.core.security import get_password_hash, verify_password
+from app.main import app
+from app.models.user import User
+from app.services.password_hashing import password_hasher
+
+EMAIL = "storm@example.com"
+PASSWORD = "correct horse battery staple"
+
+
+@app.post("/bench/login-inline")
+async def login_inline(db: AsyncSession = Depends(get_async_db), form_data: OAuth2PasswordRequestForm = Depends()):
+    user = (await db.execute(select(User).where(User.email == form_data.username))).scalars().first()
+    if not user or not verify_password(form_data.password, user.hashed_password):
+        raise HTTPException(status_code=401)
+    return {"ok": True}
+
+
+async def run(base_url: str, mode: str, concurrency: int, requests: int):
+    path = "/bench/login-inline" if mode == "inline" else "/api/v1/auth/login"
+    statuses = Counter()
+    limits = httpx.Limits(max_connections=concurrency + 2)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+
+        async def login():
+            response = await client.post(path, data={"username": EMAIL, "password": PASSWORD})
+            statuses[response.status_code] += 1
+
+        async def health():
+            response = await client.get("/health")
+            assert response.status_code == 200
+
+        await login()
+        statuses.clear()
+        logins, health_checks = await asyncio.gather(
+            run_concurrent(login, concurrency, requests),
+            run_concurrent(health, 2, requests),
+        )
+    report(f"{mode}: login (c={concurrency})", logins)
+    report(f"{mode}: /health alongside", health_checks)
+    print(f"{mode}: login statuses {dict(sorted(statuses.items()))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Login storm benchmark")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+
+    create_tables()
+    with SessionLocal() as db:
+        db.add(User(email=EMAIL, hashed_password=get_password_hash(PASSWORD), full_name="Storm"))
+        db.commit()
+
+    print(f"bcrypt workers {password_hasher.max_workers}, max pending {password_hasher.max_pending}")
+    try:
+        with ServerThread(app) as server:
+            for mode in ("inline", "pool"):
+                asyncio.run(run(server.url, mode, args.concurrency, args.requests))
+    finally:
+        password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    main()
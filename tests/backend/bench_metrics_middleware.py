@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: per-request overhead of MetricsMiddleware
+
+Calls a minimal ASGI app (start + body messages, route recorded in the
+scope as the router would) directly on the event loop, bare and wrapped
+in MetricsMiddleware, and reports the difference per request. A mix of
+--routes route templates and a few status codes are cycled through so
+the counters and histograms have realistic series counts. Exits non-zero
+if the overhead is not below --budget-us.
+
+Usage:
+    python tests/backend/bench_metrics_middleware.py [--iterations 100000] [--routes 50] [--budget-us 50]
+"""
+
+import argparse
+import asyncio
+import itertools
+import sys
+import time
+from types import SimpleNamespace
+
+import bench_common
+
+from app.core.metrics import MetricsMiddleware
+
+START = {"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]}
+BODY = {"type": "http.response.body", "body": b"{}"}
+
+
+async def endpoint(scope, receive, send):
+    scope["route"] = scope["_route"]
+    await send({**START, "status": scope["_status"]})
+    await send(BODY)
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+async def per_request_us(app, scopes, iterations: int) -> float:
+    """Mean cost of one request through app in microseconds"""
+    cycle = itertools.cycle(scopes)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await app(dict(next(cycle)), receive, send)
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+async def run(iterations: int, routes: int, rounds: int = 5):
+    scopes = [
+        {
+            "type": "http",
+            "method": method,
+            "path": f"/api/v1/resource{i}/42",
+            "_route": SimpleNamespace(path=f"/api/v1/resource{i}/{{item_id}}"),
+            "_status": status,
+        }
+        for i, (method, status) in zip(range(routes), itertools.cycle([("GET", 200), ("POST", 201), ("GET", 404)]))
+    ]
+    wrapped = MetricsMiddleware(endpoint)
+    # Warm up both paths (and create every metric series)
+    await per_request_us(endpoint, scopes, iterations // 10)
+    await per_request_us(wrapped, scopes, iterations // 10)
+
+    # Best of several interleaved rounds, to keep scheduler noise out
+    bare = min([await per_request_us(endpoint, scopes, iterations) for _ in range(rounds)])
+    with_metrics = min([await per_request_us(wrapped, scopes, iterations) for _ in range(rounds)])
+    return bare, with_metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MetricsMiddleware overhead microbenchmark")
+    parser.add_argument("--iterations", type=int, default=100000)
+    parser.add_argument("--routes", type=int, default=50)
+    parser.add_argument("--budget-us", type=float, default=50.0)
+    args = parser.parse_args()
+
+    bare, with_metrics = asyncio.run(run(args.iterations, args.routes))
+    overhead = with_metrics - bare
+    print(f"{'bare ASGI app':<36} {bare:8.2f}us per request")
+    print(f"{'with MetricsMiddleware':<36} {with_metrics:8.2f}us per request")
+    print(f"{'middleware overhead':<36} {overhead:8.2f}us per request (budget {args.budget_us:.0f}us)")
+    if overhead >= args.budget_us:
+        print("FAIL: overhead over budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark: first page vs page 10,000 of the inquiry listing
+
+Seeds --rows inquiries and times GET /api/v1/inquiries/ for page 1 and
+page --page (of --limit rows), once following a keyset cursor and once
+with the deprecated ?skip= offset. Keyset pages should cost the same at
+any depth; an OFFSET page reads and discards every row before it.
+
+On SQLite the keyset order is on a normalised timestamp expression, so
+both strategies sort the table and the difference is smaller than on
+Postgres (set BENCH_DATABASE_URL), where the keyset page is an index
+range scan.
+
+Usage:
+    python tests/backend/bench_pagination.py [--rows 200000] [--limit 20] [--page 10000]
+"""
+
+import argparse
+import asyncio
+import sqlite3
+import time
+
+import bench_common
+from bench_common import SQLITE_PATH, ServerThread, report
+
+import httpx
+from sqlalchemy import select
+
+from app.core.database import SessionLocal, create_tables, engine
+from app.core.pagination import encode_cursor, paginate
+from app.core.security import create_access_token
+from app.main import app
+from app.models.inquiry import Inquiry
+from app.models.user import User, UserRole
+
+ADMIN = "pagination-admin@example.com"
+
+
+def seed(rows: int):
+    con = sqlite3.connect(SQLITE_PATH)
+    # Timestamps one second apart, in batches that share a second, in the
+    # format the application stores (models.base.current_timestamp)
+    con.executemany(
+        "INSERT INTO inquiries (name, email, subject, message, status, created_at, updated_at) "
+        "VALUES (?, ?, 'Hello', 'Hi', 'new', strftime('%Y-%m-%d %H:%M:%f000', '2024-01-01', ?), datetime('now'))",
+        [(f"Person {i}", f"p{i}@example.com", f"+{i // 3} seconds") for i in range(rows)],
+    )
+    con.commit()
+    con.close()
+
+
+def cursor_before_page(page: int, limit: int) -> str:
+    """Cursor of the last row on the page before `page`"""
+    with SessionLocal() as db:
+        query = paginate(select(Inquiry), Inquiry, None, 0).limit(1).offset((page - 1) * limit - 1)
+        row = db.execute(query).scalars().one()
+        return encode_cursor(row.created_at, row.id)
+
+
+async def measure(base_url: str, headers, label: str, params, repeat: int):
+    samples = []
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, timeout=None) as client:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            response = await client.get("/api/v1/inquiries/", params=params)
+            samples.append((time.perf_counter() - started) * 1000)
+            assert response.status_code == 200, response.text
+    report(label, samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keyset vs offset pagination benchmark")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--page", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    if args.page * args.limit > args.rows:
+        raise SystemExit("--page * --limit must not exceed --rows")
+
+    create_tables()
+    if engine.url.get_backend_name() == "sqlite":
+        seed(args.rows)
+    with SessionLocal() as db:
+        db.add(User(email=ADMIN, hashed_password="!", full_name="Pagination Admin", role=UserRole.ADMIN.value))
+        db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(ADMIN)}"}
+    deep_cursor = cursor_before_page(args.page, args.limit)
+
+    with ServerThread(app) as server:
+        cases = [
+            ("keyset: page 1", {"limit": args.limit}),
+            (f"keyset: page {args.page}", {"limit": args.limit, "cursor": deep_cursor}),
+            ("offset: page 1", {"limit": args.limit, "skip": 0}),
+            (f"offset: page {args.page}", {"limit": args.limit, "skip": (args.page - 1) * args.limit}),
+        ]
+        for label, params in cases:
+            asyncio.run(measure(server.url, headers, label, params, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
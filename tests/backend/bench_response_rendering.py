@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark: request throughput of the inquiry list and the business
+intelligence payload with orjson rendering vs FastAPI's default
+
+Serves the application next to a baseline app whose routes run the same
+queries but render the way the API did before ORJSONResponse and
+typed_response(): response_model validation, jsonable_encoder and
+stdlib json. Both are driven over HTTP by --concurrency clients:
+
+  inquiries  GET /api/v1/inquiries/?limit=--limit (admin)
+  bi         GET /api/v1/business-intelligence/domain/{id}?include=raw_data
+             cycling through --domains domains (pitches precomputed only,
+             so no LLM call is made)
+
+Usage:
+    python tests/backend/bench_response_rendering.py [--requests 2000] [--concurrency 16] [--limit 100]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import sqlite3
+import time
+from typing import Any, List, Optional
+
+import bench_common
+from bench_common import SQLITE_PATH, ServerThread, report, run_concurrent, seed_bi_tables
+
+# Serve stored pitches only: the benchmark measures rendering, not the LLM
+os.environ["PITCH_PRECOMPUTED_ONLY"] = "true"
+
+import httpx
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Query
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.auth import get_current_admin_user
+from app.core.database import SessionLocal, create_tables, engine, get_async_db
+from app.core.pagination import paginate
+from app.core.security import create_access_token
+from app.main import app
+from app.models.inquiry import Inquiry
+from app.models.user import User, UserRole
+from app.schemas.inquiry import Inquiry as InquirySchema
+from app.services.business_intelligence import fetch_raw_bundle, get_business_intelligence
+from app.services.pitch import pitch_service
+
+ADMIN = "rendering-admin@example.com"
+
+
+def baseline_app() -> FastAPI:
+    """The two routes with FastAPI's default response rendering"""
+    router = APIRouter()
+
+    @router.get("/api/v1/inquiries/", response_model=List[InquirySchema])
+    async def read_inquiries(
+        db: AsyncSession = Depends(get_async_db),
+        cursor: Optional[str] = None,
+        limit: int = Query(100, ge=1, le=500),
+        current_user=Depends(get_current_admin_user),
+    ) -> Any:
+        result = await db.execute(paginate(select(Inquiry), Inquiry, cursor, limit))
+        return result.scalars().all()[:limit]
+
+    @router.get("/api/v1/business-intelligence/domain/{domain_id}")
+    async def read_business_intelligence(
+        domain_id: str,
+        include: Optional[str] = None,
+        db: AsyncSession = Depends(get_async_db),
+    ) -> Any:
+        data = await get_business_intelligence(db, domain_id)
+        if not data:
+            raise HTTPException(status_code=404)
+        if include == "raw_data":
+            data = {**data, "raw_data": await fetch_raw_bundle(db, domain_id)}
+        pitch, meta = await pitch_service.get_precomputed_pitch(data, "Forge Assistant")
+        return {"data": data, "marketing_pitch": pitch.to_dict(), "pitch_meta": meta}
+
+    baseline = FastAPI(default_response_class=JSONResponse)
+    baseline.include_router(router)
+    return baseline
+
+
+def seed(rows: int, domains: int):
+    summaries = json.dumps({"services": "Custom software development\n" * 20, "about": "x" * 2000})
+    seed_bi_tables(domains, bundle_extra={"content_summaries": summaries, "keyword_signals": json.dumps(["ai"] * 200)})
+    con = sqlite3.connect(SQLITE_PATH)
+    con.executemany(
+        "INSERT INTO inquiries (name, email, company, subject, message, status, created_at, updated_at) "
+        "VALUES (?, ?, 'Acme', 'Hello', ?, 'new', strftime('%Y-%m-%d %H:%M:%f000', '2024-01-01', ?), datetime('now'))",
+        [(f"Person {i}", f"p{i}@example.com", "Tell me more. " * 20, f"+{i} seconds") for i in range(rows)],
+    )
+    con.commit()
+    con.close()
+
+
+def add_admin():
+    with SessionLocal() as db:
+        db.add(User(email=ADMIN, hashed_password="!", full_name="Rendering Admin", role=UserRole.ADMIN.value))
+        db.commit()
+
+
+async def measure(base_url: str, label: str, paths: List[str], requests: int, concurrency: int):
+    headers = {"Authorization": f"Bearer {create_access_token(ADMIN)}"}
+    cycle = itertools.cycle(paths)
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=None) as client:
+        async def call():
+            response = await client.get(next(cycle))
+            assert response.status_code == 200, response.text
+
+        # Warm the caches, connections and statement cache
+        await run_concurrent(call, concurrency, concurrency * 4)
+        started = time.perf_counter()
+        samples = await run_concurrent(call, concurrency, requests)
+        elapsed = time.perf_counter() - started
+    report(label, samples)
+    print(f"{'':<44} {requests / elapsed:8.0f} requests/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Response rendering throughput benchmark")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--domains", type=int, default=50)
+    args = parser.parse_args()
+
+    create_tables()
+    if engine.url.get_backend_name() == "sqlite":
+        seed(max(args.limit * 2, 1000), args.domains)
+    add_admin()
+
+    cases = [
+        ("inquiries", [f"/api/v1/inquiries/?limit={args.limit}"]),
+        ("bi", [f"/api/v1/business-intelligence/domain/{i}?include=raw_data" for i in range(1, args.domains + 1)]),
+    ]
+    with ServerThread(baseline_app()) as baseline, ServerThread(app) as current:
+        for name, paths in cases:
+            for label, server in (("default JSONResponse", baseline), ("orjson", current)):
+                asyncio.run(measure(server.url, f"{name}: {label}", paths, args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Stripe webhook ingestion throughput and processing lag
+
+Posts --events signed payment_intent.succeeded events to
+POST /api/v1/payments/webhook from --concurrency clients, twice:
+
+  backlog  the processor is stopped while events arrive, then started;
+           reports ingestion rate and how fast the backlog drains
+  live     the processor runs while events arrive; reports ingestion
+           rate and the lag from storing an event to processing it
+
+Redeliveries of the same events are posted at the end to time the
+duplicate path. Requests go through an in-process ASGI transport on the
+processor's event loop: the app's SQLite engine shares one connection,
+which cannot be used from two loops. That connection also cannot commit
+while another session has a statement in progress, so on SQLite the live
+phase alternates bursts of --concurrency events with one processor batch
+instead of running the drain loop alongside; set BENCH_DATABASE_URL to
+measure the real thing against Postgres.
+
+Usage:
+    python tests/backend/bench_stripe_webhooks.py [--events 500] [--concurrency 16]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import time
+from typing import List
+
+import bench_common
+from bench_common import report, run_concurrent
+
+os.environ["STRIPE_WEBHOOK_SECRET"] = "whsec_bench"
+
+import httpx
+
+from app.core.database import AsyncSessionLocal, create_tables, engine
+from app.main import app
+from app.services.stripe_webhooks import webhook_processor
+
+SECRET = os.environ["STRIPE_WEBHOOK_SECRET"]
+
+
+def signed_event(event_id: str) -> tuple:
+    """Body and Stripe-Signature header for a payment_intent.succeeded event"""
+    body = json.dumps({
+        "id": event_id,
+        "object": "event",
+        "type": "payment_intent.succeeded",
+        "created": int(time.time()),
+        "data": {"object": {"id": f"pi_{event_id}", "amount": 1000, "currency": "usd", "metadata": {"user_id": "1"}}},
+    })
+    timestamp = int(time.time())
+    signature = hmac.new(SECRET.encode(), f"{timestamp}.{body}".encode(), hashlib.sha256).hexdigest()
+    return body, f"t={timestamp},v1={signature}"
+
+
+async def post_events(client: httpx.AsyncClient, event_ids: List[str], concurrency: int) -> List[float]:
+    """Post every event once; returns the request latencies in ms"""
+    pending = iter(event_ids)
+
+    async def call():
+        body, signature = signed_event(next(pending))
+        response = await client.post(
+            "/api/v1/payments/webhook",
+            content=body,
+            headers={"Stripe-Signature": signature, "Content-Type": "application/json"},
+        )
+        assert response.status_code == 200, response.text
+
+    return await run_concurrent(call, concurrency, len(event_ids))
+
+
+def report_ingest(label: str, samples: List[float], elapsed: float):
+    report(label, samples)
+    print(f"{'':<44} {len(samples) / elapsed:8.0f} events/s ingested")
+
+
+async def drain(target: int, loop_running: bool):
+    """Wait until `target` events have been processed in total"""
+    while webhook_processor.processed < target:
+        if loop_running:
+            await asyncio.sleep(0.005)
+        else:
+            await webhook_processor.process_batch()
+
+
+async def run(events: int, concurrency: int):
+    # See the module docstring: on SQLite batches are run in between requests
+    concurrent = engine.url.get_backend_name() != "sqlite"
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        backlog_ids = [f"evt_backlog_{i}" for i in range(events)]
+        started = time.perf_counter()
+        samples = await post_events(client, backlog_ids, concurrency)
+        report_ingest("backlog: ingest (processor stopped)", samples, time.perf_counter() - started)
+
+        started = time.perf_counter()
+        if concurrent:
+            webhook_processor.start()
+        await drain(events, concurrent)
+        elapsed = time.perf_counter() - started
+        print(f"{'backlog: drain':<44} {events / elapsed:8.0f} events/s processed ({elapsed:.2f}s)")
+
+        webhook_processor.lag_total_ms = webhook_processor.lag_max_ms = 0.0
+        live_ids = [f"evt_live_{i}" for i in range(events)]
+        if concurrent:
+            started = time.perf_counter()
+            samples = await post_events(client, live_ids, concurrency)
+            report_ingest("live: ingest (processor running)", samples, time.perf_counter() - started)
+        else:
+            samples, elapsed = [], 0.0
+            for start in range(0, events, concurrency):
+                started = time.perf_counter()
+                samples += await post_events(client, live_ids[start:start + concurrency], concurrency)
+                elapsed += time.perf_counter() - started
+                await webhook_processor.process_batch()
+            report_ingest("live: ingest (bursts + batches)", samples, elapsed)
+        await drain(2 * events, concurrent)
+        print(
+            f"{'live: store -> processed lag':<44} avg={webhook_processor.lag_total_ms / events:8.1f}ms "
+            f"max={webhook_processor.lag_max_ms:8.1f}ms"
+        )
+
+        redelivered = backlog_ids[:events // 4]
+        started = time.perf_counter()
+        samples = await post_events(client, redelivered, concurrency)
+        report_ingest("redeliveries (duplicates)", samples, time.perf_counter() - started)
+        await webhook_processor.stop()
+
+    async with AsyncSessionLocal() as db:
+        stats = await webhook_processor.stats(db)
+    print(f"processed={stats['processed']} duplicates={stats['duplicates']} backlog={stats['backlog']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stripe webhook ingestion benchmark")
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    create_tables()
+    asyncio.run(run(args.events, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Shared fixtures for the backend pytest suite
+
+Importing bench_common points the app at a throwaway SQLite database and
+puts the backend on sys.path, exactly as for the benchmark scripts.
+"""
+
+import asyncio
+import json
+import threading
+from typing import Any, Dict
+
+import bench_common
+from bench_common import SQLITE_PATH, ServerThread, seed_bi_tables
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.core.database import SessionLocal, create_tables
+from app.core.security import create_access_token
+from app.main import app
+from app.models.user import User, UserRole
+
+# Standalone scripts (run by run_tests.py), not pytest modules
+collect_ignore = ["test_bi_endpoint.py", "test_real_db.py"]
+
+create_tables()
+
+PITCH = {
+    "headline": "Grow faster with AI",
+    "subheadline": "Automation tailored to your team",
+    "key_benefits": ["Fewer manual steps", "Faster answers"],
+    "call_to_action": "Talk to Forge Assistant",
+    "personalized_insights": ["You ship software", "Your customers expect speed"],
+    "social_proof": "Trusted by growing teams",
+}
+
+
+class FakeLLM:
+    """OpenAI-compatible chat completions endpoint with a call counter
+
+    Answers every request with the JSON of `content` after `delay`
+    seconds; streamed requests get it in `chunk_size` character deltas,
+    `chunk_delay` seconds apart.
+    """
+
+    def __init__(self):
+        self.app = Starlette(routes=[Route("/v1/chat/completions", self.completions, methods=["POST"])])
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.completed = 0
+        self.content = json.dumps(PITCH)
+        self.delay = 0.0
+        self.chunk_size = 16
+        self.chunk_delay = 0.0
+
+    async def completions(self, request: Request):
+        body = await request.json()
+        with self._lock:
+            self.calls += 1
+        await asyncio.sleep(self.delay)
+        if body.get("stream"):
+            return StreamingResponse(self._stream(), media_type="text/event-stream")
+        with self._lock:
+            self.completed += 1
+        return JSONResponse({
+            "id": "chatcmpl-test",
+            "object": "chat.completion",
+            "created": 0,
+            "model": body["model"],
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": self.content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 10, "total_tokens": 20},
+        })
+
+    async def _stream(self):
+        for start in range(0, len(self.content), self.chunk_size):
+            chunk = {
+                "id": "chatcmpl-test",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": "gpt-4o-mini",
+                "choices": [{"index": 0, "delta": {"content": self.content[start:start + self.chunk_size]}, "finish_reason": None}],
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+            await asyncio.sleep(self.chunk_delay)
+        with self._lock:
+            self.completed += 1
+        yield "data: [DONE]\n\n"
+
+
+def make_user(email: str, role: str = UserRole.CLIENT.value) -> Dict[str, str]:
+    """Create a user (if missing) and return bearer headers for it"""
+    with SessionLocal() as db:
+        if db.query(User).filter(User.email == email).first() is None:
+            db.add(User(email=email, hashed_password="!", full_name=email.split("@")[0], role=role))
+            db.commit()
+    return {"Authorization": f"Bearer {create_access_token(email)}"}
+
+
+@pytest.fixture(scope="session")
+def client() -> TestClient:
+    """Client for the app (without its lifespan: no background workers)"""
+    return TestClient(app)
+
+
+@pytest.fixture(scope="session")
+def admin_headers() -> Dict[str, str]:
+    return make_user("admin@example.com", UserRole.ADMIN.value)
+
+
+@pytest.fixture(scope="session")
+def user_headers() -> Dict[str, str]:
+    return make_user("client@example.com")
+
+
+@pytest.fixture(scope="session")
+def bi_tables():
+    """Path of the SQLite database, with 100 domains and one bundle each"""
+    seed_bi_tables(domains=100)
+    return SQLITE_PATH
+
+
+@pytest.fixture(scope="session")
+def fake_llm_server():
+    fake = FakeLLM()
+    with ServerThread(fake.app) as server:
+        fake.url = server.url
+        yield fake
+
+
+@pytest.fixture
+def fake_llm(fake_llm_server, monkeypatch) -> FakeLLM:
+    """A fresh FakeLLM that the OpenAI client is pointed at"""
+    fake_llm_server.reset()
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("OPENAI_BASE_URL", f"{fake_llm_server.url}/v1")
+    return fake_llm_server
+
+
+def business_intelligence(name: str, **extra: Any) -> Dict[str, Any]:
+    """Minimal business intelligence payload; distinct names get distinct pitch cache keys"""
+    return {"company_name": name, "industry": "Software", "description": f"{name} builds software", **extra}
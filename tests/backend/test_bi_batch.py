@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Bulk business intelligence endpoint: access control and cancellation
+
+Run with pytest (python -m pytest tests/backend) or directly.
+"""
+
+import asyncio
+import json
+import sys
+
+import pytest
+
+from app.api.v1.endpoints.business_intelligence import get_business_intelligence_batch
+from app.schemas.business_intelligence import BusinessIntelligenceBatchRequest
+from app.services.pitch import pitch_service
+
+URL = "/api/v1/business-intelligence/domains:batch"
+
+
+def test_batch_requires_an_admin(client, bi_tables, user_headers):
+    body = {"domain_ids": ["1"], "include_pitch": False}
+    assert client.post(URL, json=body).status_code == 403
+    assert client.post(URL, json=body, headers=user_headers).status_code == 403
+
+
+def test_batch_streams_ndjson_for_admins(client, bi_tables, admin_headers):
+    response = client.post(
+        URL, json={"domain_ids": ["3", "4", "3", "nope"], "include_pitch": False}, headers=admin_headers
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["domain_id"] for line in lines] == ["3", "4", "nope"]
+    assert lines[0]["data"]["domain"] == "domain3.com"
+    assert lines[2] == {"domain_id": "nope", "error": "not_found"}
+
+
+def test_disconnect_cancels_outstanding_pitches(fake_llm, bi_tables):
+    fake_llm.delay = 5
+    request = BusinessIntelligenceBatchRequest(domain_ids=[str(i) for i in range(20, 26)])
+
+    async def run():
+        response = await get_business_intelligence_batch(request=request, current_user=None)
+        first_line = asyncio.ensure_future(response.body_iterator.__anext__())
+        for _ in range(100):
+            if fake_llm.calls == 6:
+                break
+            await asyncio.sleep(0.02)
+        assert fake_llm.calls == 6
+        # What Starlette does when the client goes away mid-stream
+        first_line.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first_line
+        await asyncio.sleep(0.05)
+        return pitch_service._inflight.in_flight()
+
+    assert asyncio.run(run()) == 0
+    assert fake_llm.completed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Business intelligence read model refresh job
+
+Run with pytest (python -m pytest tests/backend) or directly.
+"""
+
+import asyncio
+import sqlite3
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+from app.core.cache import set_cache_backend
+from app.core.database import AsyncSessionLocal
+from app.models.business_intelligence import BusinessIntelligenceSnapshot
+from app.services.business_intelligence import get_business_intelligence
+from app.workers import bi_read_model
+
+
+def add_bundle(path, bundle_id, domain_id, created_at, company):
+    con = sqlite3.connect(path)
+    con.execute(
+        "INSERT INTO intelligence_bundles (id, domain_id, created_at, lead_company, lead_industry) VALUES (?, ?, ?, ?, 'Software')",
+        (bundle_id, domain_id, created_at, company),
+    )
+    con.commit()
+    con.close()
+
+
+async def snapshot_company(domain_id):
+    async with AsyncSessionLocal() as db:
+        snapshot = await db.get(BusinessIntelligenceSnapshot, str(domain_id))
+        return snapshot.payload["company_name"]
+
+
+def test_request_path_snapshots_do_not_advance_the_watermark(bi_tables, tmp_path):
+    checkpoint = str(tmp_path / "bi_read_model.json")
+    set_cache_backend(None)
+
+    async def run():
+        first = await bi_read_model.refresh(chunk_size=30, checkpoint_path=checkpoint)
+        assert first["mode"] == "full"
+        assert bi_read_model._load_checkpoint(checkpoint) == "2024-01-01"
+
+        # Two bundles land; a request rebuilds domain 2's snapshot (the
+        # newer bundle) before the refresh job runs
+        add_bundle(bi_tables, 1001, 1, "2024-02-01", "Renamed One")
+        add_bundle(bi_tables, 1002, 2, "2024-03-01", "Renamed Two")
+        set_cache_backend(None)
+        async with AsyncSessionLocal() as db:
+            await db.execute(BusinessIntelligenceSnapshot.__table__.delete().where(
+                BusinessIntelligenceSnapshot.domain_id == "2"
+            ))
+            await db.commit()
+            assert (await get_business_intelligence(db, 2))["company_name"] == "Renamed Two"
+
+        second = await bi_read_model.refresh(chunk_size=30, checkpoint_path=checkpoint)
+        assert second["mode"] == "incremental"
+        # Domain 1's bundle is older than the snapshot the request stored
+        assert await snapshot_company(1) == "Renamed One"
+        assert bi_read_model._load_checkpoint(checkpoint) == "2024-03-01"
+
+        third = await bi_read_model.refresh(chunk_size=30, checkpoint_path=checkpoint)
+        # Only bundles at the watermark timestamp are re-read
+        assert third["domains_refreshed"] == 1
+
+    asyncio.run(run())
+    set_cache_backend(None)
+
+
+def test_checkpoint_round_trips_datetimes(tmp_path):
+    checkpoint = str(tmp_path / "bi_read_model.json")
+    watermark = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+    bi_read_model._save_checkpoint(checkpoint, watermark, {})
+    assert bi_read_model._load_checkpoint(checkpoint) == watermark
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,259 @@
+"""
+SharedCache on both backends (in-process and Redis, via fakeredis) and
+its use by the auth, business intelligence and pitch caches
+"""
+
+import asyncio
+from typing import Callable
+
+import fakeredis
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import select
+
+from conftest import PITCH, make_user
+
+from app.core import auth
+from app.core.cache import CacheBackend, MemoryBackend, RedisBackend, SharedCache, set_cache_backend
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.instrumentation import QueryCounter
+from app.core.security import create_access_token
+from app.models.user import User
+from app.services.business_intelligence import bi_cache, get_business_intelligence, get_business_intelligence_many
+from app.services.pitch import MarketingPitch, PitchCache
+
+
+class FakeRedisBackend(RedisBackend):
+    """RedisBackend talking to an in-memory fakeredis server"""
+
+    def __init__(self, server: fakeredis.FakeServer):
+        self._client = fakeredis.aioredis.FakeRedis(server=server)
+
+
+class FailingBackend(CacheBackend):
+    name = "failing"
+
+    async def get_many(self, keys):
+        raise ConnectionError("cache down")
+
+    async def set_many(self, items, ttl):
+        raise ConnectionError("cache down")
+
+    async def delete(self, keys):
+        raise ConnectionError("cache down")
+
+
+def down_redis() -> CacheBackend:
+    server = fakeredis.FakeServer()
+    server.connected = False
+    return FakeRedisBackend(server)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request) -> Callable[[], CacheBackend]:
+    """Factory for a fresh backend; call it inside the test's event loop"""
+    if request.param == "memory":
+        factory = lambda: MemoryBackend(maxsize=1000)
+    else:
+        factory = lambda: FakeRedisBackend(fakeredis.FakeServer())
+    yield factory
+    set_cache_backend(None)
+
+
+def run_with(backend: Callable[[], CacheBackend], coro_fn):
+    async def run():
+        set_cache_backend(backend())
+        return await coro_fn()
+
+    return asyncio.run(run())
+
+
+def test_get_set_and_get_many(backend):
+    cache = SharedCache("test", ttl=60)
+
+    async def run():
+        assert await cache.get("a") is None
+        await cache.set("a", {"value": 1})
+        await cache.set_many([("b", [1, 2]), ("c", "three")])
+        assert await cache.get("a") == {"value": 1}
+        assert await cache.get_many(["a", "missing", "c", "b"]) == [{"value": 1}, None, "three", [1, 2]]
+        assert await cache.get_many([]) == []
+        await cache.delete("a", "b")
+        assert await cache.get_many(["a", "b", "c"]) == [None, None, "three"]
+
+    run_with(backend, run)
+    assert cache.stats()["errors"] == 0
+    assert (cache.hits, cache.misses) == (5, 4)
+
+
+def test_namespaces_are_separate(backend):
+    first, second = SharedCache("first", ttl=60), SharedCache("second", ttl=60)
+
+    async def run():
+        await first.set("key", 1)
+        return await second.get("key")
+
+    assert run_with(backend, run) is None
+
+
+def test_entries_expire(backend):
+    cache = SharedCache("test", ttl=60)
+
+    async def run():
+        await cache.set("short", 1, ttl=0.05)
+        await cache.set("long", 2)
+        assert await cache.get("short") == 1
+        await asyncio.sleep(0.1)
+        assert await cache.get_many(["short", "long"]) == [None, 2]
+        # A non-positive TTL is not stored at all
+        await cache.set("never", 3, ttl=0)
+        assert await cache.get("never") is None
+
+    run_with(backend, run)
+
+
+def test_counters_count_within_their_window(backend):
+    cache = SharedCache("test", ttl=60)
+
+    async def run():
+        counts = [await cache.incr("hits", ttl=0.2) for _ in range(3)]
+        await asyncio.sleep(0.1)
+        # Later increments do not extend the window
+        counts.append(await cache.incr("hits", ttl=0.2))
+        await asyncio.sleep(0.15)
+        counts.append(await cache.incr("hits", ttl=0.2))
+        return counts
+
+    assert run_with(backend, run) == [1, 2, 3, 4, 1]
+
+
+@pytest.mark.parametrize("broken", [FailingBackend, down_redis], ids=["memory", "redis"])
+def test_backend_errors_degrade_to_misses(broken):
+    cache = SharedCache("test", ttl=60)
+
+    async def run():
+        await cache.set("a", 1)
+        await cache.set_many([("b", 2)])
+        await cache.delete("a")
+        assert await cache.get("a") is None
+        assert await cache.get_many(["a", "b"]) == [None, None]
+        assert await cache.incr("a") is None
+
+    run_with(broken, run)
+    assert cache.errors == 6
+    assert cache.misses == 3
+
+
+def test_principal_is_served_from_the_shared_cache(backend):
+    make_user("cached@example.com")
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=create_access_token("cached@example.com"))
+
+    async def run():
+        auth.user_cache.clear()
+        async with AsyncSessionLocal() as db:
+            await auth.get_current_user(credentials, db)
+            assert await auth.shared_user_cache.get("cached@example.com") is not None
+            # Another worker: nothing in process, the shared entry saves the query
+            auth.user_cache.clear()
+            with QueryCounter() as queries:
+                principal = await auth.get_current_user(credentials, db)
+            assert principal.email == "cached@example.com"
+            assert queries.count == 0
+
+            auth.invalidate_cached_user("cached@example.com")
+            await asyncio.gather(*auth._pending_invalidations)
+            assert auth.user_cache.get("cached@example.com") is None
+            assert await auth.shared_user_cache.get("cached@example.com") is None
+
+    run_with(backend, run)
+
+
+def test_email_change_drops_the_principal_cached_under_the_old_address(backend, request):
+    before, after = (f"{state}-{request.node.callspec.id}@example.com" for state in ("before", "after"))
+    make_user(before)
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=create_access_token(before))
+
+    async def run():
+        auth.user_cache.clear()
+        async with AsyncSessionLocal() as db:
+            await auth.get_current_user(credentials, db)
+            assert auth.user_cache.get(before) is not None
+
+            user = (await db.execute(select(User).where(User.email == before))).scalars().one()
+            user.email = after
+            await db.commit()
+            await asyncio.gather(*auth._pending_invalidations)
+
+            assert auth.user_cache.get(before) is None
+            assert await auth.shared_user_cache.get(before) is None
+            # The old address no longer authenticates
+            with pytest.raises(HTTPException) as raised:
+                await auth.get_current_user(credentials, db)
+            assert raised.value.status_code == 401
+
+    run_with(backend, run)
+
+
+def test_principal_lifetime_in_process_is_short():
+    assert auth.user_cache.ttl == settings.AUTH_USER_LOCAL_TTL_SECONDS
+    assert auth.user_cache.ttl < auth.shared_user_cache.ttl
+
+
+def test_principal_ttl_follows_the_backend():
+    async def run(backend: CacheBackend):
+        set_cache_backend(backend)
+        return auth._shared_user_ttl()
+
+    assert asyncio.run(run(MemoryBackend(maxsize=10))) == settings.AUTH_USER_LOCAL_TTL_SECONDS
+    assert asyncio.run(run(FakeRedisBackend(fakeredis.FakeServer()))) == settings.AUTH_USER_CACHE_TTL_SECONDS
+    set_cache_backend(None)
+
+
+def test_business_intelligence_is_served_from_the_shared_cache(backend, bi_tables):
+    async def run():
+        async with AsyncSessionLocal() as db:
+            payload = await get_business_intelligence(db, 1)
+            with QueryCounter() as queries:
+                assert await get_business_intelligence(db, 1) == payload
+            assert queries.count == 0
+
+            hits = bi_cache.hits
+            many = await get_business_intelligence_many(db, [1, 2, 3])
+            assert bi_cache.hits == hits + 1
+            assert many["1"] == payload
+            with QueryCounter() as queries:
+                assert await get_business_intelligence_many(db, [1, 2, 3]) == many
+            assert queries.count == 0
+
+    run_with(backend, run)
+
+
+def test_pitch_is_shared_between_workers(backend):
+    pitch = MarketingPitch.from_dict(PITCH)
+
+    async def run():
+        # Two PitchCache instances stand in for two workers
+        writer, reader = PitchCache(), PitchCache()
+        await writer.set("shared-fingerprint", pitch, domain_id="shared-domain")
+        with QueryCounter() as queries:
+            cached = await reader.get_entry("shared-fingerprint")
+        assert cached.pitch.headline == PITCH["headline"]
+        assert queries.count == 0
+        assert reader.shared.hits == 1
+
+        await writer.invalidate_domain("shared-domain")
+        assert await reader.shared.get("shared-fingerprint") is None
+
+    run_with(backend, run)
+
+
+def test_pitch_shared_ttl_is_capped_on_the_memory_backend():
+    async def run(backend: CacheBackend):
+        set_cache_backend(backend)
+        return PitchCache()._shared_ttl(3600)
+
+    assert asyncio.run(run(MemoryBackend(maxsize=10))) == settings.PITCH_CACHE_LOCAL_TTL_SECONDS
+    assert asyncio.run(run(FakeRedisBackend(fakeredis.FakeServer()))) == 3600
+    set_cache_backend(None)
@@ -0,0 +1,222 @@
+"""
+Outgoing email against a local aiosmtpd server, and the public inquiry
+form's protections: no submitted text in the confirmation, per-address
+and per-IP limits (keyed on X-Forwarded-For only from a trusted proxy), and
+a stored inquiry even if its emails cannot be queued
+"""
+
+import asyncio
+import socket
+import threading
+import time
+from email import message_from_bytes
+from typing import Any, Dict, List, Tuple
+
+import httpx
+import pytest
+from aiosmtpd.controller import Controller
+
+from app.api.v1.endpoints import inquiries
+from app.core.cache import MemoryBackend, set_cache_backend
+from app.core.config import settings
+from app.core.proxy import ProxyHeadersMiddleware
+from app.main import app
+from app.services import email
+from app.services.email import EmailDispatcher, build_message, render
+
+SPAM = "Claim your prize at http://spam.example"
+URL = "/api/v1/inquiries/"
+
+
+class Collector:
+    """aiosmtpd handler keeping every accepted message"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.messages: List[Any] = []
+
+    async def handle_DATA(self, server, session, envelope):
+        with self._lock:
+            self.messages.append(message_from_bytes(envelope.content))
+        return "250 Message accepted for delivery"
+
+
+@pytest.fixture(scope="module")
+def smtp_server():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    collector = Collector()
+    controller = Controller(collector, hostname="127.0.0.1", port=port)
+    controller.start()
+    collector.port = port
+    yield collector
+    controller.stop()
+
+
+@pytest.fixture
+def smtp(smtp_server, monkeypatch) -> Collector:
+    monkeypatch.setattr(settings, "EMAILS_FROM_EMAIL", "hello@example.com")
+    smtp_server.messages.clear()
+    return smtp_server
+
+
+def dispatcher(smtp: Collector, **kwargs: Any) -> EmailDispatcher:
+    return EmailDispatcher("127.0.0.1", smtp.port, None, None, use_tls=False, **kwargs)
+
+
+def inquiry(**extra: Any) -> Dict[str, Any]:
+    return {"name": "Jo", "email": "jo@example.com", "subject": "Hello", "message": "Tell me more", **extra}
+
+
+@pytest.fixture
+def submissions(monkeypatch):
+    """Fresh submission counters, without the other email side effects"""
+    queued: List[Tuple[str, str, Dict[str, Any]]] = []
+
+    async def enqueue_email(to: str, template: str, context: Dict[str, Any]) -> bool:
+        queued.append((to, template, context))
+        return True
+
+    monkeypatch.setattr(email, "enqueue_email", enqueue_email)
+    set_cache_backend(MemoryBackend(maxsize=100))
+    yield queued
+    set_cache_backend(None)
+
+
+def test_dispatcher_throughput(smtp):
+    count = 500
+    messages = [build_message(f"user{i}@example.com", f"Message {i}", "Hello") for i in range(count)]
+    sender = dispatcher(smtp, pool_size=2, batch_size=50)
+
+    async def run():
+        try:
+            started = time.perf_counter()
+            await asyncio.gather(*(sender.send(message) for message in messages))
+            return time.perf_counter() - started
+        finally:
+            await sender.close()
+
+    elapsed = asyncio.run(run())
+
+    print(f"\n{count} messages over {sender.connects} SMTP connections: {count / elapsed:.0f} messages/s")
+    assert len(smtp.messages) == count
+    assert {message["Subject"] for message in smtp.messages} == {f"Message {i}" for i in range(count)}
+    assert sender.connects == 2
+    assert sender.batches < count / 10
+
+
+def test_confirmation_does_not_echo_submitted_text(smtp, submissions, client):
+    response = client.post(URL, json=inquiry(name=SPAM, subject=SPAM, message=SPAM))
+    assert response.status_code == 200, response.text
+
+    (to, template, context), = submissions
+    assert (to, template) == ("jo@example.com", "inquiry_confirmation")
+    subject, body = render(template, context)
+    sender = dispatcher(smtp)
+
+    async def run():
+        try:
+            await sender.send(build_message(to, subject, body))
+        finally:
+            await sender.close()
+
+    asyncio.run(run())
+    (delivered,) = smtp.messages
+    assert delivered["To"] == "jo@example.com"
+    assert "spam.example" not in delivered.as_string()
+
+
+def test_notification_still_carries_the_inquiry(submissions, client, monkeypatch):
+    monkeypatch.setattr(settings, "INQUIRY_NOTIFICATION_EMAIL", "team@example.com")
+
+    client.post(URL, json=inquiry(message=SPAM))
+
+    to, template, context = submissions[-1]
+    assert (to, template) == ("team@example.com", "inquiry_notification")
+    assert SPAM in render(template, context)[1]
+
+
+def test_submissions_are_limited_per_address(submissions, client, monkeypatch):
+    monkeypatch.setattr(settings, "INQUIRY_RATE_LIMIT_PER_EMAIL", 2)
+
+    statuses = [client.post(URL, json=inquiry(email="Limit@example.com")).status_code for _ in range(2)]
+    # Case does not make a new address
+    rejected = client.post(URL, json=inquiry(email="limit@example.com"))
+
+    assert statuses == [200, 200]
+    assert rejected.status_code == 429
+    assert rejected.headers["retry-after"] == str(settings.INQUIRY_RATE_LIMIT_WINDOW_SECONDS)
+    assert client.post(URL, json=inquiry(email="other@example.com")).status_code == 200
+    assert len(submissions) == 3
+
+
+def test_submissions_are_limited_per_ip(submissions, client, monkeypatch):
+    monkeypatch.setattr(settings, "INQUIRY_RATE_LIMIT_PER_IP", 3)
+
+    statuses = [client.post(URL, json=inquiry(email=f"ip{i}@example.com")).status_code for i in range(4)]
+
+    assert statuses == [200, 200, 200, 429]
+
+
+def test_forged_forwarded_for_does_not_change_the_ip_bucket(submissions, client, monkeypatch):
+    monkeypatch.setattr(settings, "INQUIRY_RATE_LIMIT_PER_IP", 3)
+
+    # The test client is not a trusted proxy: its X-Forwarded-For is ignored
+    statuses = [
+        client.post(URL, json=inquiry(email=f"forged{i}@example.com"), headers={"X-Forwarded-For": f"203.0.113.{i}"})
+        .status_code
+        for i in range(4)
+    ]
+
+    assert statuses == [200, 200, 200, 429]
+
+
+def test_trusted_proxy_reports_the_client_ip(submissions, monkeypatch):
+    monkeypatch.setattr(settings, "INQUIRY_RATE_LIMIT_PER_IP", 2)
+    transport = httpx.ASGITransport(app=app, client=("127.0.0.1", 40000))
+
+    async def run():
+        async with httpx.AsyncClient(transport=transport, base_url="http://proxied") as proxied:
+            async def post(n: int, forwarded_for: str) -> int:
+                response = await proxied.post(
+                    URL, json=inquiry(email=f"proxied{n}@example.com"), headers={"X-Forwarded-For": forwarded_for}
+                )
+                return response.status_code
+
+            return [
+                await post(0, "198.51.100.1"),
+                await post(1, "198.51.100.1"),
+                # A client-written hop left of the real one does not help
+                await post(2, "203.0.113.9, 198.51.100.1"),
+                await post(3, "198.51.100.2"),
+            ]
+
+    assert asyncio.run(run()) == [200, 200, 429, 200]
+
+
+@pytest.mark.parametrize(
+    "trusted, host, expected",
+    [
+        ("127.0.0.1", "127.0.0.1", True),
+        ("127.0.0.1", "10.0.0.5", False),
+        ("10.0.0.0/8, 127.0.0.1", "10.0.0.5", True),
+        ("10.0.0.0/8", "testclient", False),
+        ("*", "203.0.113.9", True),
+    ],
+)
+def test_trusted_proxy_addresses(trusted, host, expected):
+    assert ProxyHeadersMiddleware(None, trusted).is_trusted(host) is expected
+
+
+def test_inquiry_is_stored_when_emails_cannot_be_queued(submissions, client, admin_headers, monkeypatch):
+    async def fail(inquiry):
+        raise RuntimeError("background_jobs insert failed")
+
+    monkeypatch.setattr(inquiries, "notify_inquiry_received", fail)
+
+    response = client.post(URL, json=inquiry(subject="Queue failure"))
+
+    assert response.status_code == 200, response.text
+    listed = client.get(URL, headers=admin_headers).json()
+    assert any(item["id"] == response.json()["id"] for item in listed)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Inquiry endpoints: keyset pagination and export
+
+Run with pytest (python -m pytest tests/backend) or directly.
+"""
+
+import csv
+import io
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, select
+
+from app.core.database import SessionLocal, engine
+from app.core.pagination import encode_cursor, paginate
+from app.models.inquiry import Inquiry
+
+LIST_URL = "/api/v1/inquiries/"
+EXPORT_URL = "/api/v1/inquiries/export"
+
+
+def add_inquiries(*overrides):
+    """Insert inquiries directly; returns their ids"""
+    with SessionLocal() as db:
+        inquiries = [
+            Inquiry(**{"name": "Ann", "email": "ann@example.com", "subject": "Hello", "message": "Hi", **fields})
+            for fields in overrides
+        ]
+        db.add_all(inquiries)
+        db.commit()
+        return [inquiry.id for inquiry in inquiries]
+
+
+def walk_pages(client, headers, params, limit):
+    """Ids from every page of the listing, following X-Next-Cursor"""
+    ids, pages, cursor = [], 0, None
+    while True:
+        page_params = {**params, "limit": limit}
+        if cursor:
+            page_params["cursor"] = cursor
+        response = client.get(LIST_URL, params=page_params, headers=headers)
+        assert response.status_code == 200, response.text
+        ids.extend(item["id"] for item in response.json())
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return ids, pages
+        assert pages < 1000, "cursor is not moving forward"
+
+
+def test_pages_have_no_overlap_and_no_gaps(client, admin_headers):
+    # Database-assigned timestamps (mostly shared) mixed with explicit ones,
+    # some in the same second and some with no fraction
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    explicit = [
+        {"status": "page-walk", "created_at": now + timedelta(microseconds=micro)}
+        for micro in (0, 0, 250000, 999999)
+    ] + [{"status": "page-walk", "created_at": now - timedelta(days=1)}]
+    expected = set(add_inquiries(*([{"status": "page-walk"}] * 40), *explicit))
+
+    for limit in (1, 3, 7, 50):
+        ids, pages = walk_pages(client, admin_headers, {"status": "page-walk"}, limit)
+        assert len(ids) == len(set(ids)), f"overlap at limit {limit}"
+        assert set(ids) == expected, f"gap at limit {limit}"
+        assert pages == -(-len(expected) // limit)
+
+
+@pytest.mark.parametrize(
+    "params, index",
+    [({}, "ix_inquiries_created_at_id"), ({"status": "new"}, "ix_inquiries_status_created_at_id")],
+)
+def test_pages_are_index_range_scans(params, index):
+    next_cursor = encode_cursor(datetime(2024, 1, 1, tzinfo=timezone.utc), 100)
+    query = select(Inquiry).filter_by(**params)
+
+    with engine.connect() as connection:
+        if connection.dialect.name != "sqlite":
+            pytest.skip("EXPLAIN QUERY PLAN is SQLite's")
+        plans = []
+
+        @event.listens_for(connection, "before_cursor_execute", retval=True)
+        def explain(conn, cursor, statement, parameters, context, executemany):
+            return "EXPLAIN QUERY PLAN " + statement, parameters
+
+        for page in (None, next_cursor):
+            plans.append(" / ".join(row[3] for row in connection.execute(paginate(query, Inquiry, page, 10))))
+
+    first, later = plans
+    # The index gives the order: no sort, and later pages seek to the cursor
+    assert f"USING INDEX {index}" in first and "TEMP B-TREE" not in first, first
+    assert f"SEARCH inquiries USING INDEX {index}" in later and "created_at<?" in later, later
+    assert "TEMP B-TREE" not in later, later
+
+
+def test_invalid_cursor_is_rejected(client, admin_headers):
+    response = client.get(LIST_URL, params={"cursor": "not-a-cursor"}, headers=admin_headers)
+    assert response.status_code == 400
+
+
+def test_csv_export_neutralises_formulas(client, admin_headers):
+    dangerous = ["=HYPERLINK(\"http://evil\")", "+1+1", "-2+3", "@SUM(A1)", "\tcmd", "\rcmd"]
+    ids = add_inquiries(
+        *({"name": value, "status": "formula-test"} for value in dangerous),
+        {"name": "Safe = fine", "status": "formula-test"},
+    )
+
+    response = client.get(EXPORT_URL, params={"status": "formula-test"}, headers=admin_headers)
+
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [int(row["id"]) for row in rows] == ids
+    assert [row["name"] for row in rows] == ["'" + value for value in dangerous] + ["Safe = fine"]
+
+
+def test_ndjson_export_keeps_values(client, admin_headers):
+    add_inquiries({"name": "=1+1", "status": "ndjson-test"})
+
+    response = client.get(EXPORT_URL, params={"status": "ndjson-test", "format": "ndjson"}, headers=admin_headers)
+
+    assert [json.loads(line)["name"] for line in response.text.splitlines()] == ["=1+1"]
+
+
+def test_export_requires_an_admin(client, user_headers):
+    assert client.get(EXPORT_URL, headers=user_headers).status_code == 403
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
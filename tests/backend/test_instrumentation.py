@@ -0,0 +1,72 @@
+"""
+Per-request SQL instrumentation: the Server-Timing header is opt-in and
+the request summary is only logged for requests that use enough of the
+database
+"""
+
+from typing import Any, Dict, List, Tuple
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.core import instrumentation
+from app.core.config import settings
+from app.core.instrumentation import QueryStatsMiddleware, current_query_stats
+
+
+class RecordingLogger:
+    def __init__(self):
+        self.calls: List[Tuple[str, str, Dict[str, Any]]] = []
+
+    def warning(self, event: str, **fields: Any):
+        self.calls.append(("warning", event, fields))
+
+    def info(self, event: str, **fields: Any):
+        self.calls.append(("info", event, fields))
+
+
+async def queries(request):
+    """Pretend to run `n` statements of `ms` milliseconds each"""
+    stats = current_query_stats()
+    for _ in range(int(request.query_params["n"])):
+        stats.record("SELECT 1", float(request.query_params["ms"]))
+    return PlainTextResponse("ok")
+
+
+@pytest.fixture
+def instrumented(monkeypatch):
+    log = RecordingLogger()
+    monkeypatch.setattr(instrumentation, "logger", log)
+    app = Starlette(routes=[Route("/queries", queries)])
+    app.add_middleware(QueryStatsMiddleware)
+    return TestClient(app), log
+
+
+def test_server_timing_is_off_by_default(instrumented):
+    client, _ = instrumented
+    response = client.get("/queries", params={"n": 3, "ms": 1})
+    assert "server-timing" not in response.headers
+
+
+def test_server_timing_when_enabled(instrumented, monkeypatch):
+    client, _ = instrumented
+    monkeypatch.setattr(settings, "SQL_SERVER_TIMING_ENABLED", True)
+    response = client.get("/queries", params={"n": 3, "ms": 1})
+    assert 'desc="3 queries"' in response.headers["server-timing"]
+
+
+def test_summary_only_logged_above_thresholds(instrumented, monkeypatch):
+    client, log = instrumented
+    monkeypatch.setattr(settings, "SQL_REQUEST_SUMMARY_MIN_DB_MS", 100.0)
+    monkeypatch.setattr(settings, "SQL_REQUEST_SUMMARY_MIN_QUERIES", 10)
+
+    client.get("/queries", params={"n": 3, "ms": 1})
+    assert log.calls == []
+
+    client.get("/queries", params={"n": 2, "ms": 60})
+    client.get("/queries", params={"n": 10, "ms": 0})
+    assert [(level, event) for level, event, _ in log.calls] == [("warning", "Request SQL summary")] * 2
+    assert [fields["queries"] for _, _, fields in log.calls] == [2, 10]
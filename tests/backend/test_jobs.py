@@ -0,0 +1,81 @@
+"""
+Persisted background jobs without the poll loop: it is off by default on
+SQLite, and leftover jobs are still picked up by a single recovery pass
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+import pytest
+
+from app.core.config import Settings
+from app.core.database import SessionLocal
+from app.core.jobs import JobRunner
+from app.models.job import BackgroundJob, JobStatus
+
+
+def runner(**kwargs) -> JobRunner:
+    return JobRunner(
+        default_concurrency=1,
+        max_attempts=1,
+        retry_base_seconds=0.0,
+        retry_max_seconds=0.0,
+        poll_interval=0.01,
+        claim_timeout_seconds=60.0,
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize(
+    "url, enabled",
+    [("sqlite:///./app.db", False), ("sqlite+aiosqlite:///./app.db", False), ("postgresql://u:p@db/app", True)],
+)
+def test_poll_loop_defaults_off_on_sqlite(url, enabled, monkeypatch):
+    monkeypatch.delenv("JOBS_POLL_ENABLED", raising=False)
+    assert Settings(DATABASE_URL=url).JOBS_POLL_ENABLED is enabled
+    assert Settings(DATABASE_URL=url, JOBS_POLL_ENABLED=True).JOBS_POLL_ENABLED is True
+
+
+def test_disabled_poll_loop_is_not_started():
+    async def run(jobs: JobRunner):
+        jobs.start()
+        started = jobs._poller is not None
+        await jobs.stop(timeout=1.0)
+        return started
+
+    assert asyncio.run(run(runner(poll_enabled=False))) is False
+    assert asyncio.run(run(runner(poll_enabled=True))) is True
+
+
+def test_leftover_jobs_are_recovered_without_polling():
+    seen: List[int] = []
+    jobs = runner(poll_enabled=False)
+
+    @jobs.task("leftover")
+    async def leftover(n: int):
+        seen.append(n)
+
+    with SessionLocal() as db:
+        row = BackgroundJob(
+            queue="default",
+            task="leftover",
+            payload={"n": 1},
+            status=JobStatus.PENDING.value,
+            max_attempts=1,
+            run_at=datetime.now(timezone.utc) - timedelta(seconds=1),
+        )
+        db.add(row)
+        db.commit()
+        row_id = row.id
+
+    async def run():
+        jobs.start()
+        recovered = await jobs.recover()
+        await jobs.stop(timeout=5.0)
+        return recovered
+
+    assert asyncio.run(run()) == 1
+    assert seen == [1]
+    with SessionLocal() as db:
+        assert db.get(BackgroundJob, row_id).status == JobStatus.SUCCEEDED.value
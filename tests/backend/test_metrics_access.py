@@ -0,0 +1,48 @@
+"""
+The /metrics endpoints are only served to admin users and to the scraper
+holding METRICS_TOKEN
+"""
+
+import pytest
+
+from app.core.config import settings
+
+ENDPOINTS = ["/metrics", "/metrics/db", "/metrics/auth", "/metrics/jobs", "/metrics/email", "/metrics/webhooks"]
+
+
+@pytest.fixture
+def metrics_token(monkeypatch) -> str:
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-token")
+    return "scrape-token"
+
+
+@pytest.mark.parametrize("path", ENDPOINTS)
+def test_anonymous_requests_are_rejected(client, path):
+    response = client.get(path)
+    assert response.status_code == 401
+    assert response.headers["www-authenticate"] == "Bearer"
+
+
+@pytest.mark.parametrize("path", ENDPOINTS)
+def test_non_admin_users_are_rejected(client, user_headers, path):
+    assert client.get(path, headers=user_headers).status_code == 403
+
+
+@pytest.mark.parametrize("path", ENDPOINTS)
+def test_admin_users_are_served(client, admin_headers, path):
+    assert client.get(path, headers=admin_headers).status_code == 200
+
+
+@pytest.mark.parametrize("path", ENDPOINTS)
+def test_metrics_token_is_accepted(client, metrics_token, path):
+    response = client.get(path, headers={"Authorization": f"Bearer {metrics_token}"})
+    assert response.status_code == 200
+
+
+def test_wrong_token_is_rejected(client, metrics_token):
+    assert client.get("/metrics", headers={"Authorization": "Bearer not-the-token"}).status_code == 401
+
+
+def test_token_is_not_accepted_when_unset(client):
+    assert settings.METRICS_TOKEN is None
+    assert client.get("/metrics", headers={"Authorization": "Bearer "}).status_code == 401
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Pitch generation request coalescing against a local fake LLM server
+
+Run with pytest (python -m pytest tests/backend) or directly.
+"""
+
+import asyncio
+import sys
+
+import pytest
+
+from conftest import PITCH, business_intelligence
+
+from app.services.pitch import PitchGenerationService, SingleFlight
+
+
+def test_concurrent_requests_make_one_upstream_call(fake_llm):
+    fake_llm.delay = 0.3
+    service = PitchGenerationService()
+    bi = business_intelligence("Coalesce Co")
+
+    async def run():
+        return await asyncio.gather(*(service.generate_pitch(bi) for _ in range(20)))
+
+    pitches = asyncio.run(run())
+
+    assert fake_llm.calls == 1
+    assert all(pitch.headline == PITCH["headline"] for pitch in pitches)
+    assert service._inflight.stats() == {"in_flight": 0, "leaders": 1, "followers": 19}
+
+
+def test_cancelled_follower_does_not_abort_leader(fake_llm):
+    fake_llm.delay = 0.3
+    service = PitchGenerationService()
+    bi = business_intelligence("Cancel Co")
+
+    async def run():
+        leader = asyncio.create_task(service.generate_pitch(bi))
+        await asyncio.sleep(0.05)
+        follower = asyncio.create_task(service.generate_pitch(bi))
+        await asyncio.sleep(0.05)
+        follower.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await follower
+        return await leader
+
+    pitch = asyncio.run(run())
+
+    assert pitch.headline == PITCH["headline"]
+    assert fake_llm.calls == 1
+    assert fake_llm.completed == 1
+
+
+def test_cancelled_leader_caller_leaves_generation_to_followers(fake_llm):
+    fake_llm.delay = 0.3
+    service = PitchGenerationService()
+    bi = business_intelligence("Handover Co")
+
+    async def run():
+        first = asyncio.create_task(service.generate_pitch(bi))
+        await asyncio.sleep(0.05)
+        second = asyncio.create_task(service.generate_pitch(bi))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    pitch = asyncio.run(run())
+
+    assert pitch.headline == PITCH["headline"]
+    assert fake_llm.calls == 1
+
+
+def test_work_is_cancelled_once_every_caller_leaves():
+    flight = SingleFlight()
+    outcome = {}
+
+    async def work():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            outcome["cancelled"] = True
+            raise
+
+    async def run():
+        callers = [asyncio.create_task(flight.do("key", work)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+
+    assert outcome == {"cancelled": True}
+    assert flight.in_flight() == 0
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
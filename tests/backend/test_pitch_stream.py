@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Streaming pitch generation against a local fake LLM server, and the
+incremental JSON parser it relies on
+
+Run with pytest (python -m pytest tests/backend) or directly.
+"""
+
+import asyncio
+import json
+import sys
+import time
+
+import pytest
+
+from conftest import PITCH, business_intelligence
+
+from app.services.pitch import IncrementalJSONObjectParser, PitchGenerationService
+
+
+async def collect(stream):
+    """Events from a stream_pitch call, each with its arrival time"""
+    started = time.perf_counter()
+    return [(time.perf_counter() - started, event) async for event in stream]
+
+
+def fields_of(events):
+    return {event["field"]: event["value"] for _, event in events if event["event"] == "pitch_field"}
+
+
+def test_stream_leader_and_followers_share_one_generation(fake_llm):
+    fake_llm.chunk_size = 8
+    fake_llm.chunk_delay = 0.01
+    service = PitchGenerationService()
+    bi = business_intelligence("Stream Share Co")
+
+    async def run():
+        leader = asyncio.create_task(collect(service.stream_pitch(bi)))
+        await asyncio.sleep(0.05)
+        follower = asyncio.create_task(collect(service.stream_pitch(bi)))
+        plain = asyncio.create_task(service.generate_pitch(bi))
+        return await leader, await follower, await plain
+
+    leader, follower, plain = asyncio.run(run())
+
+    assert fake_llm.calls == 1
+    for events in (leader, follower):
+        assert fields_of(events) == PITCH
+        assert events[-1][1] == {"event": "pitch", "pitch": PITCH, "source": "generated"}
+    assert plain.to_dict() == PITCH
+
+
+def test_stream_after_plain_generation_replays_its_fields(fake_llm):
+    fake_llm.delay = 0.2
+    service = PitchGenerationService()
+    bi = business_intelligence("Replay Co")
+
+    async def run():
+        plain = asyncio.create_task(service.generate_pitch(bi))
+        await asyncio.sleep(0.05)
+        return await collect(service.stream_pitch(bi)), await plain
+
+    events, _ = asyncio.run(run())
+
+    assert fake_llm.calls == 1
+    assert fields_of(events) == PITCH
+    assert events[-1][1]["source"] == "generated"
+
+
+def test_disconnected_leader_does_not_abort_follower(fake_llm):
+    fake_llm.chunk_size = 8
+    fake_llm.chunk_delay = 0.01
+    service = PitchGenerationService()
+    bi = business_intelligence("Disconnect Co")
+
+    async def run():
+        stream = service.stream_pitch(bi)
+        await stream.__anext__()
+        follower = asyncio.create_task(collect(service.stream_pitch(bi)))
+        await asyncio.sleep(0.02)
+        await stream.aclose()
+        return await follower
+
+    events = asyncio.run(run())
+
+    assert fake_llm.calls == 1
+    assert events[-1][1] == {"event": "pitch", "pitch": PITCH, "source": "generated"}
+
+
+def test_time_to_first_meaningful_byte(fake_llm):
+    # About 40 deltas 20ms apart: the full completion takes ~0.8s
+    fake_llm.chunk_size = 8
+    fake_llm.chunk_delay = 0.02
+    service = PitchGenerationService()
+
+    events = asyncio.run(collect(service.stream_pitch(business_intelligence("Latency Co"))))
+
+    first_field = events[0][0]
+    complete = events[-1][0]
+    print(f"\ntime to first pitch field {first_field * 1000:.0f}ms, complete pitch {complete * 1000:.0f}ms")
+    assert events[0][1] == {"event": "pitch_field", "field": "headline", "value": PITCH["headline"]}
+    assert first_field < complete / 4
+
+
+def test_stream_failure_falls_back(fake_llm):
+    fake_llm.content = '{"headline": "Cut off'
+    service = PitchGenerationService()
+    bi = business_intelligence("Broken Co")
+
+    events = asyncio.run(collect(service.stream_pitch(bi)))
+
+    assert events[-1][1]["source"] == "fallback"
+    assert fields_of(events) == events[-1][1]["pitch"]
+
+
+TRICKY = {
+    "headline": "Quotes \" and \\ backslashes, {braces} and [brackets]",
+    "subheadline": "Unicode café — and a \\u escape",
+    "key_benefits": ["one, two", {"nested": {"deep": [1, 2, {"x": "}"}]}}, []],
+    "call_to_action": "",
+    "personalized_insights": [],
+    "social_proof": None,
+    "score": -1.5e3,
+    "flag": True,
+}
+
+
+def parse_in_chunks(text, boundaries):
+    parser = IncrementalJSONObjectParser()
+    members = []
+    previous = 0
+    for boundary in list(boundaries) + [len(text)]:
+        members.extend(parser.feed(text[previous:boundary]))
+        previous = boundary
+    return members, parser
+
+
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+def test_parser_every_two_way_split(ensure_ascii):
+    text = json.dumps(TRICKY, ensure_ascii=ensure_ascii)
+    for split in range(len(text) + 1):
+        members, parser = parse_in_chunks(text, [split])
+        assert members == list(TRICKY.items()), f"split at {split}: {text[:split]!r}"
+        assert parser.done
+
+
+def test_parser_single_characters_and_fence():
+    text = "```json\n" + json.dumps(TRICKY, indent=2) + "\n```"
+    members, parser = parse_in_chunks(text, range(1, len(text)))
+    assert members == list(TRICKY.items())
+    assert parser.done
+
+
+def test_parser_emits_members_as_they_complete():
+    parser = IncrementalJSONObjectParser()
+    assert parser.feed('{"headline": "A, \\"quoted\\" {x}"') == []
+    assert parser.feed(', "key_benefits": ["a", ') == [("headline", 'A, "quoted" {x}')]
+    assert parser.feed('{"b": [1]}]') == []
+    assert parser.feed("}") == [("key_benefits", ["a", {"b": [1]}])]
+    assert parser.done
+    assert parser.feed(', "ignored": 1}') == []
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
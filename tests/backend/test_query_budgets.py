@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Query budgets: statements per request on the project endpoints
+
+Each request is made once to warm the principal cache, then counted with
+QueryCounter, so the budget covers the endpoint's own queries. Deleting a
+project still cascades to its updates, which are never lazy loaded.
+
+Run with pytest (python -m pytest tests/backend) or directly.
+"""
+
+import sys
+
+import pytest
+
+from conftest import make_user
+
+from app.core.database import SessionLocal
+from app.core.instrumentation import QueryCounter
+from app.models.project import Project, ProjectUpdate
+from app.models.user import User
+
+
+@pytest.fixture(scope="module")
+def client_projects():
+    """Headers for a client owning 12 projects with 3 updates each, and one project id"""
+    headers = make_user("budget-client@example.com")
+    with SessionLocal() as db:
+        owner = db.query(User).filter(User.email == "budget-client@example.com").one()
+        projects = [Project(title=f"Project {i}", project_type="ai_agent", client_id=owner.id) for i in range(12)]
+        db.add_all(projects)
+        db.flush()
+        db.add_all(
+            ProjectUpdate(title=f"Update {n}", content="Progress", project_id=project.id)
+            for project in projects
+            for n in range(3)
+        )
+        db.commit()
+        return headers, projects[0].id
+
+
+def counted(client, url, headers, **kwargs):
+    assert client.get(url, headers=headers, **kwargs).status_code == 200
+    with QueryCounter() as queries:
+        response = client.get(url, headers=headers, **kwargs)
+    assert response.status_code == 200
+    return response, queries
+
+
+def test_project_list_budget(client, client_projects):
+    headers, _ = client_projects
+    response, queries = counted(client, "/api/v1/projects/", headers, params={"limit": 10})
+
+    assert len(response.json()) == 10
+    assert all(len(project["updates"]) == 3 for project in response.json())
+    queries.assert_at_most(2)
+    assert queries.count > 0
+
+
+def test_project_list_budget_for_admins(client, client_projects, admin_headers):
+    response, queries = counted(client, "/api/v1/projects/", admin_headers, params={"limit": 50})
+
+    assert len(response.json()) >= 12
+    queries.assert_at_most(2)
+    assert queries.count > 0
+
+
+def test_project_detail_budget(client, client_projects):
+    headers, project_id = client_projects
+    response, queries = counted(client, f"/api/v1/projects/{project_id}", headers)
+
+    assert len(response.json()["updates"]) == 3
+    queries.assert_at_most(2)
+    assert queries.count > 0
+
+
+def test_deleting_a_project_deletes_its_updates():
+    # updates is raise_on_sql, so the ORM must not load it to cascade
+    make_user("deleting-client@example.com")
+    with SessionLocal() as db:
+        owner = db.query(User).filter(User.email == "deleting-client@example.com").one()
+        project = Project(title="Short lived", project_type="ai_agent", client_id=owner.id)
+        project.updates = [ProjectUpdate(title=f"Update {n}", content="Progress") for n in range(2)]
+        db.add(project)
+        db.commit()
+        project_id = project.id
+
+    with SessionLocal() as db:
+        db.delete(db.get(Project, project_id))
+        db.commit()
+
+    with SessionLocal() as db:
+        assert db.get(Project, project_id) is None
+        assert db.query(ProjectUpdate).filter(ProjectUpdate.project_id == project_id).count() == 0
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
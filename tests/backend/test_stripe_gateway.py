@@ -0,0 +1,184 @@
+"""
+StripeGateway against a local mock Stripe server: retries reuse the
+Idempotency-Key, 4xx errors are not retried, and parameters are sent in
+Stripe's form encoding
+"""
+
+import asyncio
+import threading
+from typing import Any, Dict, List
+from urllib.parse import parse_qsl
+
+import pytest
+from bench_common import ServerThread
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.api.v1.endpoints import payments
+from app.core.database import SessionLocal
+from app.models.user import User
+from app.services.stripe_gateway import StripeError, StripeGateway
+
+
+class FakeStripe:
+    """Records every request; answers with the queued failures first"""
+
+    def __init__(self):
+        self.app = Starlette(routes=[
+            Route("/v1/payment_intents", self.payment_intents, methods=["POST"]),
+            Route("/v1/customers", self.customers, methods=["GET"]),
+        ])
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.requests: List[Dict[str, Any]] = []
+        self.failures: List[JSONResponse] = []
+
+    async def _record(self, request: Request) -> Dict[str, Any]:
+        body = (await request.body()).decode()
+        record = {
+            "headers": dict(request.headers),
+            "form": parse_qsl(body, keep_blank_values=True),
+            "query": list(request.query_params.multi_items()),
+        }
+        with self._lock:
+            self.requests.append(record)
+        return record
+
+    async def payment_intents(self, request: Request):
+        record = await self._record(request)
+        if self.failures:
+            return self.failures.pop(0)
+        form = dict(record["form"])
+        return JSONResponse({"id": "pi_123", "client_secret": "pi_123_secret", "amount": int(form["amount"])})
+
+    async def customers(self, request: Request):
+        await self._record(request)
+        return JSONResponse({"object": "list", "data": [{"id": "cus_123"}]})
+
+
+@pytest.fixture(scope="module")
+def stripe_server():
+    fake = FakeStripe()
+    with ServerThread(fake.app) as server:
+        fake.url = server.url
+        yield fake
+
+
+@pytest.fixture
+def fake_stripe(stripe_server) -> FakeStripe:
+    stripe_server.reset()
+    return stripe_server
+
+
+def gateway(fake: FakeStripe) -> StripeGateway:
+    return StripeGateway(api_key="sk_test_123", base_url=fake.url, max_retries=2)
+
+
+def server_error(status_code: int = 500) -> JSONResponse:
+    # Retry-After keeps the backoff out of the test's run time
+    return JSONResponse(
+        {"error": {"type": "api_error", "message": "Try again"}},
+        status_code=status_code,
+        headers={"Retry-After": "0"},
+    )
+
+
+def call(fake: FakeStripe, method: str, *args: Any, **kwargs: Any) -> Any:
+    """Run one gateway method on a fresh client"""
+    async def run():
+        client = gateway(fake)
+        try:
+            return await getattr(client, method)(*args, **kwargs)
+        finally:
+            await client.close()
+
+    return asyncio.run(run())
+
+
+def create_intent(fake: FakeStripe, **kwargs: Any) -> Dict[str, Any]:
+    return call(fake, "create_payment_intent", **kwargs)
+
+
+def test_retries_reuse_the_idempotency_key(fake_stripe):
+    fake_stripe.failures = [server_error(500), server_error(429)]
+
+    intent = create_intent(fake_stripe, amount=1000, currency="usd", idempotency_key="checkout-1")
+
+    assert intent["id"] == "pi_123"
+    keys = [request["headers"]["idempotency-key"] for request in fake_stripe.requests]
+    assert keys == ["checkout-1"] * 3
+
+
+def test_generated_idempotency_key_is_stable_across_retries(fake_stripe):
+    fake_stripe.failures = [server_error(503)]
+
+    create_intent(fake_stripe, amount=1000, currency="usd")
+
+    first, second = (request["headers"]["idempotency-key"] for request in fake_stripe.requests)
+    assert first == second
+
+
+def test_client_errors_are_not_retried(fake_stripe):
+    fake_stripe.failures = [
+        JSONResponse(
+            {"error": {"type": "card_error", "code": "card_declined", "message": "Your card was declined."}},
+            status_code=402,
+        )
+    ]
+
+    with pytest.raises(StripeError) as raised:
+        create_intent(fake_stripe, amount=1000, currency="usd")
+
+    assert len(fake_stripe.requests) == 1
+    assert raised.value.status_code == 402
+    assert raised.value.code == "card_declined"
+    assert str(raised.value) == "Your card was declined."
+
+
+def test_retries_stop_after_max_retries(fake_stripe):
+    fake_stripe.failures = [server_error(500) for _ in range(5)]
+
+    with pytest.raises(StripeError) as raised:
+        create_intent(fake_stripe, amount=1000, currency="usd")
+
+    assert len(fake_stripe.requests) == 3
+    assert raised.value.status_code == 500
+
+
+def test_form_encoding(fake_stripe):
+    create_intent(fake_stripe, amount=1999, currency="eur", metadata={"user_id": 7, "note": "a&b=c"})
+    call(fake_stripe, "list_customers", "jo@example.com")
+
+    post, get = fake_stripe.requests
+    assert post["headers"]["content-type"] == "application/x-www-form-urlencoded"
+    assert post["headers"]["authorization"].startswith("Basic ")
+    assert post["form"] == [
+        ("amount", "1999"),
+        ("currency", "eur"),
+        ("metadata[user_id]", "7"),
+        ("metadata[note]", "a&b=c"),
+    ]
+    assert get["query"] == [("email", "jo@example.com"), ("limit", "1")]
+    assert "idempotency-key" not in get["headers"]
+
+
+def test_endpoint_scopes_the_idempotency_key_to_the_user(fake_stripe, client, user_headers, monkeypatch):
+    monkeypatch.setattr(payments, "stripe_gateway", gateway(fake_stripe))
+    with SessionLocal() as db:
+        user_id = db.query(User.id).filter(User.email == "client@example.com").scalar()
+
+    response = client.post(
+        "/api/v1/payments/create-payment-intent",
+        json={"amount": 10.5, "currency": "usd"},
+        headers={**user_headers, "Idempotency-Key": "checkout-1"},
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.json() == {"client_secret": "pi_123_secret", "payment_intent_id": "pi_123"}
+    (request,) = fake_stripe.requests
+    assert request["headers"]["idempotency-key"] == f"{user_id}:checkout-1"
+    assert ("amount", "1050") in request["form"]
@@ -0,0 +1,87 @@
+"""
+Stripe webhook receipt: the verified event is stored as Stripe sent it,
+redeliveries are acknowledged once, and the in-process drainer is off by
+default on SQLite
+"""
+
+import hashlib
+import hmac
+import json
+import time
+from typing import Any, Dict, Tuple
+
+import pytest
+
+from app.core.config import Settings, settings
+from app.core.database import SessionLocal
+from app.models.webhook_event import StripeWebhookEvent
+
+SECRET = "whsec_test"
+URL = "/api/v1/payments/webhook"
+
+
+@pytest.fixture
+def webhook_secret(monkeypatch) -> str:
+    monkeypatch.setattr(settings, "STRIPE_WEBHOOK_SECRET", SECRET)
+    return SECRET
+
+
+def event(event_id: str) -> Dict[str, Any]:
+    return {
+        "id": event_id,
+        "object": "event",
+        "type": "payment_intent.succeeded",
+        "created": int(time.time()),
+        "data": {"object": {"id": f"pi_{event_id}", "amount": 1000, "currency": "usd", "metadata": {"user_id": "1"}}},
+    }
+
+
+def signed(body: str, secret: str = SECRET) -> Tuple[str, Dict[str, str]]:
+    timestamp = int(time.time())
+    signature = hmac.new(secret.encode(), f"{timestamp}.{body}".encode(), hashlib.sha256).hexdigest()
+    return body, {"Stripe-Signature": f"t={timestamp},v1={signature}", "Content-Type": "application/json"}
+
+
+def stored(event_id: str):
+    with SessionLocal() as db:
+        return db.query(StripeWebhookEvent).filter(StripeWebhookEvent.event_id == event_id).all()
+
+
+def test_verified_event_is_stored(client, webhook_secret):
+    sent = event("evt_stored")
+    body, headers = signed(json.dumps(sent))
+
+    response = client.post(URL, content=body, headers=headers)
+
+    assert response.status_code == 200, response.text
+    (row,) = stored("evt_stored")
+    assert (row.event_type, row.status) == ("payment_intent.succeeded", "pending")
+    assert row.payload == sent
+
+
+def test_redelivery_is_acknowledged_once(client, webhook_secret):
+    body, headers = signed(json.dumps(event("evt_redelivered")))
+
+    statuses = [client.post(URL, content=body, headers=headers).status_code for _ in range(2)]
+
+    assert statuses == [200, 200]
+    assert len(stored("evt_redelivered")) == 1
+
+
+def test_bad_signature_is_rejected(client, webhook_secret):
+    body, headers = signed(json.dumps(event("evt_forged")), secret="whsec_other")
+
+    response = client.post(URL, content=body, headers=headers)
+
+    assert response.status_code == 400
+    assert stored("evt_forged") == []
+
+
+@pytest.mark.parametrize(
+    "url, enabled",
+    [("sqlite:///./app.db", False), ("sqlite+aiosqlite:///./app.db", False), ("postgresql://u:p@db/app", True)],
+)
+def test_drainer_defaults_off_on_sqlite(url, enabled, monkeypatch):
+    monkeypatch.delenv("STRIPE_WEBHOOK_WORKER_ENABLED", raising=False)
+    assert Settings(DATABASE_URL=url).STRIPE_WEBHOOK_WORKER_ENABLED is enabled
+    assert Settings(DATABASE_URL=url, STRIPE_WEBHOOK_WORKER_ENABLED=True).STRIPE_WEBHOOK_WORKER_ENABLED is True
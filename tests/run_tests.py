@@ -39,6 +39,45 @@ def run_backend_tests():
     except Exception as e:
         print(f"Error running backend database tests: {e}")
 
+    # Test 3: pytest suite (fake LLM, SMTP and Stripe servers run locally)
+    print("\n3. Running backend pytest suite...")
+    try:
+        result = subprocess.run([sys.executable, "-m", "pytest", "-q", "tests/backend"],
+                              capture_output=True, text=True, cwd=os.getcwd())
+        if result.returncode == 0:
+            print("PASS: Backend pytest suite passed")
+        else:
+            print("FAIL: Backend pytest suite failed")
+            print(result.stdout)
+    except Exception as e:
+        print(f"Error running backend pytest suite: {e}")
+
+BENCHMARKS = [
+    ("Sync vs async session under load", "tests/backend/bench_async_db.py"),
+    ("Auth dependency overhead", "tests/backend/bench_auth.py"),
+    ("JWT decode with and without the token cache", "tests/backend/bench_token_decode.py"),
+    ("Login storm vs /health latency", "tests/backend/bench_login_storm.py"),
+    ("BI payload size and serialization", "tests/backend/bench_bi_payload.py"),
+    ("Streaming inquiry export (1M rows)", "tests/backend/bench_inquiry_export.py"),
+    ("Keyset vs offset pagination depth", "tests/backend/bench_pagination.py"),
+    ("MetricsMiddleware overhead", "tests/backend/bench_metrics_middleware.py"),
+    ("Response rendering throughput", "tests/backend/bench_response_rendering.py"),
+    ("Stripe webhook ingestion and lag", "tests/backend/bench_stripe_webhooks.py"),
+]
+
+def run_benchmarks():
+    """Run the backend benchmark scripts and print their reports"""
+    print("\nRunning Backend Benchmarks")
+    print("=" * 50)
+
+    for index, (description, script) in enumerate(BENCHMARKS, 1):
+        print(f"\n{index}. {description}...")
+        result = subprocess.run([sys.executable, script], capture_output=True, text=True, cwd=os.getcwd())
+        print(result.stdout)
+        if result.returncode != 0:
+            print(f"FAIL: {script} exited with {result.returncode}")
+            print(result.stderr)
+
 def run_frontend_tests():
     """Run all frontend tests"""
     print("\nRunning Frontend Tests")
@@ -77,6 +116,7 @@ def main():
     parser.add_argument("--backend", action="store_true", help="Run only backend tests")
     parser.add_argument("--frontend", action="store_true", help="Run only frontend tests")
     parser.add_argument("--e2e", action="store_true", help="Run only E2E tests")
+    parser.add_argument("--bench", action="store_true", help="Run only the backend benchmarks")
 
     args = parser.parse_args()
 
@@ -86,6 +126,8 @@ def main():
         run_frontend_tests()
     elif args.e2e:
         run_e2e_tests()
+    elif args.bench:
+        run_benchmarks()
     else:
         # Run all tests
         run_backend_tests()